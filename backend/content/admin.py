@@ -1,11 +1,104 @@
+import json
+from typing import TYPE_CHECKING
+
 from django.contrib import admin, messages
-from django.urls import reverse
+from django.contrib.admin.views.main import ORDER_VAR
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Count
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+from school_platform.admin.autocomplete import bump_autocomplete_version
+from school_platform.admin.pagination import (
+    KeysetChangeList,
+    KeysetPaginationMixin,
+)
 from unfold.admin import ModelAdmin, TabularInline
 from unfold.decorators import action, display
 
+from .cache import bump_course_versions
 from .models import Course, LessonTheory, Module, Technology
+from .services import (
+    ContentActivationService,
+    CourseCloneService,
+    OrderingService,
+    TechnologyIndex,
+)
+from .tasks import clone_courses, set_courses_active, set_modules_active
+
+# Сколько объектов обрабатывать прямо в запросе, остальное — через Celery
+CLONE_SYNC_LIMIT = 5
+ACTIVATION_SYNC_LIMIT = 50
+# Сколько символов урока показывать в списках
+CONTENT_PREVIEW_LENGTH = 100
+# Под какую ширину подбирать версию обложки в списке курсов
+COVER_THUMBNAIL_WIDTH = 80
+
+
+if TYPE_CHECKING:
+    from django.contrib.admin import ModelAdmin as _AdminBase
+else:
+    _AdminBase = object
+
+
+class ReorderAdminMixin(_AdminBase):
+    """
+    Bulk reorder endpoint for drag-and-drop:
+    POST <changelist>/reorder/ {"parent": <id>, "ids": [<id>, ...]}
+    """
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path(
+                "reorder/",
+                self.admin_site.admin_view(self.reorder_view),
+                name="%s_%s_reorder" % info,
+            ),
+        ] + super().get_urls()
+
+    def reorder_view(self, request):
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        try:
+            payload = json.loads(request.body)
+            parent_id = int(payload["parent"])
+            ids = [int(pk) for pk in payload["ids"]]
+            keys = OrderingService.reorder(self.model, parent_id, ids)
+        except (ValueError, KeyError, TypeError) as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        return JsonResponse({"order": keys})
+
+
+class RankedChangeList(KeysetChangeList):
+    """Search results go by relevance unless a column sort is chosen"""
+
+    def get_ordering(self, request, queryset):
+        if self.query.strip() and ORDER_VAR not in self.params:
+            return ["-search_rank", "-pk"]
+        return super().get_ordering(request, queryset)
+
+
+class FullTextSearchAdminMixin:
+    """
+    Admin search via Model.objects.search() (stored search_vector with
+    a GIN index) instead of icontains scans; results ordered by rank.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return queryset.search(search_term), False
+
+    def get_changelist(self, request, **kwargs):
+        return RankedChangeList
 
 
 @admin.register(Technology)
@@ -18,6 +111,14 @@ class TechnologyAdmin(ModelAdmin):
     ordering = ("name",)
     icon = "science"
 
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск (и автодополнение в формах курсов и менторов) идёт
+        # по префиксному индексу в памяти вместо icontains
+        if not search_term.strip():
+            return queryset, False
+        found = TechnologyIndex.search(search_term, limit=None)
+        return queryset.filter(pk__in=[pk for pk, name in found]), False
+
     @admin.display(
         description=_("Number of courses"), ordering="courses_count"
     )
@@ -35,11 +136,12 @@ class TechnologyAdmin(ModelAdmin):
 
 
 @admin.register(Course)
-class CourseAdmin(ModelAdmin):
+class CourseAdmin(FullTextSearchAdminMixin, KeysetPaginationMixin, ModelAdmin):
     """Admin for courses"""
 
     list_display = (
         "title",
+        "cover",
         "technologies_list",
         "modules_count",
         "is_active",
@@ -51,10 +153,10 @@ class CourseAdmin(ModelAdmin):
         "technology",
         "created_at",
     )
-    search_fields = ("title", "description", "technology__name")
+    search_fields = ("title", "description")
     list_per_page = 20
     ordering = ("-created_at",)
-    filter_horizontal = ("technology",)
+    autocomplete_fields = ("technology",)
     readonly_fields = ("created_at", "courses_stats")
     prepopulated_fields = {"slug": ("title",)}
     icon = "school"
@@ -89,6 +191,17 @@ class CourseAdmin(ModelAdmin):
         ),
     )
 
+    @admin.display(description=_("Cover"))
+    def cover(self, obj):
+        url = obj.image_url(COVER_THUMBNAIL_WIDTH)
+        if not url:
+            return "—"
+        return format_html(
+            '<img src="{}" alt="" style="height: 40px; '
+            'border-radius: 0.25rem;">',
+            url,
+        )
+
     @admin.display(description=_("Technologies"))
     def technologies_list(self, obj):
         technologies = obj.technology.all()
@@ -179,47 +292,85 @@ class CourseAdmin(ModelAdmin):
             edit_title=_("Edit"),
         )
 
+    def _set_courses_active(self, request, queryset, is_active):
+        course_ids = list(queryset.values_list("id", flat=True))
+        if len(course_ids) > ACTIVATION_SYNC_LIMIT:
+            transaction.on_commit(
+                lambda: set_courses_active.delay(course_ids, is_active)
+            )
+            return None
+        return ContentActivationService.set_courses_active(
+            course_ids, is_active
+        )
+
     @action(description=_("Activate courses ✅"), permissions=["change"])
     def activate_courses(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        result = self._set_courses_active(request, queryset, True)
+        if result is None:
+            self.message_user(
+                request,
+                _("Activation of courses has been started"),
+                messages.INFO,
+            )
+            return
         self.message_user(
             request,
-            _(f"{updated} courses activated ✅"),
+            _(
+                "%(courses)s courses, %(modules)s modules and "
+                "%(lessons)s lessons activated ✅"
+            )
+            % result,
             messages.SUCCESS,
         )
 
     @action(description=_("Deactivate courses ❌"), permissions=["change"])
     def deactivate_courses(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        result = self._set_courses_active(request, queryset, False)
+        if result is None:
+            self.message_user(
+                request,
+                _("Deactivation of courses has been started"),
+                messages.INFO,
+            )
+            return
         self.message_user(
             request,
-            _(f"{updated} courses deactivated ❌"),
+            _(
+                "%(courses)s courses, %(modules)s modules and "
+                "%(lessons)s lessons deactivated ❌"
+            )
+            % result,
             messages.WARNING,
         )
 
     @action(description=_("Clone course"), permissions=["add"])
     def clone_course(self, request, queryset):
-        if queryset.count() > 1:
+        course_ids = list(queryset.values_list("id", flat=True))
+
+        # Большие выборки клонируем в фоне, чтобы не держать запрос
+        if len(course_ids) > CLONE_SYNC_LIMIT:
+            transaction.on_commit(lambda: clone_courses.delay(course_ids))
             self.message_user(
                 request,
-                _("Select only one course to clone"),
-                messages.ERROR,
+                ngettext(
+                    "Cloning of %(count)s course has been started",
+                    "Cloning of %(count)s courses has been started",
+                    len(course_ids),
+                )
+                % {"count": len(course_ids)},
+                messages.INFO,
             )
             return
 
-        course = queryset.first()
-        course.pk = None
-        course.title = f"{course.title} ({_('Copy')})"
-        course.slug = f"{course.slug}-copy"
-        course.is_active = False
-        course.save()
-
-        # Copy technologies
-        course.technology.set(course.technology.all())
-
+        clones = CourseCloneService.clone_courses(course_ids)
         self.message_user(
             request,
-            _("Course successfully cloned"),
+            ngettext(
+                "%(count)s course successfully cloned",
+                "%(count)s courses successfully cloned",
+                len(clones),
+            )
+            % {"count": len(clones)},
             messages.SUCCESS,
         )
 
@@ -230,6 +381,18 @@ class CourseAdmin(ModelAdmin):
         return queryset.prefetch_related("technology", "modules")
 
 
+def render_content_preview(obj):
+    """Превью по content_head из lean(), без полного текста урока"""
+    head = getattr(obj, "content_head", None)
+    if head is None:
+        head = (obj.content or "")[:CONTENT_PREVIEW_LENGTH]
+    if not head:
+        return "—"
+    if obj.content_length > CONTENT_PREVIEW_LENGTH:
+        head += "..."
+    return head
+
+
 class LessonTheoryInline(TabularInline):
     """Inline for theory lessons"""
 
@@ -241,20 +404,21 @@ class LessonTheoryInline(TabularInline):
     fields = ("title", "content_preview", "order_index", "is_active")
     readonly_fields = ("content_preview",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).lean(CONTENT_PREVIEW_LENGTH)
+
     @admin.display(description=_("Content"))
     def content_preview(self, obj):
-        if not obj.content:
-            return "—"
-        preview = (
-            obj.content[:100] + "..."
-            if len(obj.content) > 100
-            else obj.content
-        )
-        return format_html('<span title="{}">{}</span>', obj.content, preview)
+        return render_content_preview(obj)
 
 
 @admin.register(Module)
-class ModuleAdmin(ModelAdmin):
+class ModuleAdmin(
+    FullTextSearchAdminMixin,
+    ReorderAdminMixin,
+    KeysetPaginationMixin,
+    ModelAdmin,
+):
     """Admin for modules"""
 
     list_display = (
@@ -269,11 +433,14 @@ class ModuleAdmin(ModelAdmin):
         "is_active",
         "course",
     )
-    search_fields = ("title", "description", "course__title")
+    search_fields = ("title", "description")
     list_per_page = 20
     ordering = ("course", "order_index")
     readonly_fields = ("lessons_count_display",)
     icon = "list_alt"
+    autocomplete_fields = ("course",)
+    # str(module) выводит и название курса
+    autocomplete_select_related = ("course",)
 
     inlines = [LessonTheoryInline]
 
@@ -306,9 +473,9 @@ class ModuleAdmin(ModelAdmin):
         )  # Исправлено
         return format_html('<a href="{}">{}</a>', url, obj.course.title)
 
-    @admin.display(description=_("Lessons"))
+    @admin.display(description=_("Lessons"), ordering="lessons_total")
     def lessons_count(self, obj):
-        count = obj.lessons_theories.count()
+        count = obj.lessons_total
         if count == 0:
             return format_html(
                 '<span style="color: #dc3545;">{}</span>', count
@@ -322,7 +489,7 @@ class ModuleAdmin(ModelAdmin):
 
     @admin.display(description=_("Number of lessons"))
     def lessons_count_display(self, obj):
-        return obj.lessons_theories.count()
+        return obj.lessons_total
 
     @display(description=_("Actions"), label=True)
     def actions_column(self, obj):
@@ -347,21 +514,48 @@ class ModuleAdmin(ModelAdmin):
             edit_title=_("Edit"),
         )
 
+    def _set_modules_active(self, request, queryset, is_active):
+        module_ids = list(queryset.values_list("id", flat=True))
+        if len(module_ids) > ACTIVATION_SYNC_LIMIT:
+            transaction.on_commit(
+                lambda: set_modules_active.delay(module_ids, is_active)
+            )
+            return None
+        return ContentActivationService.set_modules_active(
+            module_ids, is_active
+        )
+
     @action(description=_("Activate modules ✅"), permissions=["change"])
     def activate_modules(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        result = self._set_modules_active(request, queryset, True)
+        if result is None:
+            self.message_user(
+                request,
+                _("Activation of modules has been started"),
+                messages.INFO,
+            )
+            return
         self.message_user(
             request,
-            _(f"{updated} modules activated ✅"),
+            _("%(modules)s modules and %(lessons)s lessons activated ✅")
+            % result,
             messages.SUCCESS,
         )
 
     @action(description=_("Deactivate modules ❌"), permissions=["change"])
     def deactivate_modules(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        result = self._set_modules_active(request, queryset, False)
+        if result is None:
+            self.message_user(
+                request,
+                _("Deactivation of modules has been started"),
+                messages.INFO,
+            )
+            return
         self.message_user(
             request,
-            _(f"{updated} modules deactivated ❌"),
+            _("%(modules)s modules and %(lessons)s lessons deactivated ❌")
+            % result,
             messages.WARNING,
         )
 
@@ -369,13 +563,18 @@ class ModuleAdmin(ModelAdmin):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related("course").prefetch_related(
-            "lessons_theories"
+        return queryset.select_related("course").annotate(
+            lessons_total=Count("lessons_theories")
         )
 
 
 @admin.register(LessonTheory)
-class LessonTheoryAdmin(ModelAdmin):
+class LessonTheoryAdmin(
+    FullTextSearchAdminMixin,
+    ReorderAdminMixin,
+    KeysetPaginationMixin,
+    ModelAdmin,
+):
     """Admin for theory lessons"""
 
     list_display = (
@@ -392,16 +591,15 @@ class LessonTheoryAdmin(ModelAdmin):
         "module__course",
         "module",
     )
-    search_fields = (
-        "title",
-        "content",
-        "module__title",
-        "module__course__title",
-    )
+    search_fields = ("title", "content")
     list_per_page = 20
     ordering = ("module", "order_index")
     readonly_fields = ("created_info",)
     icon = "article"
+    autocomplete_fields = ("module",)
+    # Подсказки по урокам сбрасывает удаление модуля (и курса: модули
+    # удаляются с сигналами), а не post_delete каждого урока
+    autocomplete_deleted_with = ("module",)
 
     fieldsets = (
         (
@@ -427,14 +625,7 @@ class LessonTheoryAdmin(ModelAdmin):
 
     @admin.display(description=_("Content"))
     def content_preview(self, obj):
-        if not obj.content:
-            return "—"
-        preview = (
-            obj.content[:100] + "..."
-            if len(obj.content) > 100
-            else obj.content
-        )
-        return format_html('<span title="{}">{}</span>', obj.content, preview)
+        return render_content_preview(obj)
 
     @admin.display(description=_("Module"), ordering="module__title")
     def module_link(self, obj):
@@ -507,24 +698,60 @@ class LessonTheoryAdmin(ModelAdmin):
 
     @action(description=_("Activate lessons ✅"), permissions=["change"])
     def activate_lessons(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = ContentActivationService.set_lessons_active(
+            queryset.values_list("id", flat=True), True
+        )["lessons"]
         self.message_user(
             request,
-            _(f"{updated} lessons activated ✅"),
+            ngettext(
+                "%(count)s lesson activated ✅",
+                "%(count)s lessons activated ✅",
+                updated,
+            )
+            % {"count": updated},
             messages.SUCCESS,
         )
 
     @action(description=_("Deactivate lessons ❌"), permissions=["change"])
     def deactivate_lessons(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = ContentActivationService.set_lessons_active(
+            queryset.values_list("id", flat=True), False
+        )["lessons"]
         self.message_user(
             request,
-            _(f"{updated} lessons deactivated ❌"),
+            ngettext(
+                "%(count)s lesson deactivated ❌",
+                "%(count)s lessons deactivated ❌",
+                updated,
+            )
+            % {"count": updated},
             messages.WARNING,
         )
 
     actions = ["activate_lessons", "deactivate_lessons"]
 
+    def delete_model(self, request, obj):
+        course_id = obj.module.course_id
+        super().delete_model(request, obj)
+        transaction.on_commit(lambda: bump_course_versions([course_id]))
+        bump_autocomplete_version(LessonTheory)
+
+    def delete_queryset(self, request, queryset):
+        course_ids = list(
+            queryset.values_list("module__course", flat=True).distinct()
+        )
+        super().delete_queryset(request, queryset)
+        transaction.on_commit(lambda: bump_course_versions(course_ids))
+        bump_autocomplete_version(LessonTheory)
+
     def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        return queryset.select_related("module", "module__course")
+        queryset = (
+            super()
+            .get_queryset(request)
+            .select_related("module", "module__course")
+        )
+        # Полный текст урока нужен только на форме редактирования
+        match = getattr(request, "resolver_match", None)
+        if match and match.url_name == "content_lessontheory_changelist":
+            queryset = queryset.lean(CONTENT_PREVIEW_LENGTH)
+        return queryset
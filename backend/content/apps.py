@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "content"
+
+    def ready(self):
+        import content.checks  # noqa
+        import content.signals  # noqa
@@ -0,0 +1,58 @@
+import time
+
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = "content:catalog:version"
+COURSE_VERSION_KEY = "content:course:{}:version"
+
+
+def course_version_key(course_id):
+    return COURSE_VERSION_KEY.format(course_id)
+
+
+def get_catalog_version():
+    """
+    Текущая версия каталога. Если ключа нет (кэш очищен), заводим
+    новую, чтобы не совпасть с версией из прошлой жизни кэша.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def get_course_versions(course_ids):
+    """Версии курсов одним запросом к кэшу: {course_id: version}"""
+    keys = {course_version_key(pk): pk for pk in course_ids}
+    found = cache.get_many(keys.keys())
+    return {pk: found.get(key, 0) for key, pk in keys.items()}
+
+
+def bump_course_versions(course_ids):
+    """
+    Сдвигает версии курсов и каталога. Закэшированные оглавления и
+    счётчики привязаны к версии, поэтому старые записи просто
+    перестают читаться. Вызывать после любых массовых update(),
+    которые не отправляют сигналы.
+    """
+    version = time.time_ns()
+    values = {course_version_key(pk): version for pk in set(course_ids)}
+    values[CATALOG_VERSION_KEY] = version
+    cache.set_many(values, timeout=None)
+
+
+TECHNOLOGY_INDEX_VERSION_KEY = "content:technology_index:version"
+
+
+def get_technology_index_version():
+    version = cache.get(TECHNOLOGY_INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(TECHNOLOGY_INDEX_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(TECHNOLOGY_INDEX_VERSION_KEY)
+    return version
+
+
+def bump_technology_index_version():
+    """Индексы технологий во всех процессах перестроятся при обращении"""
+    cache.set(TECHNOLOGY_INDEX_VERSION_KEY, time.time_ns(), timeout=None)
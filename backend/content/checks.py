@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Кэши, которые видит только один процесс
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Версии каталога, прав и подсказок сбрасываются через кэш: с
+    локальным кэшем остальные воркеры о сбросе не узнают.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.DEBUG or backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Warning(
+            "The default cache is local to each process.",
+            hint=(
+                "Set REDIS_CACHE_URL: with several workers cache "
+                "version bumps do not reach the other processes, so "
+                "they keep serving stale ETags and permissions."
+            ),
+            id="content.W001",
+        )
+    ]
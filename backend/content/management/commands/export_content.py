@@ -0,0 +1,63 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from content.services import ContentTransferService
+from content.services.transfer import BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Выгружает курсы, модули и уроки в JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            "-o",
+            default="-",
+            help="Файл для выгрузки (по умолчанию stdout)",
+        )
+        parser.add_argument(
+            "--course",
+            type=int,
+            action="append",
+            dest="course_ids",
+            help="id курса; можно указать несколько раз",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Сколько строк читать из БД за раз",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        output = options["output"]
+        stream = (
+            sys.stdout
+            if output == "-"
+            else open(output, "w", encoding="utf-8")
+        )
+        counts = {"course": 0, "module": 0, "lesson": 0}
+        try:
+            for record in ContentTransferService.export(
+                options["course_ids"], chunk_size=options["chunk_size"]
+            ):
+                stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+                counts[record["type"]] += 1
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        seconds = time.monotonic() - started
+        total = sum(counts.values())
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Выгружено курсов: {counts['course']}, модулей: "
+                f"{counts['module']}, уроков: {counts['lesson']} "
+                f"за {seconds:.1f} с ({total / max(seconds, 1e-6):.0f} "
+                f"записей/с)"
+            )
+        )
@@ -0,0 +1,56 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from content.services import ContentTransferService
+from content.services.transfer import BATCH_SIZE
+
+
+def read_records(stream):
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CommandError(f"Строка {number}: {e}")
+
+
+class Command(BaseCommand):
+    help = "Загружает курсы, модули и уроки из JSON Lines (export_content)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="Файл выгрузки; '-' — читать из stdin"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Размер пачки bulk_create",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            stats = ContentTransferService.import_records(
+                read_records(stream), batch_size=options["batch_size"]
+            )
+        except (KeyError, ValueError) as e:
+            raise CommandError(f"Некорректная выгрузка: {e}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        seconds = max(stats["seconds"], 1e-6)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Загружено курсов: {stats['courses']}, модулей: "
+                f"{stats['modules']}, уроков: {stats['lessons']}, "
+                f"новых технологий: {stats['technologies']} за "
+                f"{stats['seconds']:.1f} с "
+                f"({stats['lessons'] / seconds:.0f} уроков/с)"
+            )
+        )
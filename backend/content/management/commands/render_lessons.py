@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from content.services import LessonRenderService
+from content.services.rendering import BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        "Перерисовывает HTML уроков, у которых изменился текст или "
+        "настройки рендера"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перерисовать все уроки, даже актуальные",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Размер пачки bulk_update",
+        )
+
+    def handle(self, *args, **options):
+        rendered = LessonRenderService.render_outdated(
+            force=options["force"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Перерисовано уроков: {rendered}")
+        )
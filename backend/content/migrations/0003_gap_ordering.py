@@ -0,0 +1,83 @@
+# Generated by Django 4.2 on 2026-10-19 06:30
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.constraints
+
+ORDER_GAP = 1024
+
+
+def spread_order_index(apps, schema_editor):
+    """Переводит плотную нумерацию 1, 2, 3... в разреженную с шагом"""
+    for model_name, parent_field in (
+        ("Module", "course_id"),
+        ("LessonTheory", "module_id"),
+    ):
+        model = apps.get_model("content", model_name)
+        rows = model.objects.order_by(parent_field, "order_index", "id")
+        batch, parent_id, position = [], None, 0
+        for row in rows.only("id", parent_field, "order_index").iterator():
+            if getattr(row, parent_field) != parent_id:
+                parent_id, position = getattr(row, parent_field), 0
+            position += 1
+            row.order_index = position * ORDER_GAP
+            batch.append(row)
+        model.objects.bulk_update(batch, ["order_index"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "content",
+            "0002_alter_course_options_alter_lessontheory_options_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="lessontheory",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="module",
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name="lessontheory",
+            name="order_index",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Leave empty to put the item last",
+                validators=[django.core.validators.MinValueValidator(1)],
+                verbose_name="Order number",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="module",
+            name="order_index",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Leave empty to put the item last",
+                validators=[django.core.validators.MinValueValidator(1)],
+                verbose_name="Order number",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="lessontheory",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("module", "order_index"),
+                name="content_lessontheory_module_order_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="module",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("course", "order_index"),
+                name="content_module_course_order_uniq",
+            ),
+        ),
+        migrations.RunPython(spread_order_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-19 06:31
+
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+def fill_content_length(apps, schema_editor):
+    LessonTheory = apps.get_model("content", "LessonTheory")
+    LessonTheory.objects.update(content_length=Length("content"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0003_gap_ordering"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lessontheory",
+            name="content_length",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Content length"
+            ),
+        ),
+        migrations.RunPython(fill_content_length, migrations.RunPython.noop),
+    ]
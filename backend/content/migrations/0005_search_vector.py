@@ -0,0 +1,92 @@
+# Generated by Django 4.2 on 2026-10-19 06:32
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Таблица -> поля документа с весами. Дублирует search_document
+# моделей на момент миграции.
+SEARCH_DOCUMENTS = {
+    "content_course": (("title", "A"), ("description", "B")),
+    "content_module": (("title", "A"), ("description", "B")),
+    "content_lessontheory": (("title", "A"), ("content", "B")),
+}
+SEARCH_CONFIGS = ("russian", "english")
+
+
+def create_search_triggers(apps, schema_editor):
+    # Триггеры и GIN-индексы есть только в PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, fields in SEARCH_DOCUMENTS.items():
+        document = " ||\n".join(
+            f"setweight(to_tsvector('{config}', "
+            f"coalesce(NEW.{field}, '')), '{weight}')"
+            for field, weight in fields
+            for config in SEARCH_CONFIGS
+        )
+        columns = ", ".join(field for field, _ in fields)
+        schema_editor.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update()
+            RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {document};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {columns} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update();
+
+            CREATE INDEX {table}_search_vector_gin
+            ON {table} USING gin (search_vector);
+
+            UPDATE {table} SET {fields[0][0]} = {fields[0][0]};
+            """
+        )
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in SEARCH_DOCUMENTS:
+        schema_editor.execute(
+            f"""
+            DROP INDEX IF EXISTS {table}_search_vector_gin;
+            DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table};
+            DROP FUNCTION IF EXISTS {table}_search_vector_update();
+            """
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0004_lessontheory_content_length"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="lessontheory",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-19 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0005_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="content_course_created_id_idx",
+            ),
+        ),
+    ]
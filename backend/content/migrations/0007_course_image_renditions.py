@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0006_course_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Cover renditions",
+            ),
+        ),
+    ]
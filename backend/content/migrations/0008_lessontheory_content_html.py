@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-19 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0007_course_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lessontheory",
+            name="content_html",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                verbose_name="Rendered content",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lessontheory",
+            name="content_html_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=40
+            ),
+        ),
+    ]
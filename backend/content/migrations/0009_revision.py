@@ -0,0 +1,73 @@
+# Generated by Django 4.2 on 2026-10-19 06:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("content", "0008_lessontheory_content_html"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Revision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveBigIntegerField(verbose_name="Object id"),
+                ),
+                (
+                    "field",
+                    models.CharField(max_length=50, verbose_name="Field"),
+                ),
+                (
+                    "number",
+                    models.PositiveIntegerField(
+                        verbose_name="Revision number"
+                    ),
+                ),
+                ("is_snapshot", models.BooleanField(default=False)),
+                ("data", models.BinaryField()),
+                ("content_hash", models.CharField(max_length=40)),
+                ("content_length", models.PositiveIntegerField(default=0)),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created at"
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                        verbose_name="Object type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Revision",
+                "verbose_name_plural": "Revisions",
+                "ordering": ["-number"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="revision",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id", "field", "number"),
+                name="content_revision_object_number_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,139 @@
+# Generated by Django 4.2 on 2026-10-19 08:05
+
+from django.db import migrations
+
+# Таблица -> (поля документа с весами, внешний ключ, выражения заголовков
+# родителей). Дублирует search_document и search_parents моделей на
+# момент миграции.
+SEARCH_DOCUMENTS = {
+    "content_module": (
+        (("title", "A"), ("description", "B")),
+        "course_id",
+        ("(SELECT title FROM content_course WHERE id = NEW.course_id)",),
+    ),
+    "content_lessontheory": (
+        (("title", "A"), ("content", "B")),
+        "module_id",
+        (
+            "(SELECT title FROM content_module WHERE id = NEW.module_id)",
+            "(SELECT c.title FROM content_module m "
+            "JOIN content_course c ON c.id = m.course_id "
+            "WHERE m.id = NEW.module_id)",
+        ),
+    ),
+}
+SEARCH_CONFIGS = ("russian", "english")
+
+# Смена заголовка родителя пересобирает векторы потомков: UPDATE ...
+# SET title = title запускает их BEFORE-триггер
+PARENT_TRIGGERS = {
+    "content_course": (
+        "OLD.title IS DISTINCT FROM NEW.title",
+        """
+        UPDATE content_module SET title = title WHERE course_id = NEW.id;
+        UPDATE content_lessontheory SET title = title
+        WHERE module_id IN (
+            SELECT id FROM content_module WHERE course_id = NEW.id
+        );
+        """,
+        "title",
+    ),
+    "content_module": (
+        "OLD.title IS DISTINCT FROM NEW.title "
+        "OR OLD.course_id IS DISTINCT FROM NEW.course_id",
+        """
+        UPDATE content_lessontheory SET title = title
+        WHERE module_id = NEW.id;
+        """,
+        "title, course_id",
+    ),
+}
+
+
+def _install_search_triggers(schema_editor, with_parents):
+    for table, (fields, foreign_key, parents) in SEARCH_DOCUMENTS.items():
+        parts = [
+            f"setweight(to_tsvector('{config}', "
+            f"coalesce(NEW.{field}, '')), '{weight}')"
+            for field, weight in fields
+            for config in SEARCH_CONFIGS
+        ]
+        watched = [field for field, _ in fields]
+        if with_parents:
+            parts += [
+                f"setweight(to_tsvector('{config}', "
+                f"coalesce({parent}, '')), 'C')"
+                for parent in parents
+                for config in SEARCH_CONFIGS
+            ]
+            watched.append(foreign_key)
+        document = " ||\n".join(parts)
+        columns = ", ".join(watched)
+        schema_editor.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update()
+            RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {document};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS {table}_search_vector_trigger
+            ON {table};
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {columns} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update();
+
+            UPDATE {table} SET {fields[0][0]} = {fields[0][0]};
+            """
+        )
+
+
+def add_parent_titles(apps, schema_editor):
+    # Триггеры есть только в PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, (condition, body, columns) in PARENT_TRIGGERS.items():
+        schema_editor.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_search_children_update()
+            RETURNS trigger AS $$
+            BEGIN
+                {body}
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER {table}_search_children_trigger
+            AFTER UPDATE OF {columns} ON {table}
+            FOR EACH ROW WHEN ({condition})
+            EXECUTE FUNCTION {table}_search_children_update();
+            """
+        )
+    _install_search_triggers(schema_editor, with_parents=True)
+
+
+def remove_parent_titles(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in PARENT_TRIGGERS:
+        schema_editor.execute(
+            f"""
+            DROP TRIGGER IF EXISTS {table}_search_children_trigger
+            ON {table};
+            DROP FUNCTION IF EXISTS {table}_search_children_update();
+            """
+        )
+    _install_search_triggers(schema_editor, with_parents=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0009_revision"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_parent_titles, remove_parent_titles),
+    ]
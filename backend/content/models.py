@@ -1,8 +1,98 @@
+from typing import TYPE_CHECKING
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+)
+from django.core.files.storage import default_storage
 from django.core.validators import MinValueValidator
-from django.db import models
-from django.utils.text import slugify
+from django.db import connections, models, transaction
+from django.db.models import F, FloatField, Max, Q, Value
+from django.db.models.functions import Substr
 from django.utils.translation import gettext_lazy as _
-from unidecode import unidecode
+
+# Шаг между соседними order_index: вставка между элементами не
+# требует перенумерации соседей, пока в промежутке есть место.
+ORDER_GAP = 1024
+
+
+if TYPE_CHECKING:
+    from django.db.models import Model as _ModelBase
+else:
+    _ModelBase = object
+
+
+class GapOrderedMixin(_ModelBase):
+    """Sparse order_index within the parent, assigned on insert"""
+
+    order_parent_field: str = ""
+    order_index: int | None
+
+    def next_order_index(self):
+        """
+        Следующий ключ после последнего ребёнка. Строка родителя
+        блокируется, поэтому параллельные вставки в один модуль или
+        курс не получают одинаковый ключ; вызывать внутри транзакции.
+        """
+        parent_id = getattr(self, f"{self.order_parent_field}_id")
+        parent_model = self._meta.get_field(
+            self.order_parent_field
+        ).related_model
+        parent_model.objects.select_for_update().filter(
+            pk=parent_id
+        ).values_list("pk").first()
+        last = (
+            type(self)
+            .objects.filter(**{f"{self.order_parent_field}_id": parent_id})
+            .aggregate(last=Max("order_index"))["last"]
+        )
+        return (last or 0) + ORDER_GAP
+
+    def save(self, *args, **kwargs):
+        if self.order_index is not None:
+            super().save(*args, **kwargs)
+            return
+        with transaction.atomic(using=kwargs.get("using")):
+            self.order_index = self.next_order_index()
+            super().save(*args, **kwargs)
+
+
+# Конфигурации полнотекстового поиска: контент бывает на обоих языках
+SEARCH_CONFIGS = ("russian", "english")
+
+
+class SearchQuerySet(models.QuerySet):
+    """
+    Full-text search over search_vector. The vector is maintained by
+    PostgreSQL triggers (see migrations) from model.search_document
+    and the parent titles in model.search_parents.
+    """
+
+    def search(self, text):
+        """Фильтрует по запросу и аннотирует search_rank"""
+        text = text.strip()
+
+        if connections[self.db].vendor != "postgresql":
+            # Без PostgreSQL (тесты на SQLite) — поиск по подстроке
+            condition = Q()
+            for field in (
+                *self.model.search_document,
+                *self.model.search_parents,
+            ):
+                condition |= Q(**{f"{field}__icontains": text})
+            return self.filter(condition).annotate(
+                search_rank=Value(1.0, output_field=FloatField())
+            )
+
+        query = None
+        for config in SEARCH_CONFIGS:
+            part = SearchQuery(text, config=config, search_type="websearch")
+            query = part if query is None else query | part
+        return self.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query)
+        )
 
 
 class Technology(models.Model):
@@ -35,6 +125,14 @@ class Course(models.Model):
         null=True,
         blank=True,
     )
+    # {"source": <image.name>, "items": [{"width", "height", "format",
+    # "path"}, ...]} — заполняется в фоне CourseImageService
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name=_("Cover renditions"),
+    )
     is_active = models.BooleanField(default=True, verbose_name=_("Active"))
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name=_("Created at")
@@ -45,23 +143,62 @@ class Course(models.Model):
         verbose_name=_("Technologies"),
         related_name="courses",
     )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = _("Course")
         verbose_name_plural = _("Courses")
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset-пагинация каталога по (created_at, id)
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="content_course_created_id_idx",
+            ),
+        ]
+
+    search_document = ("title", "description")
+    search_parents: tuple[str, ...] = ()
+
+    objects = SearchQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            # Create slug from title using unidecode
-            self.slug = slugify(unidecode(self.title))
+            # Уникальный слаг из заголовка; суффикс -2, -3, ... при повторе
+            from content.services.slugs import SlugService  # noqa
+
+            SlugService.assign([self])
         super().save(*args, **kwargs)
 
+    @property
+    def renditions_outdated(self):
+        """Обложка сменилась, а версии ещё не пересчитаны"""
+        source = self.image_renditions.get("source")
+        return (self.image.name or None) != source
 
-class Module(models.Model):
+    def image_url(self, width, image_format="webp"):
+        """
+        URL самой маленькой версии обложки не уже width. Пока версии
+        не готовы — URL оригинала.
+        """
+        if not self.image:
+            return None
+        items = [
+            item
+            for item in self.image_renditions.get("items", [])
+            if item["format"] == image_format
+        ]
+        if self.renditions_outdated or not items:
+            return self.image.url
+        items.sort(key=lambda item: item["width"])
+        fitting = [item for item in items if item["width"] >= width]
+        return default_storage.url((fitting or items[-1:])[0]["path"])
+
+
+class Module(GapOrderedMixin, models.Model):
     """Course modules"""
 
     course = models.ForeignKey(
@@ -75,23 +212,52 @@ class Module(models.Model):
         verbose_name=_("Module description"), blank=True
     )
     order_index = models.PositiveIntegerField(
-        default=1,
+        blank=True,
         validators=[MinValueValidator(1)],
         verbose_name=_("Order number"),
+        help_text=_("Leave empty to put the item last"),
     )
     is_active = models.BooleanField(default=True, verbose_name=_("Active"))
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = _("Module")
         verbose_name_plural = _("Modules")
         ordering = ["order_index"]
-        unique_together = ["course", "order_index"]
+        # DEFERRED: перестановка соседей одним UPDATE не упирается во
+        # временные дубликаты order_index
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "order_index"],
+                name="content_module_course_order_uniq",
+                deferrable=models.Deferrable.DEFERRED,
+            )
+        ]
+
+    order_parent_field = "course"
+    search_document = ("title", "description")
+    # Заголовки родителей в векторе с весом C (миграция 0010)
+    search_parents = ("course__title",)
+
+    objects = SearchQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.course.title} - {self.title}"
 
 
-class LessonTheory(models.Model):
+class LessonTheoryQuerySet(SearchQuerySet):
+    def lean(self, preview_length=100):
+        """
+        Без полного текста урока: content откладывается, вместо него
+        аннотируется обрезанный в БД content_head. Вместе с
+        content_length этого хватает для превью в списках.
+        """
+        return self.defer("content", "content_html", "search_vector").annotate(
+            content_head=Substr("content", 1, preview_length)
+        )
+
+
+class LessonTheory(GapOrderedMixin, models.Model):
     """Module theory lessons"""
 
     module = models.ForeignKey(
@@ -102,18 +268,89 @@ class LessonTheory(models.Model):
     )
     title = models.CharField(max_length=200, verbose_name=_("Lesson title"))
     content = models.TextField(verbose_name=_("Lesson content"))
+    content_length = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_("Content length")
+    )
+    # Markdown -> очищенный HTML, считается в фоне LessonRenderService;
+    # content_html_hash — хэш исходника и настроек рендера
+    content_html = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Rendered content"),
+    )
+    content_html_hash = models.CharField(
+        max_length=40, blank=True, default="", editable=False
+    )
     order_index = models.PositiveIntegerField(
-        default=1,
+        blank=True,
         validators=[MinValueValidator(1)],
         verbose_name=_("Order number"),
+        help_text=_("Leave empty to put the item last"),
     )
     is_active = models.BooleanField(default=True, verbose_name=_("Active"))
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = _("Theory lesson")
         verbose_name_plural = _("Theory lessons")
         ordering = ["order_index"]
-        unique_together = ["module", "order_index"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["module", "order_index"],
+                name="content_lessontheory_module_order_uniq",
+                deferrable=models.Deferrable.DEFERRED,
+            )
+        ]
+
+    order_parent_field = "module"
+    search_document = ("title", "content")
+    search_parents = ("module__title", "module__course__title")
+
+    objects = LessonTheoryQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.module.title} - {self.title}"
+
+    def save(self, *args, **kwargs):
+        # Отложенный content (lean()) не трогаем, иначе он загрузится
+        if "content" not in self.get_deferred_fields():
+            self.content_length = len(self.content)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "content" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "content_length"}
+        super().save(*args, **kwargs)
+
+
+class Revision(models.Model):
+    """Delta-compressed history of long text fields"""
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, verbose_name=_("Object type")
+    )
+    object_id = models.PositiveBigIntegerField(verbose_name=_("Object id"))
+    field = models.CharField(max_length=50, verbose_name=_("Field"))
+    number = models.PositiveIntegerField(verbose_name=_("Revision number"))
+    # Снимок хранит полный текст, остальные ревизии — разницу с
+    # предыдущей; data сжата zlib
+    is_snapshot = models.BooleanField(default=False)
+    data = models.BinaryField()
+    content_hash = models.CharField(max_length=40)
+    content_length = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("Created at")
+    )
+
+    class Meta:
+        verbose_name = _("Revision")
+        verbose_name_plural = _("Revisions")
+        ordering = ["-number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "field", "number"],
+                name="content_revision_object_number_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.object_id}.{self.field} r{self.number}"
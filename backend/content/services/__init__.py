@@ -0,0 +1,21 @@
+from .activation import ContentActivationService
+from .clone import CourseCloneService
+from .images import CourseImageService
+from .ordering import OrderingService
+from .rendering import LessonRenderService
+from .revisions import RevisionService
+from .slugs import SlugService
+from .technology_index import TechnologyIndex
+from .transfer import ContentTransferService
+
+__all__ = [
+    "ContentActivationService",
+    "ContentTransferService",
+    "CourseCloneService",
+    "CourseImageService",
+    "LessonRenderService",
+    "OrderingService",
+    "RevisionService",
+    "SlugService",
+    "TechnologyIndex",
+]
@@ -0,0 +1,78 @@
+import logging
+
+from django.db import transaction
+
+from content.cache import bump_course_versions
+from content.models import Course, LessonTheory, Module
+
+logger = logging.getLogger(__name__)
+
+
+class ContentActivationService:
+    """
+    Cascading activation across course -> module -> lesson.
+    Each level is one set-based UPDATE regardless of selection size.
+    """
+
+    @staticmethod
+    def _invalidate(course_ids):
+        course_ids = list(course_ids)
+        transaction.on_commit(lambda: bump_course_versions(course_ids))
+
+    @classmethod
+    @transaction.atomic
+    def set_courses_active(cls, course_ids, is_active):
+        course_ids = list(course_ids)
+        result = {
+            "courses": Course.objects.filter(pk__in=course_ids).update(
+                is_active=is_active
+            ),
+            "modules": Module.objects.filter(course_id__in=course_ids).update(
+                is_active=is_active
+            ),
+            "lessons": LessonTheory.objects.filter(
+                module_id__in=Module.objects.filter(
+                    course_id__in=course_ids
+                ).values("id")
+            ).update(is_active=is_active),
+        }
+        cls._invalidate(course_ids)
+        logger.info(f"set_courses_active({is_active}): {result}")
+        return result
+
+    @classmethod
+    @transaction.atomic
+    def set_modules_active(cls, module_ids, is_active):
+        module_ids = list(module_ids)
+        result = {
+            "modules": Module.objects.filter(pk__in=module_ids).update(
+                is_active=is_active
+            ),
+            "lessons": LessonTheory.objects.filter(
+                module_id__in=module_ids
+            ).update(is_active=is_active),
+        }
+        cls._invalidate(
+            Module.objects.filter(pk__in=module_ids)
+            .values_list("course_id", flat=True)
+            .distinct()
+        )
+        logger.info(f"set_modules_active({is_active}): {result}")
+        return result
+
+    @classmethod
+    @transaction.atomic
+    def set_lessons_active(cls, lesson_ids, is_active):
+        lesson_ids = list(lesson_ids)
+        result = {
+            "lessons": LessonTheory.objects.filter(pk__in=lesson_ids).update(
+                is_active=is_active
+            ),
+        }
+        cls._invalidate(
+            Module.objects.filter(lessons_theories__in=lesson_ids)
+            .values_list("course_id", flat=True)
+            .distinct()
+        )
+        logger.info(f"set_lessons_active({is_active}): {result}")
+        return result
@@ -0,0 +1,113 @@
+import logging
+
+from django.db import transaction
+from django.utils.translation import gettext as _
+
+from content.cache import bump_course_versions
+from content.models import Course, LessonTheory, Module
+from content.services.slugs import SlugService
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+class CourseCloneService:
+    """Deep copy of courses: technologies, modules and lessons"""
+
+    @classmethod
+    @transaction.atomic
+    def clone_courses(cls, course_ids):
+        """
+        Клонирует курсы вместе с технологиями, модулями и уроками.
+        Один bulk_create на каждый уровень иерархии, всё в одной
+        транзакции. Копии создаются неактивными.
+        """
+        sources = list(Course.objects.filter(pk__in=course_ids))
+        if not sources:
+            return []
+
+        title_length = Course._meta.get_field("title").max_length
+        slugs = SlugService.unique_slugs(
+            Course, [f"{c.slug}-copy" for c in sources]
+        )
+
+        source_ids = [course.pk for course in sources]
+        for course, slug in zip(sources, slugs):
+            course.pk = None
+            course.title = f"{course.title} ({_('Copy')})"[:title_length]
+            course.slug = slug
+            course.is_active = False
+            # Версии обложки у копии свои, пересчитаются после коммита
+            course.image_renditions = {}
+        clones = Course.objects.bulk_create(sources)
+        course_map = {
+            old_id: clone.pk for old_id, clone in zip(source_ids, clones)
+        }
+
+        # Технологии: копируем строки промежуточной таблицы напрямую
+        through = Course.technology.through
+        through.objects.bulk_create(
+            [
+                through(
+                    course_id=course_map[course_id],
+                    technology_id=technology_id,
+                )
+                for course_id, technology_id in through.objects.filter(
+                    course_id__in=source_ids
+                ).values_list("course_id", "technology_id")
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        modules = list(
+            Module.objects.filter(course_id__in=source_ids).order_by(
+                "course_id", "order_index"
+            )
+        )
+        module_ids = [module.pk for module in modules]
+        for module in modules:
+            module.pk = None
+            module.course_id = course_map[module.course_id]
+        Module.objects.bulk_create(modules, batch_size=BATCH_SIZE)
+        module_map = {
+            old_id: module.pk for old_id, module in zip(module_ids, modules)
+        }
+
+        lessons_count = 0
+        batch = []
+        lessons = LessonTheory.objects.filter(
+            module_id__in=module_ids
+        ).order_by("module_id", "order_index")
+        for lesson in lessons.iterator(chunk_size=BATCH_SIZE):
+            lesson.pk = None
+            lesson.module_id = module_map[lesson.module_id]
+            batch.append(lesson)
+            if len(batch) >= BATCH_SIZE:
+                LessonTheory.objects.bulk_create(batch)
+                lessons_count += len(batch)
+                batch = []
+        if batch:
+            LessonTheory.objects.bulk_create(batch)
+            lessons_count += len(batch)
+
+        from content.tasks import generate_course_renditions  # noqa
+        from mentoring.tasks import recompute_course_matches  # noqa
+
+        clone_ids = list(course_map.values())
+        transaction.on_commit(lambda: bump_course_versions(clone_ids))
+        # bulk_create не шлёт m2m_changed: менторов подбираем сами
+        transaction.on_commit(
+            lambda: recompute_course_matches.delay(clone_ids)
+        )
+        for clone in clones:
+            if clone.image:
+                transaction.on_commit(
+                    lambda pk=clone.pk: generate_course_renditions.delay(pk)
+                )
+
+        logger.info(
+            f"Склонировано курсов: {len(clones)}, модулей: {len(modules)}, "
+            f"уроков: {lessons_count}"
+        )
+        return clones
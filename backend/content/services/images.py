@@ -0,0 +1,115 @@
+import hashlib
+from io import BytesIO
+import logging
+
+from PIL import Image, ImageOps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+
+from content.cache import bump_course_versions
+from content.models import Course
+
+logger = logging.getLogger(__name__)
+
+# Ограничивающие квадраты (px) для версий обложки
+RENDITION_SIZES = (320, 640, 1280)
+RENDITION_FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+    "jpeg": {
+        "format": "JPEG",
+        "quality": 82,
+        "optimize": True,
+        "progressive": True,
+    },
+}
+
+
+class CourseImageService:
+    """Size-bounded WebP/JPEG renditions of course covers"""
+
+    @staticmethod
+    def render(image, sizes=RENDITION_SIZES):
+        """
+        Генерирует (size, format, bytes, width, height). Метаданные
+        (EXIF и т.п.) не переносятся: сохраняются только пиксели.
+        Картинка не увеличивается: размеры больше оригинала
+        пропускаются, но одна версия есть всегда.
+        """
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        largest = max(image.size)
+        bounds = [size for size in sizes if size < largest] or [largest]
+        if largest not in bounds and largest < max(sizes):
+            bounds.append(largest)
+
+        for size in bounds:
+            copy = image.copy()
+            copy.thumbnail((size, size), Image.Resampling.LANCZOS)
+            for image_format, options in RENDITION_FORMATS.items():
+                buffer = BytesIO()
+                copy.save(buffer, **options)
+                yield size, image_format, buffer.getvalue(), *copy.size
+
+    @classmethod
+    def generate(cls, course_id):
+        """Пересчитывает версии обложки курса (вызывается из Celery)"""
+        course = (
+            Course.objects.filter(pk=course_id)
+            .only("id", "image", "image_renditions")
+            .first()
+        )
+        if course is None:
+            return []
+
+        old_paths = [
+            item["path"] for item in course.image_renditions.get("items", [])
+        ]
+        items = []
+        if course.image:
+            digest = hashlib.sha1(course.image.name.encode()).hexdigest()[:12]
+            with course.image.open("rb") as source:
+                image = Image.open(source)
+                for size, image_format, data, width, height in cls.render(
+                    image
+                ):
+                    path = default_storage.save(
+                        f"courses/renditions/{course.pk}/"
+                        f"{digest}-{size}.{image_format}",
+                        ContentFile(data),
+                    )
+                    items.append(
+                        {
+                            "width": width,
+                            "height": height,
+                            "format": image_format,
+                            "path": path,
+                        }
+                    )
+
+        # Обложку могли сменить, пока мы работали — тогда результат
+        # устарел, а новую версию посчитает следующая задача
+        source = course.image.name or None
+        same_image = (
+            Q(image=source) if source else Q(image="") | Q(image__isnull=True)
+        )
+        updated = Course.objects.filter(same_image, pk=course.pk).update(
+            image_renditions={"source": source, "items": items}
+        )
+        if not updated:
+            cls.delete_files([item["path"] for item in items])
+            return []
+
+        # update() сигналов не шлёт: без сдвига версии каталог отдавал
+        # бы 304 со ссылками на оригинал
+        transaction.on_commit(lambda: bump_course_versions([course.pk]))
+
+        new_paths = {item["path"] for item in items}
+        cls.delete_files([p for p in old_paths if p not in new_paths])
+        logger.info(f"Обложка курса {course.pk}: {len(items)} версий")
+        return items
+
+    @staticmethod
+    def delete_files(paths):
+        for path in paths:
+            default_storage.delete(path)
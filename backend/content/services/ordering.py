@@ -0,0 +1,142 @@
+import logging
+
+from django.db import models, transaction
+from django.db.models import Case, Value, When
+
+from content.cache import bump_course_versions
+from content.models import ORDER_GAP, Course, LessonTheory, Module
+
+logger = logging.getLogger(__name__)
+
+
+class OrderingService:
+    """
+    Gap-based ordering of modules within a course and lessons within
+    a module. Every operation locks the parent row, so concurrent
+    editors of the same course or module are applied one after another.
+    """
+
+    parents = {Module: Course, LessonTheory: Module}
+
+    @classmethod
+    def _lock_parent(cls, model, parent_id):
+        parent_model = cls.parents[model]
+        parent = (
+            parent_model.objects.select_for_update()
+            .filter(pk=parent_id)
+            .first()
+        )
+        if parent is None:
+            raise ValueError(
+                f"{parent_model.__name__} {parent_id} does not exist"
+            )
+        return parent
+
+    @staticmethod
+    def _course_id(parent):
+        return parent.pk if isinstance(parent, Course) else parent.course_id
+
+    @staticmethod
+    def _set_keys(model, keys):
+        """Записывает {pk: order_index} одним UPDATE"""
+        return model.objects.filter(pk__in=keys).update(
+            order_index=Case(
+                *[When(pk=pk, then=Value(key)) for pk, key in keys.items()],
+                output_field=models.PositiveIntegerField(),
+            )
+        )
+
+    @classmethod
+    @transaction.atomic
+    def reorder(cls, model, parent_id, ids):
+        """
+        Расставляет переданные id в указанном порядке. Элементы
+        занимают те же позиции, что и до перестановки, поэтому можно
+        передать как всех детей родителя, так и видимую часть списка.
+        """
+        parent = cls._lock_parent(model, parent_id)
+        ids = list(dict.fromkeys(ids))
+        current = dict(
+            model.objects.filter(
+                pk__in=ids, **{model.order_parent_field: parent}
+            ).values_list("pk", "order_index")
+        )
+        missing = set(ids) - set(current)
+        if missing:
+            raise ValueError(
+                f"{model.__name__} {sorted(missing)} do not belong "
+                f"to {parent_id}"
+            )
+
+        keys = dict(zip(ids, sorted(current.values())))
+        cls._set_keys(model, keys)
+
+        course_id = cls._course_id(parent)
+        transaction.on_commit(lambda: bump_course_versions([course_id]))
+        return keys
+
+    @classmethod
+    @transaction.atomic
+    def rebalance(cls, model, parent_id):
+        """Возвращает равномерный шаг ORDER_GAP между всеми детьми"""
+        parent = cls._lock_parent(model, parent_id)
+        ids = model.objects.filter(
+            **{model.order_parent_field: parent}
+        ).values_list("pk", flat=True)
+        keys = {
+            pk: position * ORDER_GAP
+            for position, pk in enumerate(
+                ids.order_by("order_index", "pk"), start=1
+            )
+        }
+        cls._set_keys(model, keys)
+        logger.info(
+            f"rebalance {model.__name__} в {parent_id}: {len(keys)} элементов"
+        )
+        return keys
+
+    @staticmethod
+    def _bounds(siblings, after):
+        """Ключ after и ближайший следующий ключ среди соседей"""
+        low = after.order_index if after is not None else 0
+        high = (
+            siblings.filter(order_index__gt=low)
+            .order_by("order_index")
+            .values_list("order_index", flat=True)
+            .first()
+        )
+        return low, high if high is not None else low + 2 * ORDER_GAP
+
+    @classmethod
+    @transaction.atomic
+    def move(cls, obj, after=None):
+        """
+        Ставит obj сразу после after (или первым, если after=None).
+        Обычно это один UPDATE одной строки; перенумерация соседей
+        нужна, только когда промежуток между ключами исчерпан.
+        """
+        model = type(obj)
+        parent_field = model.order_parent_field
+        parent_id = getattr(obj, f"{parent_field}_id")
+        parent = cls._lock_parent(model, parent_id)
+        if after is not None and getattr(after, f"{parent_field}_id") != (
+            parent_id
+        ):
+            raise ValueError(f"{after} does not belong to {parent}")
+
+        siblings = model.objects.filter(**{parent_field: parent}).exclude(
+            pk=obj.pk
+        )
+        low, high = cls._bounds(siblings, after)
+        if high - low < 2:
+            cls.rebalance(model, parent_id)
+            if after is not None:
+                after.refresh_from_db(fields=["order_index"])
+            low, high = cls._bounds(siblings, after)
+
+        obj.order_index = low + (high - low) // 2
+        model.objects.filter(pk=obj.pk).update(order_index=obj.order_index)
+
+        course_id = cls._course_id(parent)
+        transaction.on_commit(lambda: bump_course_versions([course_id]))
+        return obj.order_index
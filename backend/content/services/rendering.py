@@ -0,0 +1,153 @@
+import hashlib
+import logging
+
+from django.db import transaction
+from django.db.models import F
+import markdown
+import nh3
+
+from content.cache import bump_course_versions
+from content.models import LessonTheory
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+# Меняйте при любой правке настроек ниже: хэши всех уроков устареют,
+# и render_lessons перерисует их
+RENDERER_VERSION = "1"
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists", "smarty"]
+ALLOWED_TAGS = {
+    "a",
+    "abbr",
+    "blockquote",
+    "br",
+    "code",
+    "dd",
+    "del",
+    "div",
+    "dl",
+    "dt",
+    "em",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "img",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "table",
+    "tbody",
+    "td",
+    "th",
+    "thead",
+    "tr",
+    "ul",
+}
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "abbr": {"title"},
+    "img": {"src", "alt", "title"},
+    "code": {"class"},
+    "th": {"align"},
+    "td": {"align"},
+}
+
+
+class LessonRenderService:
+    """
+    Markdown -> sanitized HTML for lessons, stored next to the source
+    and recomputed only when the source or the renderer changes.
+    """
+
+    @staticmethod
+    def source_hash(content):
+        source = f"{RENDERER_VERSION}:{content}"
+        return hashlib.sha1(source.encode()).hexdigest()
+
+    @staticmethod
+    def render(content):
+        html = markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+        return nh3.clean(
+            html,
+            tags=ALLOWED_TAGS,
+            attributes=ALLOWED_ATTRIBUTES,
+            link_rel="noopener noreferrer",
+        )
+
+    @classmethod
+    def is_outdated(cls, lesson):
+        return lesson.content_html_hash != cls.source_hash(lesson.content)
+
+    @classmethod
+    def render_lesson(cls, lesson_id):
+        """Перерисовывает урок, если исходник изменился (из Celery)"""
+        lesson = cls._lessons().filter(pk=lesson_id).first()
+        if lesson is None or not cls.is_outdated(lesson):
+            return False
+        # Текст могли поменять, пока мы рисовали — тогда результат
+        # не пишем, новый текст отрисует следующая задача
+        updated = LessonTheory.objects.filter(
+            pk=lesson.pk, content=lesson.content
+        ).update(
+            content_html=cls.render(lesson.content),
+            content_html_hash=cls.source_hash(lesson.content),
+        )
+        if updated:
+            cls._bump([lesson])
+        return bool(updated)
+
+    @classmethod
+    def render_outdated(cls, force=False, batch_size=BATCH_SIZE):
+        """
+        Перерисовывает все устаревшие уроки пачками bulk_update.
+        force=True перерисовывает все уроки подряд. Возвращает
+        количество перерисованных.
+        """
+        lessons = cls._lessons().order_by("pk")
+        rendered, batch = 0, []
+        for lesson in lessons.iterator(chunk_size=batch_size):
+            if not force and not cls.is_outdated(lesson):
+                continue
+            lesson.content_html = cls.render(lesson.content)
+            lesson.content_html_hash = cls.source_hash(lesson.content)
+            batch.append(lesson)
+            if len(batch) >= batch_size:
+                rendered += cls._write(batch)
+                batch = []
+        if batch:
+            rendered += cls._write(batch)
+        logger.info(f"Перерисовано уроков: {rendered}")
+        return rendered
+
+    @staticmethod
+    def _lessons():
+        return LessonTheory.objects.only(
+            "id", "content", "content_html_hash"
+        ).annotate(parent_course_id=F("module__course_id"))
+
+    @staticmethod
+    def _bump(lessons):
+        """
+        update()/bulk_update() сигналов не шлют: без сдвига версий
+        каталог отдавал бы 304 с пустым html, снятым до отрисовки
+        """
+        course_ids = {lesson.parent_course_id for lesson in lessons}
+        transaction.on_commit(lambda: bump_course_versions(course_ids))
+
+    @classmethod
+    def _write(cls, lessons):
+        LessonTheory.objects.bulk_update(
+            lessons, ["content_html", "content_html_hash"]
+        )
+        cls._bump(lessons)
+        return len(lessons)
@@ -0,0 +1,146 @@
+from difflib import SequenceMatcher
+import hashlib
+import json
+import logging
+import zlib
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from content.models import Revision
+
+logger = logging.getLogger(__name__)
+
+# Полный снимок каждые N ревизий: восстановление любой ревизии читает
+# не больше N строк одним запросом
+SNAPSHOT_INTERVAL = 20
+
+
+class RevisionService:
+    """
+    Revision history of text fields: a full snapshot every
+    SNAPSHOT_INTERVAL revisions and line diffs in between.
+    """
+
+    @staticmethod
+    def content_hash(text):
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    @staticmethod
+    def snapshot_number(number):
+        """Номер снимка, с которого восстанавливается ревизия"""
+        return number - (number - 1) % SNAPSHOT_INTERVAL
+
+    @staticmethod
+    def diff(old, new):
+        """
+        Разница построчно: [i1, i2] — взять строки i1:i2 старого
+        текста, строка — вставить как есть.
+        """
+        old_lines = old.splitlines(keepends=True)
+        new_lines = new.splitlines(keepends=True)
+        matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        ops: list[list[int] | str] = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append([i1, i2])
+            elif tag in ("replace", "insert"):
+                ops.append("".join(new_lines[j1:j2]))
+        return ops
+
+    @staticmethod
+    def patch(old, ops):
+        old_lines = old.splitlines(keepends=True)
+        return "".join(
+            op if isinstance(op, str) else "".join(old_lines[op[0] : op[1]])
+            for op in ops
+        )
+
+    @staticmethod
+    def _pack(value):
+        return zlib.compress(json.dumps(value, ensure_ascii=False).encode())
+
+    @staticmethod
+    def _unpack(data):
+        return json.loads(zlib.decompress(bytes(data)))
+
+    @staticmethod
+    def _filter(model, object_id, field):
+        return Revision.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id=object_id,
+            field=field,
+        )
+
+    @classmethod
+    def rebuild(cls, model, object_id, field, number):
+        """Текст ревизии number: снимок плюс диффы, один запрос"""
+        rows = list(
+            cls._filter(model, object_id, field)
+            .filter(
+                number__gte=cls.snapshot_number(number), number__lte=number
+            )
+            .order_by("number")
+            .values_list("number", "is_snapshot", "data")
+        )
+        if not rows or rows[-1][0] != number or not rows[0][1]:
+            raise Revision.DoesNotExist(
+                f"Revision {number} of {model.__name__} {object_id}.{field}"
+            )
+        text = None
+        for _number, is_snapshot, data in rows:
+            value = cls._unpack(data)
+            text = value if is_snapshot else cls.patch(text, value)
+        return text
+
+    @classmethod
+    @transaction.atomic
+    def record(cls, model, object_id, field):
+        """
+        Сохраняет текущее значение поля новой ревизией, если оно
+        отличается от последней (вызывается из Celery после коммита).
+        Строка объекта блокируется, поэтому задачи по одному объекту
+        идут по очереди.
+        """
+        text = (
+            model.objects.select_for_update()
+            .filter(pk=object_id)
+            .values_list(field, flat=True)
+            .first()
+        )
+        if text is None:
+            return None
+
+        content_hash = cls.content_hash(text)
+        last = (
+            cls._filter(model, object_id, field)
+            .order_by("-number")
+            .values_list("number", "content_hash")
+            .first()
+        )
+        if last and last[1] == content_hash:
+            return None
+
+        number = last[0] + 1 if last else 1
+        is_snapshot = cls.snapshot_number(number) == number
+        if is_snapshot:
+            value = text
+        else:
+            previous = cls.rebuild(model, object_id, field, last[0])
+            value = cls.diff(previous, text)
+
+        revision = Revision.objects.create(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id=object_id,
+            field=field,
+            number=number,
+            is_snapshot=is_snapshot,
+            data=cls._pack(value),
+            content_hash=content_hash,
+            content_length=len(text),
+        )
+        logger.info(
+            f"Ревизия {number} {model.__name__} {object_id}.{field}: "
+            f"{len(revision.data)} байт"
+        )
+        return revision
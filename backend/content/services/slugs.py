@@ -0,0 +1,64 @@
+from django.db.models import Q
+from django.utils.text import slugify
+from unidecode import unidecode
+
+# Запас под суффикс вида "-123"
+SUFFIX_RESERVE = 8
+
+
+class SlugService:
+    """
+    Unique slugs for a batch of objects: existing slugs with the same
+    prefixes are read in one query, suffixes are assigned in memory.
+    """
+
+    @staticmethod
+    def slugify(text, max_length):
+        base = slugify(unidecode(text or ""))
+        return base[: max_length - SUFFIX_RESERVE].rstrip("-")
+
+    @classmethod
+    def unique_slugs(cls, model, bases, field="slug"):
+        """
+        Уникальные слаги для списка баз, порядок сохраняется.
+        Одинаковые базы внутри пачки тоже получают разные суффиксы.
+        """
+        max_length = model._meta.get_field(field).max_length
+        fallback = model._meta.model_name
+        bases = [cls.slugify(base, max_length) or fallback for base in bases]
+        if not bases:
+            return []
+
+        prefixes = Q()
+        for base in set(bases):
+            prefixes |= Q(**{f"{field}__startswith": base})
+        taken = set(
+            model._default_manager.filter(prefixes).values_list(
+                field, flat=True
+            )
+        )
+
+        slugs = []
+        for base in bases:
+            slug, suffix = base, 1
+            while slug in taken:
+                suffix += 1
+                slug = f"{base}-{suffix}"
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    @classmethod
+    def assign(cls, objects, source="title", field="slug"):
+        """Заполняет пустые слаги у объектов (перед save/bulk_create)"""
+        pending = [obj for obj in objects if not getattr(obj, field)]
+        if not pending:
+            return objects
+        slugs = cls.unique_slugs(
+            type(pending[0]),
+            [getattr(obj, source) for obj in pending],
+            field=field,
+        )
+        for obj, slug in zip(pending, slugs):
+            setattr(obj, field, slug)
+        return objects
@@ -0,0 +1,108 @@
+from bisect import bisect_left
+import re
+import threading
+import time
+from types import MappingProxyType
+
+from unidecode import unidecode
+
+from content.cache import get_technology_index_version
+from content.models import Technology
+
+# Как часто (с) сверять версию индекса с общим кэшем
+VERSION_CHECK_INTERVAL = 1.0
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def normalize(text):
+    """Ключ поиска: транслит, нижний регистр, без лишних пробелов"""
+    return " ".join(unidecode(text or "").lower().split())
+
+
+class TechnologyIndex:
+    """
+    Process-local sorted prefix index of technology names. Built on the
+    first lookup and rebuilt when the shared index version changes.
+    """
+
+    # (ключи, id технологий ключей, id -> имя): один атрибут, чтобы
+    # читатель не смешал части старого и нового индекса
+    _index: tuple[
+        tuple[str, ...], tuple[int, ...], MappingProxyType[int, str]
+    ] = ((), (), MappingProxyType({}))
+    _version = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _index_keys(name):
+        """Полное имя и каждое слово: "vue.js" -> vue.js, vue, js"""
+        full = normalize(name)
+        words = _WORD_RE.findall(full)
+        return {full, *words}
+
+    @classmethod
+    def build(cls, version=None):
+        names = dict(Technology.objects.values_list("id", "name"))
+        pairs = sorted(
+            (key, pk)
+            for pk, name in names.items()
+            for key in cls._index_keys(name)
+        )
+        # Подмена целиком: читатели видят либо старый, либо новый индекс
+        cls._index = (
+            tuple(key for key, _ in pairs),
+            tuple(pk for _, pk in pairs),
+            MappingProxyType(names),
+        )
+        cls._version = version
+        return len(names)
+
+    @classmethod
+    def invalidate(cls):
+        """Перестроить индекс этого процесса при следующем поиске"""
+        cls._version = None
+
+    @classmethod
+    def _ensure_fresh(cls):
+        now = time.monotonic()
+        if cls._version is not None and (
+            now - cls._checked_at < VERSION_CHECK_INTERVAL
+        ):
+            return
+        version = get_technology_index_version()
+        with cls._lock:
+            if version != cls._version:
+                cls.build(version)
+            cls._checked_at = now
+
+    @classmethod
+    def search(cls, query, limit=DEFAULT_LIMIT):
+        """
+        [(id, name)] технологий, имя или слово имени которых
+        начинается с query. Совпадения с начала имени идут первыми.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        cls._ensure_fresh()
+        keys, entries, names = cls._index
+
+        found: dict[int, str] = {}
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            pk = entries[position]
+            found.setdefault(pk, names[pk])
+            position += 1
+
+        ranked = sorted(
+            found.items(),
+            key=lambda item: (
+                not normalize(item[1]).startswith(prefix),
+                item[1].lower(),
+            ),
+        )
+        return ranked[:limit] if limit else ranked
@@ -0,0 +1,238 @@
+import logging
+import time
+
+from django.db import transaction
+from django.db.models import Prefetch
+
+from content.cache import bump_course_versions, bump_technology_index_version
+from content.models import Course, LessonTheory, Module, Technology
+from content.services.slugs import SlugService
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 2000
+
+COURSE_FIELDS = ("slug", "title", "description", "image", "is_active")
+MODULE_FIELDS = ("title", "description", "order_index", "is_active")
+LESSON_FIELDS = ("title", "content", "order_index", "is_active")
+
+
+class ContentTransferService:
+    """
+    Streaming export/import of courses, modules, lessons and technology
+    links as flat records: all courses, then modules, then lessons.
+    """
+
+    @staticmethod
+    def export(course_ids=None, chunk_size=BATCH_SIZE):
+        """
+        Генерирует записи {"type": ..., "key": <id в источнике>, ...}.
+        iterator() читает строки порциями (на PostgreSQL — серверным
+        курсором), в памяти одновременно не больше chunk_size строк.
+        """
+        courses = Course.objects.order_by("pk")
+        if course_ids is not None:
+            courses = courses.filter(pk__in=course_ids)
+        technologies = Prefetch(
+            "technology", queryset=Technology.objects.only("id", "name")
+        )
+        for course in (
+            courses.only("id", *COURSE_FIELDS)
+            .prefetch_related(technologies)
+            .iterator(chunk_size=chunk_size)
+        ):
+            record = {"type": "course", "key": course.pk}
+            record.update((f, getattr(course, f)) for f in COURSE_FIELDS)
+            record["image"] = course.image.name or None
+            record["technologies"] = [t.name for t in course.technology.all()]
+            yield record
+
+        modules = Module.objects.filter(course__in=courses).order_by(
+            "course_id", "order_index"
+        )
+        for values in modules.values(
+            "id", "course_id", *MODULE_FIELDS
+        ).iterator(chunk_size=chunk_size):
+            yield {
+                "type": "module",
+                "key": values.pop("id"),
+                "course": values.pop("course_id"),
+                **values,
+            }
+
+        lessons = LessonTheory.objects.filter(
+            module__course__in=courses
+        ).order_by("module_id", "order_index")
+        for values in lessons.values("module_id", *LESSON_FIELDS).iterator(
+            chunk_size=chunk_size
+        ):
+            yield {
+                "type": "lesson",
+                "module": values.pop("module_id"),
+                **values,
+            }
+
+    @classmethod
+    @transaction.atomic
+    def import_records(cls, records, batch_size=BATCH_SIZE):
+        """
+        Импортирует записи из export() одним проходом. Курсы копятся
+        целиком (они небольшие), чтобы разрешить технологии одним
+        запросом; модули и уроки пишутся пачками по batch_size.
+        Возвращает {"courses": n, "modules": n, "lessons": n,
+        "technologies": n, "seconds": t}.
+        """
+        started = time.monotonic()
+        stats: dict[str, float] = {
+            "courses": 0,
+            "modules": 0,
+            "lessons": 0,
+            "technologies": 0,
+        }
+        courses, modules, lessons = [], [], []
+        with_images: list[int] = []
+        module_map: dict[int, int] = {}
+        course_map = None
+
+        for record in records:
+            kind = record.get("type")
+            if kind == "course":
+                if course_map is not None:
+                    raise ValueError("Course records must come first")
+                courses.append(record)
+                continue
+            if course_map is None:
+                course_map = cls._create_courses(courses, stats, with_images)
+
+            if kind == "module":
+                modules.append(record)
+                if len(modules) >= batch_size:
+                    cls._create_modules(modules, course_map, module_map)
+                    stats["modules"] += len(modules)
+                    modules = []
+            elif kind == "lesson":
+                if modules:
+                    cls._create_modules(modules, course_map, module_map)
+                    stats["modules"] += len(modules)
+                    modules = []
+                lessons.append(record)
+                if len(lessons) >= batch_size:
+                    cls._create_lessons(lessons, module_map)
+                    stats["lessons"] += len(lessons)
+                    lessons = []
+            else:
+                raise ValueError(f"Unknown record type: {kind!r}")
+
+        if course_map is None:
+            course_map = cls._create_courses(courses, stats, with_images)
+        if modules:
+            cls._create_modules(modules, course_map, module_map)
+            stats["modules"] += len(modules)
+        if lessons:
+            cls._create_lessons(lessons, module_map)
+            stats["lessons"] += len(lessons)
+
+        cls._after_import(list(course_map.values()), with_images, stats)
+        stats["seconds"] = time.monotonic() - started
+        logger.info(f"Импорт контента: {stats}")
+        return stats
+
+    @staticmethod
+    def _resolve_technologies(names):
+        """{name: id}: один SELECT и один INSERT недостающих"""
+        names = set(names)
+        found = dict(
+            Technology.objects.filter(name__in=names).values_list("name", "id")
+        )
+        missing = Technology.objects.bulk_create(
+            [Technology(name=name) for name in names - set(found)]
+        )
+        found.update((tech.name, tech.pk) for tech in missing)
+        return found, len(missing)
+
+    @classmethod
+    def _create_courses(cls, records, stats, with_images):
+        if not records:
+            return {}
+        technologies, created = cls._resolve_technologies(
+            name for record in records for name in record["technologies"]
+        )
+        stats["technologies"] = created
+
+        slugs = SlugService.unique_slugs(Course, [r["slug"] for r in records])
+        courses = []
+        for record, slug in zip(records, slugs):
+            course = Course(**{f: record[f] for f in COURSE_FIELDS})
+            course.slug = slug
+            course.image = record["image"] or None
+            courses.append(course)
+        Course.objects.bulk_create(courses, batch_size=BATCH_SIZE)
+
+        through = Course.technology.through
+        through.objects.bulk_create(
+            [
+                through(course_id=course.pk, technology_id=technologies[name])
+                for record, course in zip(records, courses)
+                for name in set(record["technologies"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        stats["courses"] = len(courses)
+        with_images.extend(course.pk for course in courses if course.image)
+        return {
+            record["key"]: course.pk
+            for record, course in zip(records, courses)
+        }
+
+    @staticmethod
+    def _create_modules(records, course_map, module_map):
+        modules = [
+            Module(
+                course_id=course_map[record["course"]],
+                **{f: record[f] for f in MODULE_FIELDS},
+            )
+            for record in records
+        ]
+        Module.objects.bulk_create(modules)
+        module_map.update(
+            (record["key"], module.pk)
+            for record, module in zip(records, modules)
+        )
+
+    @staticmethod
+    def _create_lessons(records, module_map):
+        LessonTheory.objects.bulk_create(
+            [
+                LessonTheory(
+                    module_id=module_map[record["module"]],
+                    content_length=len(record["content"]),
+                    **{f: record[f] for f in LESSON_FIELDS},
+                )
+                for record in records
+            ]
+        )
+
+    @staticmethod
+    def _after_import(course_ids, with_images, stats):
+        # bulk_create не отправляет сигналы: кэш, индекс технологий,
+        # подбор менторов, HTML уроков и версии обложек обновляем сами
+        # после коммита
+        from content.tasks import (  # noqa
+            generate_course_renditions,
+            render_outdated_lessons,
+        )
+        from mentoring.tasks import recompute_course_matches  # noqa
+
+        transaction.on_commit(lambda: bump_course_versions(course_ids))
+        if course_ids:
+            transaction.on_commit(
+                lambda: recompute_course_matches.delay(course_ids)
+            )
+        if stats["technologies"]:
+            transaction.on_commit(bump_technology_index_version)
+        if stats["lessons"]:
+            transaction.on_commit(lambda: render_outdated_lessons.delay())
+        for pk in with_images:
+            transaction.on_commit(
+                lambda pk=pk: generate_course_renditions.delay(pk)
+            )
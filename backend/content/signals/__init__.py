@@ -0,0 +1,22 @@
+from .images import schedule_course_renditions, schedule_renditions_cleanup
+from .rendering import schedule_lesson_rendering
+from .revisions import schedule_revision
+from .technologies import refresh_technology_index
+from .versions import (
+    bump_versions_on_course_change,
+    bump_versions_on_lesson_change,
+    bump_versions_on_module_change,
+    bump_versions_on_technology_change,
+)
+
+__all__ = [
+    "bump_versions_on_course_change",
+    "bump_versions_on_lesson_change",
+    "bump_versions_on_module_change",
+    "bump_versions_on_technology_change",
+    "refresh_technology_index",
+    "schedule_course_renditions",
+    "schedule_lesson_rendering",
+    "schedule_revision",
+    "schedule_renditions_cleanup",
+]
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from content.models import Course
+from content.tasks import delete_media_files, generate_course_renditions
+
+
+@receiver(
+    post_save,
+    sender=Course,
+    dispatch_uid="content.schedule_course_renditions.post_save",
+)
+def schedule_course_renditions(sender, instance, **kwargs):
+    # Картинка обрабатывается в Celery, запрос админки её не ждёт
+    if instance.renditions_outdated:
+        transaction.on_commit(
+            lambda: generate_course_renditions.delay(instance.pk)
+        )
+
+
+@receiver(
+    post_delete,
+    sender=Course,
+    dispatch_uid="content.schedule_renditions_cleanup.post_delete",
+)
+def schedule_renditions_cleanup(sender, instance, **kwargs):
+    paths = [
+        item["path"] for item in instance.image_renditions.get("items", [])
+    ]
+    if paths:
+        transaction.on_commit(lambda: delete_media_files.delay(paths))
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from content.models import LessonTheory
+from content.services import LessonRenderService
+from content.tasks import render_lesson_html
+
+
+@receiver(
+    post_save,
+    sender=LessonTheory,
+    dispatch_uid="content.schedule_lesson_rendering.post_save",
+)
+def schedule_lesson_rendering(sender, instance, **kwargs):
+    # Отложенный content (lean()) не загружаем: значит, он не менялся
+    if "content" in instance.get_deferred_fields():
+        return
+    if LessonRenderService.is_outdated(instance):
+        transaction.on_commit(lambda: render_lesson_html.delay(instance.pk))
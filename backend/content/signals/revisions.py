@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from content.models import Course, LessonTheory
+from content.tasks import record_revision
+
+# Какие поля попадают в историю правок
+REVISION_FIELDS = {Course: "description", LessonTheory: "content"}
+
+
+@receiver(
+    post_save,
+    sender=Course,
+    dispatch_uid="content.schedule_revision.course.post_save",
+)
+@receiver(
+    post_save,
+    sender=LessonTheory,
+    dispatch_uid="content.schedule_revision.lessontheory.post_save",
+)
+def schedule_revision(sender, instance, **kwargs):
+    field = REVISION_FIELDS[sender]
+    # Отложенное поле не менялось; неизменённый текст задача пропустит
+    if field in instance.get_deferred_fields():
+        return
+    label = sender._meta.label_lower
+    transaction.on_commit(
+        lambda: record_revision.delay(label, instance.pk, field)
+    )
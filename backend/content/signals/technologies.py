@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from content.cache import bump_technology_index_version
+from content.models import Technology
+from content.services import TechnologyIndex
+
+
+def _refresh():
+    bump_technology_index_version()
+    TechnologyIndex.invalidate()
+
+
+@receiver(
+    post_save,
+    sender=Technology,
+    dispatch_uid="content.refresh_technology_index.post_save",
+)
+@receiver(
+    post_delete,
+    sender=Technology,
+    dispatch_uid="content.refresh_technology_index.post_delete",
+)
+def refresh_technology_index(sender, instance, **kwargs):
+    transaction.on_commit(_refresh)
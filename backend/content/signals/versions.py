@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from content.cache import bump_course_versions
+from content.models import Course, LessonTheory, Module
+
+
+def _bump_on_commit(course_ids):
+    transaction.on_commit(lambda: bump_course_versions(course_ids))
+
+
+@receiver(
+    post_save,
+    sender=Course,
+    dispatch_uid="content.bump_versions_on_course_change.post_save",
+)
+@receiver(
+    post_delete,
+    sender=Course,
+    dispatch_uid="content.bump_versions_on_course_change.post_delete",
+)
+def bump_versions_on_course_change(sender, instance, **kwargs):
+    _bump_on_commit([instance.pk])
+
+
+@receiver(
+    post_save,
+    sender=Module,
+    dispatch_uid="content.bump_versions_on_module_change.post_save",
+)
+@receiver(
+    post_delete,
+    sender=Module,
+    dispatch_uid="content.bump_versions_on_module_change.post_delete",
+)
+def bump_versions_on_module_change(sender, instance, **kwargs):
+    _bump_on_commit([instance.course_id])
+
+
+# post_delete для уроков намеренно не слушаем: обработчик отключил бы
+# быстрое каскадное удаление и грузил бы каждый урок курса в память.
+# Удаление уроков из админки сдвигает версии в LessonTheoryAdmin.
+@receiver(
+    post_save,
+    sender=LessonTheory,
+    dispatch_uid="content.bump_versions_on_lesson_change.post_save",
+)
+def bump_versions_on_lesson_change(sender, instance, **kwargs):
+    course_ids = list(
+        Module.objects.filter(pk=instance.module_id).values_list(
+            "course_id", flat=True
+        )
+    )
+    _bump_on_commit(course_ids)
+
+
+@receiver(
+    m2m_changed,
+    sender=Course.technology.through,
+    dispatch_uid="content.bump_versions_on_technology_change.m2m_changed",
+)
+def bump_versions_on_technology_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # instance — технология, pk_set — затронутые курсы
+        _bump_on_commit(pk_set or [])
+    else:
+        _bump_on_commit([instance.pk])
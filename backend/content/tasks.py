@@ -0,0 +1,59 @@
+import logging
+
+from celery import shared_task
+from django.apps import apps
+
+from content.services import (
+    ContentActivationService,
+    CourseCloneService,
+    CourseImageService,
+    LessonRenderService,
+    RevisionService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def clone_courses(course_ids):
+    clones = CourseCloneService.clone_courses(course_ids)
+    logger.info(f"clone_courses: {course_ids} -> {[c.pk for c in clones]}")
+    return [clone.pk for clone in clones]
+
+
+@shared_task
+def set_courses_active(course_ids, is_active):
+    return ContentActivationService.set_courses_active(course_ids, is_active)
+
+
+@shared_task
+def set_modules_active(module_ids, is_active):
+    return ContentActivationService.set_modules_active(module_ids, is_active)
+
+
+@shared_task
+def generate_course_renditions(course_id):
+    items = CourseImageService.generate(course_id)
+    return [item["path"] for item in items]
+
+
+@shared_task
+def delete_media_files(paths):
+    CourseImageService.delete_files(paths)
+
+
+@shared_task
+def render_lesson_html(lesson_id):
+    return LessonRenderService.render_lesson(lesson_id)
+
+
+@shared_task
+def render_outdated_lessons(force=False):
+    return LessonRenderService.render_outdated(force=force)
+
+
+@shared_task
+def record_revision(model_label, object_id, field):
+    model = apps.get_model(model_label)
+    revision = RevisionService.record(model, object_id, field)
+    return revision.number if revision else None
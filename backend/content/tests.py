@@ -0,0 +1,635 @@
+from io import BytesIO, StringIO
+import os
+import tempfile
+from unittest import mock
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+from school_platform.admin.autocomplete import get_autocomplete_version
+
+from content.cache import get_course_versions
+from content.checks import check_shared_cache
+from content.models import (
+    ORDER_GAP,
+    Course,
+    LessonTheory,
+    Module,
+    Revision,
+    Technology,
+)
+from content.services import (
+    ContentActivationService,
+    ContentTransferService,
+    CourseCloneService,
+    CourseImageService,
+    LessonRenderService,
+    OrderingService,
+    RevisionService,
+    SlugService,
+    TechnologyIndex,
+)
+from content.services.revisions import SNAPSHOT_INTERVAL
+
+
+class CourseCloneServiceTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            title="Python", slug="python", description="Python course"
+        )
+        self.course.technology.set(
+            [
+                Technology.objects.create(name="Python"),
+                Technology.objects.create(name="Django"),
+            ]
+        )
+        for module_index in range(1, 3):
+            module = Module.objects.create(
+                course=self.course,
+                title=f"Module {module_index}",
+                order_index=module_index,
+            )
+            for lesson_index in range(1, 4):
+                LessonTheory.objects.create(
+                    module=module,
+                    title=f"Lesson {lesson_index}",
+                    content="Text",
+                    order_index=lesson_index,
+                )
+
+    def test_clone_copies_hierarchy(self):
+        (clone,) = CourseCloneService.clone_courses([self.course.pk])
+
+        self.assertNotEqual(clone.pk, self.course.pk)
+        self.assertFalse(clone.is_active)
+        self.assertEqual(clone.technology.count(), 2)
+        self.assertEqual(clone.modules.count(), 2)
+        self.assertEqual(
+            LessonTheory.objects.filter(module__course=clone).count(), 6
+        )
+        self.assertEqual(
+            LessonTheory.objects.filter(module__course=self.course).count(),
+            6,
+        )
+
+    def test_clone_slugs_do_not_collide(self):
+        (first,) = CourseCloneService.clone_courses([self.course.pk])
+        (second,) = CourseCloneService.clone_courses([self.course.pk])
+
+        self.assertEqual(first.slug, "python-copy")
+        self.assertEqual(second.slug, "python-copy-2")
+
+
+class SlugServiceTest(TestCase):
+    def test_batch_slugs_resolve_collisions_in_one_query(self):
+        Course.objects.create(title="Python", description="")
+        courses = [
+            Course(title=title, description="")
+            for title in ("Python", "Питон", "Python", "!!!")
+        ]
+
+        with self.assertNumQueries(1):
+            SlugService.assign(courses)
+
+        self.assertEqual(
+            [course.slug for course in courses],
+            ["python-2", "piton", "python-3", "course"],
+        )
+
+    def test_save_does_not_crash_on_duplicate_title(self):
+        first = Course.objects.create(title="Go Basics", description="")
+        second = Course.objects.create(title="Go Basics", description="")
+
+        self.assertEqual(
+            (first.slug, second.slug), ("go-basics", "go-basics-2")
+        )
+
+
+class ContentActivationServiceTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            title="Go", slug="go", description="Go course"
+        )
+        self.module = Module.objects.create(course=self.course, title="M")
+        LessonTheory.objects.create(module=self.module, title="L", content="")
+
+    def test_deactivate_course_cascades_in_fixed_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = ContentActivationService.set_courses_active(
+                [self.course.pk], False
+            )
+
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(result, {"courses": 1, "modules": 1, "lessons": 1})
+        self.assertFalse(
+            LessonTheory.objects.filter(module__course=self.course)
+            .filter(is_active=True)
+            .exists()
+        )
+
+    def test_activation_bumps_course_version(self):
+        before = get_course_versions([self.course.pk])[self.course.pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            ContentActivationService.set_modules_active(
+                [self.module.pk], False
+            )
+
+        after = get_course_versions([self.course.pk])[self.course.pk]
+        self.assertNotEqual(before, after)
+
+    def test_local_cache_warns_without_debug(self):
+        locmem = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            }
+        }
+        redis = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://redis:6379/1",
+            }
+        }
+        with override_settings(DEBUG=False, CACHES=locmem):
+            ids = [warning.id for warning in check_shared_cache(None)]
+        self.assertEqual(ids, ["content.W001"])
+        with override_settings(DEBUG=True, CACHES=locmem):
+            self.assertEqual(check_shared_cache(None), [])
+        with override_settings(DEBUG=False, CACHES=redis):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class OrderingServiceTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            title="Rust", slug="rust", description="Rust course"
+        )
+        self.modules = [
+            Module.objects.create(course=self.course, title=f"M{i}")
+            for i in range(3)
+        ]
+
+    def ordered_ids(self):
+        return list(
+            self.course.modules.order_by("order_index").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_new_items_get_sparse_keys(self):
+        self.assertEqual(
+            [m.order_index for m in self.modules],
+            [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP],
+        )
+
+    def test_reorder_is_single_update(self):
+        first, second, third = (m.pk for m in self.modules)
+        with CaptureQueriesContext(connection) as queries:
+            OrderingService.reorder(
+                Module, self.course.pk, [third, first, second]
+            )
+
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.ordered_ids(), [third, first, second])
+
+    def test_reorder_rejects_foreign_ids(self):
+        other = Course.objects.create(title="C", slug="c", description="")
+        foreign = Module.objects.create(course=other, title="F")
+        with self.assertRaises(ValueError):
+            OrderingService.reorder(Module, self.course.pk, [foreign.pk])
+
+    def test_move_rebalances_when_gap_is_exhausted(self):
+        first, second, third = self.modules
+        Module.objects.filter(pk=second.pk).update(
+            order_index=first.order_index + 1
+        )
+        second.refresh_from_db()
+
+        OrderingService.move(third, after=first)
+
+        self.assertEqual(self.ordered_ids(), [first.pk, third.pk, second.pk])
+
+
+class LessonTheoryLeanTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(title="JS", slug="js", description="")
+        module = Module.objects.create(course=course, title="M")
+        self.lesson = LessonTheory.objects.create(
+            module=module, title="L", content="x" * 150 + "TAIL"
+        )
+
+    def test_lean_defers_content(self):
+        lesson = LessonTheory.objects.lean(100).get(pk=self.lesson.pk)
+
+        self.assertIn("content", lesson.get_deferred_fields())
+        self.assertEqual(lesson.content_head, "x" * 100)
+        self.assertEqual(lesson.content_length, 154)
+
+    def test_changelist_does_not_embed_full_content(self):
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+
+        with translation.override("en"):
+            url = reverse("admin:content_lessontheory_changelist")
+        response = self.client.get(url)
+
+        self.assertContains(response, "x" * 100 + "...")
+        self.assertNotContains(response, "TAIL")
+
+
+class LessonAutocompleteVersionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = Course.objects.create(
+            title="JS", slug="js", description=""
+        )
+        self.module = Module.objects.create(course=self.course, title="M")
+        LessonTheory.objects.create(module=self.module, title="L")
+
+    def test_lessons_keep_fast_cascade_delete(self):
+        self.assertFalse(post_delete.has_listeners(LessonTheory))
+
+    def test_module_delete_resets_lesson_suggestions(self):
+        version = get_autocomplete_version(LessonTheory)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.module.delete()
+
+        self.assertFalse(LessonTheory.objects.exists())
+        self.assertNotEqual(get_autocomplete_version(LessonTheory), version)
+
+    def test_course_delete_resets_lesson_suggestions(self):
+        version = get_autocomplete_version(LessonTheory)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.delete()
+
+        self.assertNotEqual(get_autocomplete_version(LessonTheory), version)
+
+    def test_admin_lesson_delete_resets_suggestions(self):
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+        lesson = LessonTheory.objects.get()
+        version = get_autocomplete_version(LessonTheory)
+
+        with translation.override("en"):
+            url = reverse(
+                "admin:content_lessontheory_delete", args=[lesson.pk]
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url, {"post": "yes"})
+
+        self.assertFalse(LessonTheory.objects.exists())
+        self.assertNotEqual(get_autocomplete_version(LessonTheory), version)
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            title="Django для начинающих", slug="django", description="Web"
+        )
+        Course.objects.create(title="Go", slug="go", description="Backend")
+
+    def test_search_filters_and_annotates_rank(self):
+        found = list(Course.objects.search("django"))
+
+        self.assertEqual(found, [self.course])
+        self.assertIsNotNone(found[0].search_rank)
+
+    def test_admin_search_uses_queryset_search(self):
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+
+        with translation.override("en"):
+            url = reverse("admin:content_course_changelist")
+        response = self.client.get(url, {"q": "django"})
+
+        self.assertContains(response, "Django для начинающих")
+        self.assertNotContains(response, ">Go<")
+
+    def test_lessons_found_by_module_and_course_title(self):
+        module = Module.objects.create(course=self.course, title="ORM")
+        lesson = LessonTheory.objects.create(
+            module=module, title="Запросы", content="select"
+        )
+        found = LessonTheory.objects.search("django")
+        self.assertEqual(list(found), [lesson])
+
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+        with translation.override("en"):
+            url = reverse("admin:content_lessontheory_changelist")
+        response = self.client.get(url, {"q": "ORM"})
+
+        self.assertContains(response, "Запросы")
+
+
+class CatalogApiTest(TestCase):
+    def setUp(self):
+        python = Technology.objects.create(name="Python")
+        for i in range(5):
+            course = Course.objects.create(
+                title=f"Course {i}", slug=f"course-{i}", description="D"
+            )
+            course.technology.add(python)
+        Course.objects.create(
+            title="Hidden", slug="hidden", description="", is_active=False
+        )
+
+    def test_keyset_pages_with_constant_queries(self):
+        url = reverse("content:course_list")
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            with self.assertNumQueries(2):
+                data = self.client.get(url, params).json()
+            seen += [course["slug"] for course in data["results"]]
+            cursor = data["next"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, [f"course-{i}" for i in range(4, -1, -1)])
+
+    def test_conditional_get_returns_304_without_queries(self):
+        url = reverse("content:course_detail", args=["course-1"])
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_content_changes(self):
+        url = reverse("content:course_detail", args=["course-1"])
+        etag = self.client.get(url)["ETag"]
+
+        with mock.patch("content.signals.revisions.record_revision"):
+            with self.captureOnCommitCallbacks(execute=True):
+                Course.objects.filter(slug="course-1").get().save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class CourseImageServiceTest(TestCase):
+    def make_image(self, size):
+        buffer = BytesIO()
+        Image.new("RGB", size, "purple").save(buffer, "PNG")
+        return SimpleUploadedFile("cover.png", buffer.getvalue())
+
+    @mock.patch("content.signals.revisions.record_revision")
+    def test_save_schedules_renditions_after_commit(self, record_revision):
+        with mock.patch(
+            "content.signals.images.generate_course_renditions"
+        ) as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                course = Course.objects.create(
+                    title="Img",
+                    slug="img",
+                    description="",
+                    image=self.make_image((800, 400)),
+                )
+
+        task.delay.assert_called_once_with(course.pk)
+
+    def test_generate_bounded_renditions(self):
+        with mock.patch("content.signals.images.generate_course_renditions"):
+            course = Course.objects.create(
+                title="Img",
+                slug="img",
+                description="",
+                image=self.make_image((800, 400)),
+            )
+
+        before = get_course_versions([course.pk])[course.pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            items = CourseImageService.generate(course.pk)
+
+        self.assertNotEqual(
+            get_course_versions([course.pk])[course.pk], before
+        )
+        self.assertEqual(
+            sorted((i["format"], i["width"]) for i in items),
+            [
+                ("jpeg", 320),
+                ("jpeg", 640),
+                ("jpeg", 800),
+                ("webp", 320),
+                ("webp", 640),
+                ("webp", 800),
+            ],
+        )
+        course.refresh_from_db()
+        self.assertFalse(course.renditions_outdated)
+        self.assertTrue(course.image_url(500).endswith("-640.webp"))
+
+
+class TechnologyIndexTest(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for name in ("Django", "Docker", "Vue.js", "Питон"):
+                Technology.objects.create(name=name)
+
+    def test_prefix_search_without_queries(self):
+        TechnologyIndex.search("d")
+
+        with self.assertNumQueries(0):
+            names = [name for pk, name in TechnologyIndex.search("D")]
+            self.assertEqual(names, ["Django", "Docker"])
+            self.assertEqual(TechnologyIndex.search("js")[0][1], "Vue.js")
+            self.assertEqual(TechnologyIndex.search("pit")[0][1], "Питон")
+
+    def test_index_refreshes_after_change(self):
+        self.assertEqual(TechnologyIndex.search("go"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            go = Technology.objects.create(name="Go")
+
+        self.assertEqual(TechnologyIndex.search("go"), [(go.pk, "Go")])
+
+    def test_autocomplete_endpoint(self):
+        url = reverse("content:technology_autocomplete")
+        data = self.client.get(url, {"q": "doc"}).json()
+
+        self.assertEqual(
+            [item["name"] for item in data["results"]], ["Docker"]
+        )
+
+
+class ContentTransferTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(
+            title="Python", slug="python", description="D"
+        )
+        course.technology.add(Technology.objects.create(name="Python"))
+        for module_index in range(2):
+            module = Module.objects.create(course=course, title="M")
+            for lesson_index in range(3):
+                LessonTheory.objects.create(
+                    module=module, title="L", content="Текст"
+                )
+
+    def test_round_trip_in_batches(self):
+        records = list(ContentTransferService.export())
+        records[0]["technologies"].append("Rust")
+
+        with self.assertNumQueries(10):
+            stats = ContentTransferService.import_records(
+                iter(records), batch_size=4
+            )
+
+        self.assertEqual(
+            (stats["courses"], stats["modules"], stats["lessons"]), (1, 2, 6)
+        )
+        copy = Course.objects.get(slug="python-2")
+        self.assertEqual(
+            sorted(copy.technology.values_list("name", flat=True)),
+            ["Python", "Rust"],
+        )
+        lesson = LessonTheory.objects.filter(module__course=copy).first()
+        self.assertEqual(lesson.content_length, 5)
+
+    def test_commands_stream_json_lines(self):
+        path = os.path.join(tempfile.mkdtemp(), "content.jsonl")
+        call_command("export_content", output=path, stderr=StringIO())
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 9)
+
+        call_command("import_content", path, stdout=StringIO())
+        self.assertEqual(LessonTheory.objects.count(), 12)
+
+
+class LessonRenderServiceTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(title="C", slug="c", description="")
+        self.module = Module.objects.create(course=course, title="M")
+
+    def test_render_sanitizes_markdown(self):
+        html = LessonRenderService.render(
+            "# Title\n\n**bold** <script>alert(1)</script>"
+        )
+
+        self.assertIn("<h1>Title</h1>", html)
+        self.assertIn("<strong>bold</strong>", html)
+        self.assertNotIn("<script>", html)
+
+    @mock.patch("content.signals.revisions.record_revision")
+    def test_only_changed_content_is_scheduled(self, record_revision):
+        with mock.patch(
+            "content.signals.rendering.render_lesson_html"
+        ) as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                lesson = LessonTheory.objects.create(
+                    module=self.module, title="L", content="*a*"
+                )
+            LessonRenderService.render_lesson(lesson.pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                lesson = LessonTheory.objects.get(pk=lesson.pk)
+                lesson.title = "New"
+                lesson.save()
+
+        task.delay.assert_called_once_with(lesson.pk)
+        self.assertEqual(lesson.content_html, "<p><em>a</em></p>")
+
+    def test_bulk_render_skips_fresh_lessons(self):
+        with mock.patch("content.signals.rendering.render_lesson_html"):
+            for text in ("a", "b", "c"):
+                LessonTheory.objects.create(
+                    module=self.module, title="L", content=text
+                )
+
+        self.assertEqual(LessonRenderService.render_outdated(batch_size=2), 3)
+        self.assertEqual(LessonRenderService.render_outdated(), 0)
+        self.assertEqual(LessonRenderService.render_outdated(force=True), 3)
+
+    @mock.patch("content.signals.revisions.record_revision")
+    def test_etag_changes_after_render(self, record_revision):
+        with mock.patch("content.signals.rendering.render_lesson_html"):
+            with self.captureOnCommitCallbacks(execute=True):
+                lesson = LessonTheory.objects.create(
+                    module=self.module, title="L", content="*a*"
+                )
+        url = reverse("content:lesson_detail", args=[lesson.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.json()["html"], "")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LessonRenderService.render_lesson(lesson.pk)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["html"], "<p><em>a</em></p>")
+
+
+class RevisionServiceTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(title="C", slug="c", description="")
+        module = Module.objects.create(course=course, title="M")
+        with mock.patch("content.signals.rendering.render_lesson_html"):
+            self.lesson = LessonTheory.objects.create(
+                module=module, title="L", content=""
+            )
+
+    def edit(self, text):
+        LessonTheory.objects.filter(pk=self.lesson.pk).update(content=text)
+        return RevisionService.record(LessonTheory, self.lesson.pk, "content")
+
+    def test_snapshots_and_diffs_rebuild_every_revision(self):
+        lines = [f"Line {i}\n" for i in range(200)]
+        texts = []
+        for i in range(SNAPSHOT_INTERVAL + 5):
+            lines[i] = f"Edited {i}\n"
+            texts.append("".join(lines))
+            self.edit(texts[-1])
+
+        revisions = Revision.objects.filter(object_id=self.lesson.pk)
+        self.assertEqual(
+            list(
+                revisions.filter(is_snapshot=True)
+                .order_by("number")
+                .values_list("number", flat=True)
+            ),
+            [1, SNAPSHOT_INTERVAL + 1],
+        )
+        stored = sum(len(r.data) for r in revisions)
+        self.assertLess(stored, sum(len(t) for t in texts) / 10)
+
+        for number, text in enumerate(texts, start=1):
+            with self.assertNumQueries(1):
+                rebuilt = RevisionService.rebuild(
+                    LessonTheory, self.lesson.pk, "content", number
+                )
+            self.assertEqual(rebuilt, text)
+
+    def test_unchanged_text_is_not_recorded(self):
+        self.assertIsNotNone(self.edit("Text"))
+        self.assertIsNone(self.edit("Text"))
+
+    @mock.patch("content.signals.rendering.render_lesson_html")
+    def test_save_schedules_revision_after_commit(self, render_lesson_html):
+        with mock.patch("content.signals.revisions.record_revision") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                LessonTheory.objects.lean().get(pk=self.lesson.pk).save()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.lesson.save()
+
+        task.delay.assert_called_once_with(
+            "content.lessontheory", self.lesson.pk, "content"
+        )
@@ -0,0 +1,16 @@
+from django.urls import path
+
+from content import views
+
+app_name = "content"
+
+urlpatterns = [
+    path("courses/", views.course_list, name="course_list"),
+    path("courses/<slug:slug>/", views.course_detail, name="course_detail"),
+    path("lessons/<int:pk>/", views.lesson_detail, name="lesson_detail"),
+    path(
+        "technologies/",
+        views.technology_autocomplete,
+        name="technology_autocomplete",
+    ),
+]
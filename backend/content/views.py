@@ -0,0 +1,235 @@
+import base64
+from datetime import datetime
+import hashlib
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.translation import get_language
+from django.views.decorators.http import condition, require_GET
+
+from content.cache import get_catalog_version
+from content.models import Course, LessonTheory, Module, Technology
+from content.services import TechnologyIndex
+from content.services.technology_index import DEFAULT_LIMIT, MAX_LIMIT
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Ширина, под которую подбирается версия обложки
+COVER_WIDTH = 640
+THUMBNAIL_WIDTH = 320
+
+
+def _language():
+    return (get_language() or "ru").split("-")[0]
+
+
+def localized(model, field):
+    """Колонка активного языка (title_en), если модель переведена"""
+    name = f"{field}_{_language()}"
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return field
+    return name
+
+
+def catalog_etag(request, *args, **kwargs):
+    """
+    Сильный ETag из версии каталога, языка и URL. Считается без
+    обращения к БД, поэтому 304 отдаётся только по кэшу.
+    """
+    source = f"{get_catalog_version()}:{_language()}:{request.get_full_path()}"
+    return hashlib.sha1(source.encode()).hexdigest()
+
+
+def encode_cursor(course):
+    raw = json.dumps([course.created_at.isoformat(), course.pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(created_at, id) из курсора или None, если курсор испорчен"""
+    try:
+        created_at, pk = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def _course_data(course, title_field, description_field):
+    return {
+        "id": course.pk,
+        "slug": course.slug,
+        "title": getattr(course, title_field),
+        "description": getattr(course, description_field),
+        "image": course.image_url(COVER_WIDTH),
+        "thumbnail": course.image_url(THUMBNAIL_WIDTH),
+        "technologies": [tech.name for tech in course.technology.all()],
+    }
+
+
+def _technologies():
+    return Prefetch(
+        "technology", queryset=Technology.objects.only("id", "name")
+    )
+
+
+@require_GET
+@condition(etag_func=catalog_etag)
+def course_list(request):
+    """
+    Активные курсы, новые первыми. Keyset-пагинация по
+    (created_at, id): ?cursor=<next из прошлого ответа>&limit=20.
+    Два запроса на страницу независимо от её номера.
+    """
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    title_field = localized(Course, "title")
+    description_field = localized(Course, "description")
+    courses = (
+        Course.objects.filter(is_active=True)
+        .only(
+            "id",
+            "slug",
+            "image",
+            "image_renditions",
+            "created_at",
+            title_field,
+            description_field,
+        )
+        .prefetch_related(_technologies())
+        .order_by("-created_at", "-id")
+    )
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            return JsonResponse({"error": "Invalid cursor"}, status=400)
+        created_at, pk = position
+        courses = courses.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    page = list(courses[: limit + 1])
+    has_next = len(page) > limit
+    page = page[:limit]
+
+    return JsonResponse(
+        {
+            "results": [
+                _course_data(course, title_field, description_field)
+                for course in page
+            ],
+            "next": encode_cursor(page[-1]) if has_next else None,
+        },
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+@require_GET
+@condition(etag_func=catalog_etag)
+def course_detail(request, slug):
+    """Курс с оглавлением: активные модули и уроки без текста"""
+    title_field = localized(Course, "title")
+    description_field = localized(Course, "description")
+    module_title = localized(Module, "title")
+    module_description = localized(Module, "description")
+    lesson_title = localized(LessonTheory, "title")
+
+    lessons = Prefetch(
+        "lessons_theories",
+        queryset=LessonTheory.objects.filter(is_active=True)
+        .only("id", "module_id", "order_index", lesson_title)
+        .order_by("order_index"),
+    )
+    modules = Prefetch(
+        "modules",
+        queryset=Module.objects.filter(is_active=True)
+        .only(
+            "id", "course_id", "order_index", module_title, module_description
+        )
+        .order_by("order_index")
+        .prefetch_related(lessons),
+    )
+    course = get_object_or_404(
+        Course.objects.filter(is_active=True)
+        .only(
+            "id",
+            "slug",
+            "image",
+            "image_renditions",
+            title_field,
+            description_field,
+        )
+        .prefetch_related(_technologies(), modules),
+        slug=slug,
+    )
+
+    data = _course_data(course, title_field, description_field)
+    data["modules"] = [
+        {
+            "id": module.pk,
+            "title": getattr(module, module_title),
+            "description": getattr(module, module_description),
+            "lessons": [
+                {"id": lesson.pk, "title": getattr(lesson, lesson_title)}
+                for lesson in module.lessons_theories.all()
+            ],
+        }
+        for module in course.modules.all()
+    ]
+    return JsonResponse(data, json_dumps_params={"ensure_ascii": False})
+
+
+@require_GET
+@condition(etag_func=catalog_etag)
+def lesson_detail(request, pk):
+    """Текст урока; только из активных модуля и курса"""
+    title_field = localized(LessonTheory, "title")
+    content_field = localized(LessonTheory, "content")
+    lesson = get_object_or_404(
+        LessonTheory.objects.filter(
+            is_active=True,
+            module__is_active=True,
+            module__course__is_active=True,
+        ).only("id", "module_id", title_field, content_field, "content_html"),
+        pk=pk,
+    )
+    return JsonResponse(
+        {
+            "id": lesson.pk,
+            "module": lesson.module_id,
+            "title": getattr(lesson, title_field),
+            "content": getattr(lesson, content_field),
+            # Готовый очищенный HTML; парсинга при чтении нет
+            "html": lesson.content_html,
+        },
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+@require_GET
+def technology_autocomplete(request):
+    """
+    Подсказки технологий по префиксу (?q=dja&limit=10). Отвечает из
+    индекса в памяти процесса, без обращения к БД.
+    """
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    results = TechnologyIndex.search(request.GET.get("q", ""), limit)
+    return JsonResponse(
+        {"results": [{"id": pk, "name": name} for pk, name in results]},
+        json_dumps_params={"ensure_ascii": False},
+    )
@@ -4,7 +4,14 @@ from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from content.models import Course, LessonTheory, Module, Technology
+from content.models import (
+    ORDER_GAP,
+    Course,
+    LessonTheory,
+    Module,
+    Technology,
+)
+from content.services import SlugService
 from translations.models import TranslationMemory
 from users.models import Mentor, Specialization, Student
 
@@ -197,7 +204,7 @@ class Command(BaseCommand):
             email = f"mentor{i + 1}@academy.com" if has_email else None
             phone = self.generate_phone() if has_phone else None
 
-            while phone and User.objects.filter(phone=phone).exists():
+            while phone and User.objects.by_phone(phone).exists():
                 phone = self.generate_phone()
 
             if email and User.objects.filter(email=email).exists():
@@ -297,7 +304,7 @@ class Command(BaseCommand):
             email = f"student{i + 1}@academy.com" if has_email else None
             phone = self.generate_phone() if has_phone else None
 
-            while phone and User.objects.filter(phone=phone).exists():
+            while phone and User.objects.by_phone(phone).exists():
                 phone = self.generate_phone()
 
             if email and User.objects.filter(email=email).exists():
@@ -444,13 +451,20 @@ class Command(BaseCommand):
             "и проектирование систем",
         ]
 
-        for i in range(min(count, len(course_titles))):
-            course = Course.objects.create(
-                title=course_titles[i],
-                description=course_descriptions[i],
-                is_active=random.choice([True, False, True]),  # Чаще активные
-            )
+        # Слаги всей пачки подбираются одним запросом
+        courses = SlugService.assign(
+            [
+                Course(
+                    title=course_titles[i],
+                    description=course_descriptions[i],
+                    is_active=random.choice([True, False, True]),
+                )
+                for i in range(min(count, len(course_titles)))
+            ]
+        )
+        Course.objects.bulk_create(courses)
 
+        for course in courses:
             # Добавляем технологии к курсу
             course_technologies = random.sample(
                 technologies, k=min(random.randint(2, 5), len(technologies))
@@ -465,7 +479,7 @@ class Command(BaseCommand):
             )
 
             self.stdout.write(
-                self.style.SUCCESS(f"Создан курс: {course_titles[i]}")
+                self.style.SUCCESS(f"Создан курс: {course.title}")
             )
 
     def create_modules_for_course(self, course, count=3, lessons_per_module=5):
@@ -564,7 +578,7 @@ class Command(BaseCommand):
                 course=course,
                 title=title,
                 description=description,
-                order_index=module_index + 1,
+                order_index=(module_index + 1) * ORDER_GAP,
                 is_active=random.choice([True, False, True]),  # Чаще активные
             )
 
@@ -574,7 +588,7 @@ class Command(BaseCommand):
                     module=module,
                     title=lesson_titles[lesson_index % len(lesson_titles)],
                     content=lesson_content[lesson_index % len(lesson_content)],
-                    order_index=lesson_index + 1,
+                    order_index=(lesson_index + 1) * ORDER_GAP,
                     is_active=random.choice([True, False, True]),
                     # Чаще активные
                 )
@@ -0,0 +1,34 @@
+from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+from school_platform.admin.pagination import KeysetPaginationMixin
+from unfold.admin import ModelAdmin
+
+from mentoring.models import CourseMentorMatch
+
+
+@admin.register(CourseMentorMatch)
+class CourseMentorMatchAdmin(KeysetPaginationMixin, ModelAdmin):
+    """Read-only view of precomputed mentor matches"""
+
+    list_display = (
+        "course",
+        "rank",
+        "mentor",
+        "score_display",
+        "shared_technologies",
+    )
+    list_filter = ("course",)
+    list_select_related = ("course", "mentor__user", "mentor__specialization")
+    ordering = ("course", "rank")
+    list_per_page = 50
+    icon = "handshake"
+
+    @admin.display(description=_("Score"), ordering="score")
+    def score_display(self, obj):
+        return f"{obj.score:.2f}"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MentoringConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "mentoring"
+
+    def ready(self):
+        import mentoring.signals  # noqa
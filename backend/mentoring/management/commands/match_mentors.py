@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from mentoring.services import MentorMatchingService
+
+
+class Command(BaseCommand):
+    help = "Полностью пересчитывает подбор менторов для всех курсов"
+
+    def handle(self, *args, **options):
+        count = MentorMatchingService.recompute_courses()
+        self.stdout.write(self.style.SUCCESS(f"Совпадений: {count}"))
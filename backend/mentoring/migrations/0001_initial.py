@@ -0,0 +1,72 @@
+# Generated by Django 4.2 on 2026-10-19 06:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("content", "0009_revision"),
+        ("users", "0011_user_avatar_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseMentorMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Score")),
+                (
+                    "shared_technologies",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Shared technologies"
+                    ),
+                ),
+                (
+                    "rank",
+                    models.PositiveSmallIntegerField(verbose_name="Rank"),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="mentor_matches",
+                        to="content.course",
+                        verbose_name="Course",
+                    ),
+                ),
+                (
+                    "mentor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="course_matches",
+                        to="users.mentor",
+                        verbose_name="Mentor",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Mentor match",
+                "verbose_name_plural": "Mentor matches",
+                "db_table": "course_mentor_matches",
+                "ordering": ["course", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="coursementormatch",
+            constraint=models.UniqueConstraint(
+                fields=("course", "mentor"), name="course_mentor_match_uniq"
+            ),
+        ),
+    ]
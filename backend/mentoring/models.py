@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from content.models import Course
+from users.models import Mentor
+
+
+class CourseMentorMatch(models.Model):
+    """Precomputed top mentors for a course"""
+
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="mentor_matches",
+        verbose_name=_("Course"),
+    )
+    mentor = models.ForeignKey(
+        Mentor,
+        on_delete=models.CASCADE,
+        related_name="course_matches",
+        verbose_name=_("Mentor"),
+    )
+    score = models.FloatField(verbose_name=_("Score"))
+    shared_technologies = models.PositiveSmallIntegerField(
+        default=0, verbose_name=_("Shared technologies")
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name=_("Rank"))
+
+    class Meta:
+        db_table = "course_mentor_matches"
+        verbose_name = _("Mentor match")
+        verbose_name_plural = _("Mentor matches")
+        ordering = ["course", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "mentor"],
+                name="course_mentor_match_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.course} — {self.mentor} ({self.score:.2f})"
@@ -0,0 +1,3 @@
+from .matching import MentorMatchingService
+
+__all__ = ["MentorMatchingService"]
@@ -0,0 +1,218 @@
+from collections import Counter
+import logging
+
+from django.db import transaction
+import numpy as np
+
+from content.models import Course
+from mentoring.models import CourseMentorMatch
+from users.models import Mentor
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 10
+JACCARD_WEIGHT = 0.8
+EXPERIENCE_WEIGHT = 0.2
+# Опыт сверх этого (лет) не добавляет баллов
+EXPERIENCE_CAP = 10
+# Сколько курсов оценивать за раз: в памяти матрица блок x менторы
+COURSE_BLOCK = 512
+
+
+def _pairs(through, owner_field, owner_ids=None):
+    """Пары (владелец, технология) одним запросом к промежуточной таблице"""
+    rows = through.objects.all()
+    if owner_ids is not None:
+        rows = rows.filter(**{f"{owner_field}__in": owner_ids})
+    return list(rows.values_list(owner_field, "technology_id"))
+
+
+def _matrix(pairs, columns):
+    """
+    (id владельцев, 0/1-матрица владельцы x технологии). Столбцы —
+    плотные номера 0..n-1 из columns, а не сами id технологий.
+    """
+    owners = sorted({owner_id for owner_id, _technology_id in pairs})
+    rows = {owner_id: row for row, owner_id in enumerate(owners)}
+    matrix = np.zeros((len(owners), len(columns)), dtype=np.float32)
+    if pairs:
+        owner_ids, technology_ids = zip(*pairs)
+        matrix[
+            [rows[pk] for pk in owner_ids],
+            [columns[pk] for pk in technology_ids],
+        ] = 1
+    return np.array(owners, dtype=np.int64), matrix
+
+
+class MentorMatchingService:
+    """
+    Mentor-to-course matching over dense technology incidence matrices:
+    weighted Jaccard overlap plus experience, computed for a block of
+    courses against all mentors at once; top-k stored per course.
+    """
+
+    @staticmethod
+    def scores(courses, course_sizes, mentors, mentor_sizes, experience):
+        """
+        (баллы, общие технологии) — матрицы курсы x менторы. Общие
+        технологии — произведение матриц инцидентности, объединение —
+        |A| + |B| - |A & B|. Пары без общих технологий получают -inf.
+        """
+        shared = (courses @ mentors.T).astype(np.float64)
+        union = course_sizes[:, None] + mentor_sizes[None, :] - shared
+        jaccard = np.divide(
+            shared, union, out=np.zeros_like(shared), where=shared > 0
+        )
+        scores = JACCARD_WEIGHT * jaccard + EXPERIENCE_WEIGHT * experience
+        scores[shared == 0] = -np.inf
+        return scores, shared
+
+    @staticmethod
+    def top(scores, shared, mentor_ids, k=TOP_K):
+        """
+        [[(score, shared, mentor_id)]] по строкам. При равенстве
+        баллов выше ментор с большим числом общих технологий, затем
+        с меньшим id.
+        """
+        ids = np.broadcast_to(mentor_ids, scores.shape)
+        order = np.lexsort((ids, -shared, -scores), axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, order, axis=1)
+        top_shared = np.take_along_axis(shared, order, axis=1)
+        return [
+            [
+                (float(score), int(count), int(mentor_ids[column]))
+                for score, count, column in zip(row_scores, row_shared, row)
+                if count
+            ]
+            for row_scores, row_shared, row in zip(
+                top_scores, top_shared, order
+            )
+        ]
+
+    @staticmethod
+    def _lock_courses(course_ids):
+        """
+        Блокирует строки курсов: задачи по одним и тем же курсам
+        (сохранение ментора шлёт несколько сигналов) идут по очереди,
+        а не упираются в course_mentor_match_uniq.
+        """
+        courses = Course.objects.select_for_update().order_by("pk")
+        if course_ids is not None:
+            courses = courses.filter(pk__in=course_ids)
+        list(courses.values_list("pk", flat=True))
+
+    @staticmethod
+    def _mentors(columns):
+        """
+        (id, матрица, размеры наборов, вклад опыта) менторов, у
+        которых есть хотя бы одна из технологий columns.
+        """
+        pairs = _pairs(Mentor.technology.through, "mentor_id")
+        sizes = Counter(mentor_id for mentor_id, _technology_id in pairs)
+        mentor_ids, matrix = _matrix(
+            [pair for pair in pairs if pair[1] in columns], columns
+        )
+        experience = dict(
+            Mentor.objects.filter(pk__in=mentor_ids.tolist()).values_list(
+                "pk", "experience_years"
+            )
+        )
+        return (
+            mentor_ids,
+            matrix,
+            np.array([sizes[pk] for pk in mentor_ids], dtype=np.float64),
+            np.array(
+                [
+                    min(experience.get(pk) or 0, EXPERIENCE_CAP)
+                    for pk in mentor_ids
+                ],
+                dtype=np.float64,
+            )
+            / EXPERIENCE_CAP,
+        )
+
+    @classmethod
+    def _matches(cls, course_ids, courses, columns, k):
+        """CourseMentorMatch для курсов матрицы, блоками по COURSE_BLOCK"""
+        mentor_ids, mentors, mentor_sizes, experience = cls._mentors(columns)
+        if not len(mentor_ids):
+            return
+        course_sizes = courses.sum(axis=1, dtype=np.float64)
+        for start in range(0, len(course_ids), COURSE_BLOCK):
+            block = slice(start, start + COURSE_BLOCK)
+            scores, shared = cls.scores(
+                courses[block],
+                course_sizes[block],
+                mentors,
+                mentor_sizes,
+                experience,
+            )
+            for course_id, top in zip(
+                course_ids[block], cls.top(scores, shared, mentor_ids, k)
+            ):
+                for rank, (score, count, mentor_id) in enumerate(top, 1):
+                    yield CourseMentorMatch(
+                        course_id=int(course_id),
+                        mentor_id=mentor_id,
+                        score=score,
+                        shared_technologies=count,
+                        rank=rank,
+                    )
+
+    @classmethod
+    @transaction.atomic
+    def recompute_courses(cls, course_ids=None, k=TOP_K):
+        """
+        Пересчитывает топ менторов для курсов (None — для всех).
+        Связи читаются двумя запросами, баллы считаются матрично
+        блоками по COURSE_BLOCK курсов, запись — DELETE и bulk_create.
+        """
+        if course_ids is not None:
+            course_ids = list(course_ids)
+            if not course_ids:
+                return 0
+        cls._lock_courses(course_ids)
+
+        course_pairs = _pairs(
+            Course.technology.through, "course_id", course_ids
+        )
+        columns = {
+            technology_id: column
+            for column, technology_id in enumerate(
+                sorted({technology_id for _pk, technology_id in course_pairs})
+            )
+        }
+        scored_ids, courses = _matrix(course_pairs, columns)
+        matches = list(cls._matches(scored_ids, courses, columns, k))
+
+        stale = CourseMentorMatch.objects.all()
+        if course_ids is not None:
+            stale = stale.filter(course_id__in=course_ids)
+        stale.delete()
+        CourseMentorMatch.objects.bulk_create(matches, batch_size=1000)
+        logger.info(
+            f"Подбор менторов: {len(scored_ids)} курсов, "
+            f"{len(matches)} совпадений"
+        )
+        return len(matches)
+
+    @classmethod
+    def recompute_for_mentor(cls, mentor_id, k=TOP_K):
+        """
+        После изменения ментора пересчитываются только курсы, где он
+        уже в топе или с которыми у него теперь есть общие технологии.
+        """
+        technology_ids = Mentor.technology.through.objects.filter(
+            mentor_id=mentor_id
+        ).values("technology_id")
+        course_ids = set(
+            Course.technology.through.objects.filter(
+                technology_id__in=technology_ids
+            ).values_list("course_id", flat=True)
+        )
+        course_ids.update(
+            CourseMentorMatch.objects.filter(mentor_id=mentor_id).values_list(
+                "course_id", flat=True
+            )
+        )
+        return cls.recompute_courses(course_ids, k)
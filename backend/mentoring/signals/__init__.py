@@ -0,0 +1,13 @@
+from .matching import (
+    recompute_matches_on_course_technologies,
+    recompute_matches_on_mentor_change,
+    recompute_matches_on_mentor_delete,
+    recompute_matches_on_mentor_technologies,
+)
+
+__all__ = [
+    "recompute_matches_on_course_technologies",
+    "recompute_matches_on_mentor_change",
+    "recompute_matches_on_mentor_delete",
+    "recompute_matches_on_mentor_technologies",
+]
@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from content.models import Course
+from mentoring.models import CourseMentorMatch
+from mentoring.tasks import recompute_course_matches, recompute_mentor_matches
+from users.models import Mentor
+
+
+def _recompute_courses(course_ids):
+    course_ids = None if course_ids is None else list(course_ids)
+    transaction.on_commit(lambda: recompute_course_matches.delay(course_ids))
+
+
+def _recompute_mentors(mentor_ids):
+    for mentor_id in mentor_ids:
+        transaction.on_commit(
+            lambda pk=mentor_id: recompute_mentor_matches.delay(pk)
+        )
+
+
+@receiver(
+    m2m_changed,
+    sender=Course.technology.through,
+    dispatch_uid="mentoring.recompute_matches_on_course_technologies",
+)
+def recompute_matches_on_course_technologies(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        _recompute_courses([instance.pk])
+    else:
+        # instance — технология; после clear() затронутые курсы неизвестны
+        _recompute_courses(pk_set)
+
+
+@receiver(
+    m2m_changed,
+    sender=Mentor.technology.through,
+    dispatch_uid="mentoring.recompute_matches_on_mentor_technologies",
+)
+def recompute_matches_on_mentor_technologies(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        _recompute_mentors([instance.pk])
+    elif pk_set is not None:
+        _recompute_mentors(pk_set)
+    else:
+        _recompute_courses(None)
+
+
+@receiver(
+    post_save,
+    sender=Mentor,
+    dispatch_uid="mentoring.recompute_matches_on_mentor_change.post_save",
+)
+def recompute_matches_on_mentor_change(sender, instance, created, **kwargs):
+    # Новый ментор без технологий ни с кем не совпадает, технологии
+    # придут отдельным m2m_changed; здесь ловим смену опыта
+    if not created:
+        _recompute_mentors([instance.pk])
+
+
+@receiver(
+    pre_delete,
+    sender=Mentor,
+    dispatch_uid="mentoring.recompute_matches_on_mentor_delete.pre_delete",
+)
+def recompute_matches_on_mentor_delete(sender, instance, **kwargs):
+    # Совпадения удалятся каскадом, освободившиеся места в топах
+    # курсов заполняем после коммита
+    course_ids = list(
+        CourseMentorMatch.objects.filter(mentor=instance).values_list(
+            "course_id", flat=True
+        )
+    )
+    if course_ids:
+        _recompute_courses(course_ids)
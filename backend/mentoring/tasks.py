@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from mentoring.services import MentorMatchingService
+
+
+@shared_task
+def recompute_course_matches(course_ids=None):
+    return MentorMatchingService.recompute_courses(course_ids)
+
+
+@shared_task
+def recompute_mentor_matches(mentor_id):
+    return MentorMatchingService.recompute_for_mentor(mentor_id)
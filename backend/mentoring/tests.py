@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from content.models import Course, Technology
+from content.services import ContentTransferService, CourseCloneService
+from mentoring.models import CourseMentorMatch
+from mentoring.services import MentorMatchingService
+from users.models import Mentor
+
+User = get_user_model()
+
+
+class MentorMatchingServiceTest(TestCase):
+    def setUp(self):
+        python, django, go = (
+            Technology.objects.create(name=name)
+            for name in ("Python", "Django", "Go")
+        )
+        self.course = Course.objects.create(
+            title="Web", slug="web", description=""
+        )
+        self.course.technology.set([python, django])
+        self.expert = self.make_mentor("a@example.com", 10, [python, django])
+        self.junior = self.make_mentor("b@example.com", 1, [python, django])
+        self.partial = self.make_mentor("c@example.com", 10, [python, go])
+        self.gopher = self.make_mentor("d@example.com", 10, [go])
+
+    def make_mentor(self, email, experience_years, technologies):
+        user = User.objects.create_user(email=email, password="x")
+        mentor = Mentor.objects.create(
+            user=user, experience_years=experience_years
+        )
+        mentor.technology.set(technologies)
+        return mentor
+
+    def ranked(self):
+        return list(
+            CourseMentorMatch.objects.filter(course=self.course)
+            .order_by("rank")
+            .values_list("mentor_id", flat=True)
+        )
+
+    def test_top_k_by_overlap_and_experience(self):
+        MentorMatchingService.recompute_courses()
+
+        self.assertEqual(
+            self.ranked(), [self.expert.pk, self.junior.pk, self.partial.pk]
+        )
+        MentorMatchingService.recompute_courses(k=1)
+        self.assertEqual(self.ranked(), [self.expert.pk])
+
+    def test_mentor_change_recomputes_affected_courses(self):
+        MentorMatchingService.recompute_courses()
+        self.gopher.technology.set(self.course.technology.all())
+
+        MentorMatchingService.recompute_for_mentor(self.gopher.pk)
+
+        self.assertEqual(self.ranked()[:2], [self.expert.pk, self.gopher.pk])
+
+    def test_m2m_change_schedules_incremental_task(self):
+        with mock.patch(
+            "mentoring.signals.matching.recompute_mentor_matches"
+        ) as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.gopher.technology.clear()
+
+        task.delay.assert_called_once_with(self.gopher.pk)
+
+    def test_sparse_technology_ids_are_densely_indexed(self):
+        rare = Technology.objects.create(pk=10**12, name="Rare")
+        self.course.technology.add(rare)
+        self.gopher.technology.add(rare)
+
+        MentorMatchingService.recompute_courses([self.course.pk])
+
+        match = CourseMentorMatch.objects.get(
+            course=self.course, mentor=self.gopher
+        )
+        self.assertEqual(match.shared_technologies, 1)
+        self.assertAlmostEqual(match.score, 0.8 / 4 + 0.2)
+
+    def test_bulk_created_courses_schedule_recompute(self):
+        with mock.patch("mentoring.tasks.recompute_course_matches") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                (clone,) = CourseCloneService.clone_courses([self.course.pk])
+
+        task.delay.assert_called_once_with([clone.pk])
+
+        records = list(ContentTransferService.export([self.course.pk]))
+        with mock.patch("mentoring.tasks.recompute_course_matches") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                ContentTransferService.import_records(iter(records))
+
+        imported = Course.objects.latest("pk")
+        task.delay.assert_called_once_with([imported.pk])
@@ -0,0 +1,54 @@
+from django.contrib.admin.apps import AdminConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class SchoolAdminConfig(AdminConfig):
+    default_site = "school_platform.admin.sites.SchoolAdminSite"
+
+    def ready(self):
+        super().ready()
+        from django.contrib import admin
+
+        from .autocomplete import (
+            AUTOCOMPLETE_CASCADES,
+            AUTOCOMPLETE_WATCHED_FIELDS,
+            bump_autocomplete_version,
+            bump_cascaded_autocomplete_versions,
+            watched_fields,
+        )
+
+        # Модели, по которым работает автодополнение (у их админок
+        # есть search_fields): изменения сбрасывают кэш подсказок
+        for model, model_admin in admin.site._registry.items():
+            if not model_admin.search_fields:
+                continue
+            label = model._meta.label_lower
+            AUTOCOMPLETE_WATCHED_FIELDS[model] = watched_fields(
+                model, model_admin
+            )
+            post_save.connect(
+                bump_autocomplete_version,
+                sender=model,
+                dispatch_uid=f"bump_autocomplete_version:{label}",
+            )
+            # post_delete отключил бы быстрое каскадное удаление: такие
+            # модели сбрасываются удалением родителя из
+            # autocomplete_deleted_with и своей админкой
+            cascade = getattr(model_admin, "autocomplete_deleted_with", ())
+            if not cascade:
+                post_delete.connect(
+                    bump_autocomplete_version,
+                    sender=model,
+                    dispatch_uid=f"bump_autocomplete_version:{label}",
+                )
+            for name in cascade:
+                parent = model._meta.get_field(name).related_model
+                AUTOCOMPLETE_CASCADES.setdefault(parent, set()).add(model)
+                post_delete.connect(
+                    bump_cascaded_autocomplete_versions,
+                    sender=parent,
+                    dispatch_uid=(
+                        "bump_cascaded_autocomplete_versions:"
+                        f"{parent._meta.label_lower}"
+                    ),
+                )
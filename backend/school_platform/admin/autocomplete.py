@@ -0,0 +1,161 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils.translation import get_language
+
+AUTOCOMPLETE_PAGE_SIZE = 20
+# Дальше листать подсказки бессмысленно: нужно уточнить запрос
+AUTOCOMPLETE_MAX_PAGES = 5
+AUTOCOMPLETE_MAX_TERM_LENGTH = 100
+AUTOCOMPLETE_VERSION_KEY = "admin:autocomplete:{}:version"
+
+
+def autocomplete_version_key(model):
+    return AUTOCOMPLETE_VERSION_KEY.format(model._meta.label_lower)
+
+
+def get_autocomplete_version(model):
+    key = autocomplete_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+# Модель -> поля, от которых зависят подсказки по ней
+AUTOCOMPLETE_WATCHED_FIELDS: dict = {}
+# Модель -> модели, чьи строки удаляются вместе с её строками
+AUTOCOMPLETE_CASCADES: dict = {}
+
+
+def watched_fields(model, model_admin):
+    """
+    Имена и attname полей из search_fields и autocomplete_watch_fields
+    админки, вместе с языковыми колонками modeltranslation.
+    """
+    names = {
+        path.lstrip("^=@").split("__")[0] for path in model_admin.search_fields
+    }
+    names.update(getattr(model_admin, "autocomplete_watch_fields", ()))
+    fields = set()
+    for name in names:
+        for candidate in (
+            name,
+            *(f"{name}_{code}" for code, _name in settings.LANGUAGES),
+        ):
+            try:
+                field = model._meta.get_field(candidate)
+            except FieldDoesNotExist:
+                continue
+            fields.update({field.name, getattr(field, "attname", field.name)})
+    return frozenset(fields)
+
+
+def bump_autocomplete_version(
+    sender, update_fields=None, using=None, **kwargs
+):
+    """
+    Закэшированные подсказки по модели перестают читаться. Сохранение
+    с update_fields, не задевающее отслеживаемых полей (last_login при
+    входе), версию не трогает. Версия сдвигается после коммита: иначе
+    параллельный запрос закэширует под новой версией старые строки.
+    """
+    watched = AUTOCOMPLETE_WATCHED_FIELDS.get(sender)
+    if update_fields is not None and watched is not None:
+        if watched.isdisjoint(update_fields):
+            return
+    key = autocomplete_version_key(sender)
+    transaction.on_commit(
+        lambda: cache.set(key, time.time_ns(), timeout=None), using=using
+    )
+
+
+def bump_cascaded_autocomplete_versions(sender, **kwargs):
+    """Удаление строки sender каскадом удаляет строки зависимых моделей"""
+    for model in AUTOCOMPLETE_CASCADES.get(sender, ()):
+        bump_autocomplete_version(model, using=kwargs.get("using"))
+
+
+class CachedAutocompleteJsonView(AutocompleteJsonView):
+    """
+    Admin autocomplete with bounded pages and no COUNT(*): each page
+    reads one row past its end to decide whether there is more.
+    Responses are cached per target model version, field, term and
+    page. The target admin may define get_autocomplete_results() for
+    a dedicated indexed search and autocomplete_select_related for
+    what str() of a result reads.
+    """
+
+    def get(self, request, *args, **kwargs):
+        (
+            self.term,
+            self.model_admin,
+            self.source_field,
+            to_field_name,
+        ) = self.process_request(request)
+        if not self.has_perm(request):
+            raise PermissionDenied
+
+        self.term = self.term.strip()[:AUTOCOMPLETE_MAX_TERM_LENGTH]
+        try:
+            page = int(request.GET.get("page", 1))
+        except ValueError:
+            page = 1
+        if not 1 <= page <= AUTOCOMPLETE_MAX_PAGES:
+            return JsonResponse({"results": [], "pagination": {"more": False}})
+
+        key = self.cache_key(request, page, to_field_name)
+        data = cache.get(key)
+        if data is None:
+            start = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+            objects = list(
+                self.get_queryset()[start : start + AUTOCOMPLETE_PAGE_SIZE + 1]
+            )
+            more = (
+                len(objects) > AUTOCOMPLETE_PAGE_SIZE
+                and page < AUTOCOMPLETE_MAX_PAGES
+            )
+            data = {
+                "results": [
+                    self.serialize_result(obj, to_field_name)
+                    for obj in objects[:AUTOCOMPLETE_PAGE_SIZE]
+                ],
+                "pagination": {"more": more},
+            }
+            cache.set(key, data, settings.ADMIN_AUTOCOMPLETE_CACHE_TIMEOUT)
+        return JsonResponse(data)
+
+    def cache_key(self, request, page, to_field_name):
+        model = self.model_admin.model
+        source = self.source_field
+        raw = (
+            f"{source.model._meta.label_lower}.{source.name}:"
+            f"{to_field_name}:{get_language()}:{page}:{self.term}"
+        )
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return (
+            f"admin:autocomplete:{model._meta.label_lower}:"
+            f"{get_autocomplete_version(model)}:{digest}"
+        )
+
+    def get_queryset(self):
+        queryset = self.model_admin.get_queryset(self.request).complex_filter(
+            self.source_field.get_limit_choices_to()
+        )
+        search = getattr(
+            self.model_admin,
+            "get_autocomplete_results",
+            self.model_admin.get_search_results,
+        )
+        queryset, use_distinct = search(self.request, queryset, self.term)
+        related = getattr(self.model_admin, "autocomplete_select_related", ())
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.distinct() if use_distinct else queryset
@@ -0,0 +1,231 @@
+import base64
+import json
+
+from django.conf import settings
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from unfold.views import ChangeList
+
+# Параметры курсора в URL списка
+AFTER_VAR = "after"
+BEFORE_VAR = "before"
+CURSOR_VARS = (AFTER_VAR, BEFORE_VAR)
+
+
+def estimate_count(queryset):
+    """
+    Оценка числа строк от планировщика PostgreSQL: reltuples для
+    таблицы без фильтров, иначе "Plan Rows" из EXPLAIN. None, если
+    оценки нет (другая СУБД или таблица ещё не анализировалась).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            return row[0] if row and row[0] >= 0 else None
+        sql, params = query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the planner estimate instead of COUNT(*) once it exceeds
+    ADMIN_COUNT_ESTIMATE_THRESHOLD; small results are counted exactly.
+    """
+
+    is_estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if (
+            estimate is not None
+            and estimate >= settings.ADMIN_COUNT_ESTIMATE_THRESHOLD
+        ):
+            self.is_estimated = True
+            return estimate
+        return super().count
+
+
+def encode_cursor(values):
+    # str(), а не DjangoJSONEncoder: тот обрезает микросекунды
+    raw = json.dumps(values, default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, fields):
+    """Значения ключа из курсора или None, если курсор испорчен"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+        if len(values) != len(fields):
+            return None
+        return [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValueError, TypeError, json.JSONDecodeError):
+        return None
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Changelist pages addressed by a cursor on the ordering columns
+    (?after=... / ?before=...) instead of OFFSET, so a deep page costs
+    the same index range scan as the first one. Falls back to regular
+    pagination when the ordering is not a plain non-null column list.
+    """
+
+    keyset_template = "admin/keyset_pagination.html"
+    keyset_previous_url = keyset_next_url = keyset_first_url = None
+
+    def __init__(self, request, *args, **kwargs):
+        super().__init__(request, *args, **kwargs)
+        # Курсор не фильтр: unfold не должен переносить его в формы
+        for name in CURSOR_VARS:
+            self.filter_params.pop(name, None)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        for name in CURSOR_VARS:
+            lookup_params.pop(name, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Смена фильтра или сортировки начинает список сначала
+        remove = [*(remove or []), *CURSOR_VARS]
+        return super().get_query_string(new_params, remove)
+
+    def _resolve(self, path):
+        """Конечное поле пути user__date_joined или None"""
+        model = self.model
+        field = None
+        for name in path.split("__"):
+            if field is not None:
+                if not field.is_relation:
+                    return None
+                model = field.related_model
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+        return field
+
+    def keyset(self):
+        """[(путь, поле, desc)] по сортировке списка или None"""
+        keys = []
+        for item in self.queryset.query.order_by:
+            if not isinstance(item, str) or item == "?":
+                return None
+            desc = item.startswith("-")
+            path = item.lstrip("-")
+            if path == "pk":
+                path = self.model._meta.pk.name
+            field = self._resolve(path)
+            if (
+                field is None
+                or field.is_relation
+                or field.null
+                or not field.concrete
+            ):
+                return None
+            keys.append((path, field, desc))
+        # Позиция однозначна, только если последний столбец уникален
+        if not keys or not keys[-1][1].unique:
+            return None
+        return keys
+
+    @staticmethod
+    def _seek(keys, values, backward):
+        """Строки строго после (или до) позиции values в порядке keys"""
+        condition = Q()
+        for index, (path, _field, desc) in enumerate(keys):
+            op = "lt" if desc != backward else "gt"
+            equal = {
+                prev_path: value
+                for (prev_path, _f, _d), value in zip(keys[:index], values)
+            }
+            condition |= Q(**equal, **{f"{path}__{op}": values[index]})
+        return condition
+
+    def get_results(self, request):
+        super().get_results(request)
+        if self.show_all or not self.multi_page or PAGE_VAR in request.GET:
+            return
+        keys = self.keyset()
+        if keys is None:
+            return
+
+        paths = [path for path, _field, _desc in keys]
+        fields = [field for _path, field, _desc in keys]
+        after = request.GET.get(AFTER_VAR)
+        before = request.GET.get(BEFORE_VAR)
+        cursor = before or after
+        values = decode_cursor(cursor, fields) if cursor else None
+        if values is None:
+            # Испорченный курсор — просто первая страница
+            cursor = None
+        backward = bool(cursor and before)
+        queryset = self.queryset
+        if cursor:
+            queryset = queryset.filter(self._seek(keys, values, backward))
+        if backward:
+            queryset = queryset.order_by(
+                *[path if desc else f"-{path}" for path, _field, desc in keys]
+            )
+
+        limit = self.list_per_page
+        rows = list(queryset.values_list(*paths, "pk")[: limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backward:
+            rows.reverse()
+
+        self.result_list = self.queryset.filter(
+            pk__in=[row[-1] for row in rows]
+        )
+        if backward:
+            has_previous, has_next = has_more, True
+        else:
+            has_previous, has_next = bool(cursor), has_more
+        self.keyset_previous_url = (
+            self.get_query_string({BEFORE_VAR: encode_cursor(rows[0][:-1])})
+            if has_previous and rows
+            else None
+        )
+        self.keyset_next_url = (
+            self.get_query_string({AFTER_VAR: encode_cursor(rows[-1][:-1])})
+            if has_next and rows
+            else None
+        )
+        self.keyset_first_url = (
+            self.get_query_string() if has_previous else None
+        )
+        self.paginator.template_name = self.keyset_template
+
+
+class KeysetPaginationMixin:
+    """
+    Estimated counts and cursor pagination for unfold ModelAdmins.
+    Put it before ModelAdmin. Keyset pages need an ordering of
+    non-null columns; Django appends the pk when it is not unique.
+    """
+
+    paginator = EstimatedCountPaginator
+    # Второй COUNT(*) по всей таблице ради "N всего" не нужен
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
@@ -0,0 +1,111 @@
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+if TYPE_CHECKING:
+    from django.contrib.admin import ModelAdmin as _AdminBase
+else:
+    _AdminBase = object
+
+
+def row_fields(*paths, prefetch=()):
+    """
+    Поля, которые читает колонка списка: @row_fields("user__email").
+    Связи из путей идут в select_related, prefetch — в prefetch_related.
+    """
+
+    def decorator(func):
+        func.row_paths = paths
+        func.row_prefetch = prefetch
+        return func
+
+    return decorator
+
+
+class RowPrefetchMixin(_AdminBase):
+    """
+    Builds the changelist queryset from what list_display reads:
+    display methods declare their paths with @row_fields, and the
+    page is loaded with matching select_related, prefetch_related
+    and only(), so the query count does not grow with the page size.
+    """
+
+    def _row_columns(self, request):
+        """
+        (пути, prefetch, можно ли only()). only() неприменим, если
+        колонка не объявила свои поля или выводит связь целиком.
+        """
+        paths = {self.model._meta.pk.name}
+        prefetch: list[str | Prefetch] = []
+        restrict = True
+        for name in self.get_list_display(request):
+            if name == "action_checkbox":
+                continue
+            column = getattr(self, name, None)
+            row_paths = getattr(column, "row_paths", None)
+            if row_paths is not None:
+                paths.update(row_paths)
+                prefetch.extend(getattr(column, "row_prefetch", ()))
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                restrict = False
+                continue
+            if field.is_relation:
+                restrict = False
+                continue
+            paths.add(name)
+        return paths, prefetch, restrict
+
+    def _with_translations(self, paths):
+        """Пути плюс языковые колонки modeltranslation (title -> title_en)"""
+        expanded = set(paths)
+        for path in paths:
+            *relations, name = path.split("__")
+            model = self.model
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            for code, _name in settings.LANGUAGES:
+                try:
+                    model._meta.get_field(f"{name}_{code}")
+                except FieldDoesNotExist:
+                    continue
+                expanded.add(f"{path}_{code}")
+        return expanded
+
+    def _select_related(self, paths):
+        """Префиксы путей, проходящие по FK/OneToOne"""
+        related = set()
+        for path in paths:
+            model, prefix = self.model, []
+            for name in path.split("__")[:-1]:
+                field = model._meta.get_field(name)
+                if not (field.many_to_one or field.one_to_one):
+                    break
+                prefix.append(name)
+                related.add("__".join(prefix))
+                model = field.related_model
+        return related
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        opts = self.model._meta
+        if match is None or match.url_name != (
+            f"{opts.app_label}_{opts.model_name}_changelist"
+        ):
+            return queryset
+
+        paths, prefetch, restrict = self._row_columns(request)
+        related = self._select_related(paths)
+        if related:
+            queryset = queryset.select_related(*related)
+        if restrict:
+            # Сами FK тоже нужны, иначе select_related по ним невозможен
+            queryset = queryset.only(*self._with_translations(paths), *related)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
@@ -0,0 +1,10 @@
+from unfold.sites import UnfoldAdminSite
+
+from .autocomplete import CachedAutocompleteJsonView
+
+
+class SchoolAdminSite(UnfoldAdminSite):
+    """Unfold admin site with cached, bounded autocomplete responses"""
+
+    def autocomplete_view(self, request):
+        return CachedAutocompleteJsonView.as_view(admin_site=self)(request)
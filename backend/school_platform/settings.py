@@ -20,11 +20,12 @@ CSRF_TRUSTED_ORIGINS = config(
 ).split(",")
 
 INSTALLED_APPS = [
-    "unfold",
+    # Сайт админки задаёт SchoolAdminConfig, а не unfold
+    "unfold.apps.BasicAppConfig",
     "modeltranslation",
     "unfold.contrib.filters",
     "unfold.contrib.forms",
-    "django.contrib.admin",
+    "school_platform.admin.apps.SchoolAdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -163,6 +164,9 @@ UNFOLD = {
 
 AUTH_USER_MODEL = "users.User"
 
+# Права пользователей и групп читаются из общего кэша (см. users.backends)
+AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -252,6 +256,49 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Общий кэш (версии контента и т.п.). Без REDIS_CACHE_URL — кэш в
+# памяти процесса, этого достаточно для тестов и локального запуска;
+# при DEBUG=False проверка content.W001 предупредит о таком кэше.
+REDIS_CACHE_URL = config("REDIS_CACHE_URL", default="")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Сколько секунд помнить несуществующий логин, чтобы серия попыток
+# подбора не ходила в БД (0 — не кэшировать)
+LOGIN_NEGATIVE_CACHE_TIMEOUT = config(
+    "LOGIN_NEGATIVE_CACHE_TIMEOUT", default=30, cast=int
+)
+
+# Код страны для номеров, введённых без него (E.164 без "+")
+PHONE_DEFAULT_COUNTRY_CODE = config("PHONE_DEFAULT_COUNTRY_CODE", default="7")
+
+# С какого числа строк списки админки показывают оценку планировщика
+# PostgreSQL вместо точного COUNT(*)
+ADMIN_COUNT_ESTIMATE_THRESHOLD = config(
+    "ADMIN_COUNT_ESTIMATE_THRESHOLD", default=10000, cast=int
+)
+
+# Сколько секунд хранить ответы автодополнения в админке
+ADMIN_AUTOCOMPLETE_CACHE_TIMEOUT = config(
+    "ADMIN_AUTOCOMPLETE_CACHE_TIMEOUT", default=60, cast=int
+)
+
+# Сколько секунд хранить наборы прав пользователя; сброс — по версиям
+PERMISSION_CACHE_TIMEOUT = config(
+    "PERMISSION_CACHE_TIMEOUT", default=3600, cast=int
+)
+
 CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://redis:6379/0")
 CELERY_RESULT_BACKEND = config(
     "CELERY_RESULT_BACKEND", default="redis://redis:6379/0"
@@ -6,6 +6,7 @@ from django.urls import include, path
 
 urlpatterns = [
     path("i18n/", include("django.conf.urls.i18n")),
+    path("api/catalog/", include("content.urls")),
 ]
 
 urlpatterns += i18n_patterns(
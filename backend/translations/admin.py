@@ -2,6 +2,7 @@ from typing import Any
 
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+from school_platform.admin.pagination import KeysetPaginationMixin
 from unfold.admin import ModelAdmin
 from unfold.decorators import action
 
@@ -9,7 +10,7 @@ from translations.models import TranslationMemory
 
 
 @admin.register(TranslationMemory)
-class TranslationMemoryAdmin(ModelAdmin):
+class TranslationMemoryAdmin(KeysetPaginationMixin, ModelAdmin):
     list_display = (
         "short_source",
         "short_target",
@@ -31,6 +32,7 @@ class TranslationMemoryAdmin(ModelAdmin):
     list_per_page = 20
     ordering = ("-updated_at",)
     icon = "language"
+    autocomplete_fields = ("last_edited_by",)
 
     fieldsets = (
         (
@@ -1,18 +1,119 @@
+from typing import TYPE_CHECKING
+
 from django.contrib import admin, messages
 from django.contrib.auth import get_user_model, update_session_auth_hash
 from django.contrib.auth.forms import AdminPasswordChangeForm
+from django.db.models import Prefetch
+from django.db.models.functions import Lower
 from django.shortcuts import redirect, render
 from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 from django.utils.translation import gettext_lazy as _
+from school_platform.admin.pagination import KeysetPaginationMixin
+from school_platform.admin.rows import RowPrefetchMixin, row_fields
 from unfold.admin import ModelAdmin
+from unfold.decorators import action
 from unfold.forms import UserChangeForm, UserCreationForm
 
+from content.models import Technology
 from users.models import Mentor, Specialization, Student
+from users.phones import search_prefix
+from users.services import UserExportService
 
 User = get_user_model()
 
+if TYPE_CHECKING:
+    from django.contrib.admin import ModelAdmin as _AdminBase
+    from django.forms import ModelForm as _FormBase
+else:
+    _AdminBase = _FormBase = object
+
+
+class ChangedUniqueFieldsMixin(_FormBase):
+    """
+    Email/phone uniqueness is checked by the form only for fields the
+    user actually changed; the unique index catches the rest on save.
+    """
+
+    unique_fields = ("email", "phone")
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        exclude.update(
+            name
+            for name in self.unique_fields
+            if name not in self.changed_data
+        )
+        return exclude
+
+
+class ContactSearchMixin(_AdminBase):
+    """
+    Search terms that look like an email or a phone number become
+    index lookups (Lower(email) equality, phone_digits prefix) instead
+    of icontains scans.
+    """
+
+    email_search_field = "email"
+    phone_search_field = "phone_digits"
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if "@" in term and " " not in term:
+            return (
+                queryset.alias(
+                    email_lower=Lower(self.email_search_field)
+                ).filter(email_lower=term.lower()),
+                False,
+            )
+        prefix = search_prefix(term)
+        if prefix is not None:
+            return (
+                queryset.filter(
+                    **{f"{self.phone_search_field}__startswith": prefix}
+                ),
+                False,
+            )
+        return super().get_search_results(request, queryset, search_term)
 
-class CustomUserChangeForm(UserChangeForm):
+
+class ExportMixin(_AdminBase):
+    """
+    CSV/XLSX export actions for the selected rows. Columns are
+    (lookup, header) pairs read with values_list() and streamed in
+    chunks, so memory use does not depend on the selection size.
+    """
+
+    export_fields: tuple[tuple[str, str], ...] = ()
+    actions = ["export_csv", "export_xlsx"]
+
+    def get_export_queryset(self, request, queryset):
+        return queryset
+
+    def _export(self, request, queryset, export_format):
+        lookups = [lookup for lookup, _header in self.export_fields]
+        headers = [str(header) for _lookup, header in self.export_fields]
+        rows = UserExportService.rows(
+            self.get_export_queryset(request, queryset), lookups
+        )
+        return UserExportService.response(
+            export_format, self.model._meta.model_name, headers, rows
+        )
+
+    @action(description=_("Export to CSV"), permissions=["view"])
+    def export_csv(self, request, queryset):
+        return self._export(request, queryset, "csv")
+
+    @action(description=_("Export to Excel"), permissions=["view"])
+    def export_xlsx(self, request, queryset):
+        return self._export(request, queryset, "xlsx")
+
+
+class CustomUserCreationForm(ChangedUniqueFieldsMixin, UserCreationForm):
+    pass
+
+
+class CustomUserChangeForm(ChangedUniqueFieldsMixin, UserChangeForm):
     class Meta(UserChangeForm.Meta):
         model = User
         fields = "__all__"
@@ -28,9 +129,15 @@ class CustomUserChangeForm(UserChangeForm):
 
 
 @admin.register(User)
-class CustomUserAdmin(ModelAdmin):
+class CustomUserAdmin(
+    ExportMixin,
+    ContactSearchMixin,
+    RowPrefetchMixin,
+    KeysetPaginationMixin,
+    ModelAdmin,
+):
     form = CustomUserChangeForm
-    add_form = UserCreationForm
+    add_form = CustomUserCreationForm
 
     list_display = (
         "email",
@@ -41,10 +148,23 @@ class CustomUserAdmin(ModelAdmin):
         "is_active",
     )
     list_filter = ("role", "is_active")
-    search_fields = ("email", "phone", "first_name", "last_name")
+    search_fields = ("email", "first_name", "last_name")
+    # Подсказки ищут и по номеру, а str(user) выводит телефон
+    autocomplete_watch_fields = ("phone", "phone_digits")
     ordering = ("-date_joined",)
     readonly_fields = ("last_login", "date_joined")
     icon = "person"
+    export_fields = (
+        ("id", "ID"),
+        ("email", _("Email")),
+        ("phone", _("Phone")),
+        ("first_name", _("First name")),
+        ("last_name", _("Last name")),
+        ("role", _("Role")),
+        ("is_active", _("Active")),
+        ("date_joined", _("Data joined")),
+        ("last_login", _("Last login")),
+    )
 
     fieldsets = (
         (_("Main information"), {"fields": ("email", "phone", "password")}),
@@ -82,6 +202,10 @@ class CustomUserAdmin(ModelAdmin):
         ),
     )
 
+    def get_autocomplete_results(self, request, queryset, search_term):
+        # Автодополнение в формах: префиксы по индексам, без icontains
+        return queryset.autocomplete(search_term), False
+
     def get_fieldsets(self, request, obj=None):
         if not obj:
             return self.add_fieldsets
@@ -210,7 +334,13 @@ class SpecializationAdmin(ModelAdmin):
 
 
 @admin.register(Student)
-class StudentAdmin(ModelAdmin):
+class StudentAdmin(
+    ExportMixin,
+    ContactSearchMixin,
+    RowPrefetchMixin,
+    KeysetPaginationMixin,
+    ModelAdmin,
+):
     list_display = (
         "id",
         "user_full_name",
@@ -222,31 +352,123 @@ class StudentAdmin(ModelAdmin):
         "user__first_name",
         "user__last_name",
         "user__email",
-        "user__phone",
     )
+    email_search_field = "user__email"
+    phone_search_field = "user__phone_digits"
     list_filter = ("user__is_active",)
     ordering = ("-user__date_joined",)
     icon = "graduation-cap"
+    autocomplete_fields = ("user",)
+    export_fields = (
+        ("id", "ID"),
+        ("user__email", _("Email")),
+        ("user__phone", _("Phone")),
+        ("user__first_name", _("First name")),
+        ("user__last_name", _("Last name")),
+        ("user__is_active", _("Active")),
+        ("user__date_joined", _("Data joined")),
+    )
 
     @admin.display(description=_("Full name"))
+    @row_fields("user__first_name", "user__last_name")
     def user_full_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}"
 
     @admin.display(description=_("Email"))
+    @row_fields("user__email")
     def user_email(self, obj):
         return obj.user.email
 
     @admin.display(description=_("Phone"))
+    @row_fields("user__phone")
     def user_phone(self, obj):
         return obj.user.phone
 
-    @admin.display(description=_("Data joined"))
+    @admin.display(description=_("Data joined"), ordering="user__date_joined")
+    @row_fields("user__date_joined")
     def date_joined(self, obj):
         return obj.user.date_joined
 
 
+class TechnologyMatchFilter(admin.SimpleListFilter):
+    """How TechnologySetFilter combines the chosen technologies"""
+
+    title = _("Technology match")
+    parameter_name = "technology_match"
+
+    def lookups(self, request, model_admin):
+        return (("all", _("All of")), ("any", _("Any of")))
+
+    def queryset(self, request, queryset):
+        # Сам фильтр не сужает выборку, его читает TechnologySetFilter
+        return queryset
+
+
+class TechnologySetFilter(admin.SimpleListFilter):
+    """
+    Multi-select technology filter: ?technologies=1,2,3. Clicking a
+    technology toggles it in the set.
+    """
+
+    title = _("Technologies")
+    parameter_name = "technologies"
+
+    def selected_ids(self):
+        ids = set()
+        for value in (self.value() or "").split(","):
+            if value.strip().isdigit():
+                ids.add(int(value))
+        return ids
+
+    def lookups(self, request, model_admin):
+        return Technology.objects.order_by("name").values_list("id", "name")
+
+    def queryset(self, request, queryset):
+        ids = self.selected_ids()
+        if not ids:
+            return queryset
+        if request.GET.get(TechnologyMatchFilter.parameter_name) == "any":
+            return queryset.with_any_technologies(ids)
+        return queryset.with_all_technologies(ids)
+
+    def choices(self, changelist):
+        selected = self.selected_ids()
+        yield {
+            "selected": not selected,
+            "query_string": changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+            "display": _("All"),
+        }
+        for pk, name in self.lookup_choices:
+            toggled = selected ^ {pk}
+            yield {
+                "selected": pk in selected,
+                "query_string": (
+                    changelist.get_query_string(
+                        {
+                            self.parameter_name: ",".join(
+                                map(str, sorted(toggled))
+                            )
+                        }
+                    )
+                    if toggled
+                    else changelist.get_query_string(
+                        remove=[self.parameter_name]
+                    )
+                ),
+                "display": name,
+            }
+
+
 @admin.register(Mentor)
-class MentorAdmin(ModelAdmin):
+class MentorAdmin(
+    ExportMixin,
+    ContactSearchMixin,
+    RowPrefetchMixin,
+    KeysetPaginationMixin,
+    ModelAdmin,
+):
     list_display = (
         "id",
         "user_full_name",
@@ -261,19 +483,32 @@ class MentorAdmin(ModelAdmin):
         "user__last_name",
         "specialization__title",
         "user__email",
-        "user__phone",
         "technology__name",
     )
+    email_search_field = "user__email"
+    phone_search_field = "user__phone_digits"
     list_filter = (
         "experience_years",
         "user__is_active",
         "specialization__type",
-        "technology",
+        TechnologySetFilter,
+        TechnologyMatchFilter,
     )
     ordering = ("-user__date_joined",)
     icon = "briefcase"
-    autocomplete_fields = ("specialization",)
-    filter_horizontal = ("technology",)
+    autocomplete_fields = ("user", "specialization", "technology")
+    export_fields = (
+        ("id", "ID"),
+        ("user__email", _("Email")),
+        ("user__phone", _("Phone")),
+        ("user__first_name", _("First name")),
+        ("user__last_name", _("Last name")),
+        ("specialization__type", _("Specialization type")),
+        ("specialization__title", _("Specialization")),
+        ("experience_years", _("Experience (years)")),
+        ("technology_names", _("Technologies")),
+        ("user__date_joined", _("Data joined")),
+    )
 
     fieldsets = (
         (
@@ -290,54 +525,63 @@ class MentorAdmin(ModelAdmin):
     )
 
     @admin.display(description=_("Full name"))
+    @row_fields("user__first_name", "user__last_name")
     def user_full_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}"
 
     @admin.display(description=_("Email"))
+    @row_fields("user__email")
     def user_email(self, obj):
         return obj.user.email
 
     @admin.display(description=_("Phone"))
+    @row_fields("user__phone")
     def user_phone(self, obj):
         return obj.user.phone
 
     @admin.display(description=_("Specialization"))
+    @row_fields("specialization__type", "specialization__title")
     def specialization_display(self, obj):
         if obj.specialization:
             return f"{obj.specialization.type}: {obj.specialization.title}"
         return "—"
 
     @admin.display(description=_("Technologies"))
+    @row_fields(
+        prefetch=(
+            Prefetch(
+                "technology",
+                queryset=Technology.objects.only("id", "name"),
+            ),
+        )
+    )
     def technologies_list(self, obj):
-        technologies = obj.technology.all()
+        # Список уже загружен prefetch: считаем его длину, а не COUNT
+        technologies = list(obj.technology.all())
         if not technologies:
             return "—"
 
-        from django.urls import reverse
-        from django.utils.html import format_html
-
-        tech_links = []
-        for tech in technologies[:3]:
-            url = reverse("admin:content_technology_change", args=[tech.id])
-            tech_links.append(f'<a href="{url}">{tech.name}</a>')
-
-        result = ", ".join(tech_links)
-        if technologies.count() > 3:
-            result += (
-                '<span style="color: #666;">'
-                f"(+{technologies.count() - 3})"
-                "</span>"
+        result = format_html_join(
+            ", ",
+            '<a href="{}">{}</a>',
+            (
+                (
+                    reverse("admin:content_technology_change", args=[tech.pk]),
+                    tech.name,
+                )
+                for tech in technologies[:3]
+            ),
+        )
+        if len(technologies) > 3:
+            result = format_html(
+                '{}<span style="color: #666;">(+{})</span>',
+                result,
+                len(technologies) - 3,
             )
+        return result
 
-        return format_html(result)
-
-    def get_queryset(self, request):
-        return (
-            super()
-            .get_queryset(request)
-            .select_related("user", "specialization")
-            .prefetch_related("technology")
-        )
+    def get_export_queryset(self, request, queryset):
+        return UserExportService.with_technology_names(queryset)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == "specialization":
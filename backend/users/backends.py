@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+from users.cache import get_cached_permissions, set_cached_permissions
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose user and group permission sets are kept in the
+    shared cache under the user id, role and permission versions, so
+    has_perm() in steady state does not query the database.
+    """
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return super()._get_permissions(user_obj, obj, from_name)
+        # Внутри запроса — как в ModelBackend, кэш на объекте
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if hasattr(user_obj, perm_cache_name):
+            return getattr(user_obj, perm_cache_name)
+
+        versions, entry = get_cached_permissions(user_obj.pk, from_name)
+        # Роль и is_superuser меняют набор прав без сигналов m2m
+        version = (user_obj.role, user_obj.is_superuser, *versions)
+        if entry is not None and entry[0] == version:
+            perms = entry[1]
+        else:
+            perms = super()._get_permissions(user_obj, obj, from_name)
+            set_cached_permissions(
+                user_obj.pk,
+                from_name,
+                (version, perms),
+                settings.PERMISSION_CACHE_TIMEOUT,
+            )
+        setattr(user_obj, perm_cache_name, perms)
+        return perms
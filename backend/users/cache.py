@@ -0,0 +1,49 @@
+import time
+
+from django.core.cache import cache
+
+PERMISSION_VERSION_KEY = "users:permissions:version"
+USER_PERMISSION_VERSION_KEY = "users:{}:permissions:version"
+USER_PERMISSIONS_KEY = "users:{}:permissions:{}"
+
+
+def user_permission_version_key(user_id):
+    return USER_PERMISSION_VERSION_KEY.format(user_id)
+
+
+def user_permissions_key(user_id, from_name):
+    return USER_PERMISSIONS_KEY.format(user_id, from_name)
+
+
+def get_cached_permissions(user_id, from_name):
+    """
+    (версии, закэшированная запись или None) одним запросом к кэшу.
+    Версии: общая (группы и права) и пользователя (его группы и
+    права). Пропавшую версию заводим заново, как в content.cache.
+    """
+    global_key = PERMISSION_VERSION_KEY
+    user_key = user_permission_version_key(user_id)
+    entry_key = user_permissions_key(user_id, from_name)
+    found = cache.get_many([global_key, user_key, entry_key])
+    for key in (global_key, user_key):
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return (found[global_key], found[user_key]), found.get(entry_key)
+
+
+def set_cached_permissions(user_id, from_name, entry, timeout):
+    cache.set(user_permissions_key(user_id, from_name), entry, timeout)
+
+
+def bump_permission_version():
+    """Права всех пользователей перечитаются из БД при обращении"""
+    cache.set(PERMISSION_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_user_permission_versions(user_ids):
+    version = time.time_ns()
+    cache.set_many(
+        {user_permission_version_key(pk): version for pk in set(user_ids)},
+        timeout=None,
+    )
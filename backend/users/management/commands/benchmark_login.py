@@ -0,0 +1,76 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет поиск пользователя при входе (get_by_natural_key) "
+        "на временных пользователях; данные откатываются"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=10000, help="Сколько пользователей"
+        )
+        parser.add_argument(
+            "--lookups", type=int, default=5000, help="Сколько входов"
+        )
+
+    def handle(self, *args, **options):
+        count, lookups = options["users"], options["lookups"]
+        with transaction.atomic():
+            User.objects.bulk_create(
+                [
+                    User(
+                        email=f"bench{i}@example.com",
+                        phone=f"+7999{i:07d}",
+                        first_name="Bench",
+                        last_name=str(i),
+                        password="!",
+                    )
+                    for i in range(count)
+                ],
+                batch_size=1000,
+            )
+            numbers = [random.randrange(count) for _ in range(lookups)]
+            scenarios = {
+                "email": [f"Bench{i}@Example.com" for i in numbers],
+                "phone": [
+                    f"+7 (999) {i // 10000:03d}-{i % 10000:04d}"
+                    for i in numbers
+                ],
+                "miss": [f"nobody{i}@example.com" for i in range(100)]
+                * (lookups // 100),
+            }
+            for name, logins in scenarios.items():
+                self.measure(name, logins, negative_cache=0)
+            self.measure(
+                "miss (negative cache)", scenarios["miss"], negative_cache=30
+            )
+            transaction.set_rollback(True)
+
+    def measure(self, name, logins, negative_cache):
+        with override_settings(LOGIN_NEGATIVE_CACHE_TIMEOUT=negative_cache):
+            cache.delete_many(
+                [User.objects.negative_cache_key(login) for login in logins]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for login in logins:
+                    try:
+                        User.objects.get_by_natural_key(login)
+                    except User.DoesNotExist:
+                        pass
+                seconds = time.perf_counter() - started
+        self.stdout.write(
+            f"{name:>22}: {len(logins) / seconds:10.0f} входов/с, "
+            f"{len(queries) / len(logins):.2f} запросов на вход"
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.services import UserImportService
+from users.services.imports import BATCH_SIZE, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Массово создаёт студентов и менторов из CSV или JSON Lines. "
+        "Поля: email, phone, first_name, last_name, password, role "
+        "(student|mentor), bio, experience_years, technologies "
+        "(в CSV через ';')"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл .csv или .jsonl")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Процессов для хэширования паролей (по умолчанию — ядер)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Размер пачки bulk_create",
+        )
+
+    def handle(self, *args, **options):
+        service = UserImportService(
+            workers=options["workers"], batch_size=options["batch_size"]
+        )
+        try:
+            stats = service.run(read_records(options["path"]))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for number, reason in service.errors:
+            self.stderr.write(f"Строка {number}: {reason}")
+        seconds = max(stats["seconds"], 1e-6)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано: {stats['created']}, уже были: "
+                f"{stats['existing']}, повторы в файле: "
+                f"{stats['duplicates']}, с ошибками: {stats['invalid']} "
+                f"за {stats['seconds']:.1f} с "
+                f"({stats['created'] / seconds:.0f} пользователей/с)"
+            )
+        )
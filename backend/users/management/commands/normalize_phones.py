@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.phones import digits_only, to_e164
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Приводит телефоны пользователей к E.164 и заполняет "
+        "phone_digits. Номера-дубликаты и нераспознанные пропускаются"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Размер пачки bulk_update",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать, что будет изменено",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        users = (
+            User.objects.exclude(phone__isnull=True)
+            .exclude(phone="")
+            .only("id", "phone", "phone_digits")
+            .order_by("pk")
+        )
+        updated = 0
+        skipped: list[tuple[int, str, str]] = []
+        assigned: set[str] = set()
+        batch = []
+        for user in users.iterator(chunk_size=batch_size):
+            batch.append(user)
+            if len(batch) >= batch_size:
+                updated += self.process(batch, assigned, skipped, options)
+                batch = []
+        if batch:
+            updated += self.process(batch, assigned, skipped, options)
+
+        for user_id, phone, reason in skipped:
+            self.stderr.write(f"Пропущен {user_id} ({phone!r}): {reason}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Обновлено: {updated}, пропущено: {len(skipped)}"
+            )
+        )
+
+    def process(self, batch, assigned, skipped, options):
+        """Одна пачка: один запрос на конфликты, один bulk_update"""
+        canonical = {}
+        for user in batch:
+            try:
+                canonical[user.pk] = to_e164(user.phone)
+            except ValueError:
+                skipped.append((user.pk, user.phone, "invalid"))
+
+        taken = set(
+            User.objects.filter(phone__in=canonical.values())
+            .exclude(pk__in=canonical.keys())
+            .values_list("phone", flat=True)
+        )
+        changed = []
+        # Уже нормализованные номера занимают своё значение первыми
+        batch = sorted(batch, key=lambda u: u.phone != canonical.get(u.pk))
+        for user in batch:
+            phone = canonical.get(user.pk)
+            if phone is None:
+                continue
+            if phone in taken or phone in assigned:
+                skipped.append((user.pk, user.phone, f"duplicate {phone}"))
+                continue
+            assigned.add(phone)
+            digits = digits_only(phone)
+            if (user.phone, user.phone_digits) != (phone, digits):
+                user.phone, user.phone_digits = phone, digits
+                changed.append(user)
+
+        if changed and not options["dry_run"]:
+            with transaction.atomic():
+                User.objects.bulk_update(changed, ["phone", "phone_digits"])
+        return len(changed)
@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-19 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0010_mentor_technology"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="avatar_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=64,
+                verbose_name="Avatar hash",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-19 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0011_user_avatar_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=15,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-19 06:54
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_case_duplicates(apps, schema_editor):
+    # Понятная ошибка вместо IntegrityError при создании индекса
+    User = apps.get_model("users", "User")
+    duplicates = list(
+        User.objects.exclude(email__isnull=True)
+        .annotate(email_lower=Lower("email"))
+        .values("email_lower")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .values_list("email_lower", flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Emails differing only by case must be merged first: "
+            + ", ".join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0012_user_phone_digits"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                Lower("email"),
+                name="users_email_lower_uniq",
+                violation_error_message="A user with this email already exists",
+            ),
+        ),
+    ]
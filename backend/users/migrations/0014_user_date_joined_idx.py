@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-19 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0013_user_email_lower_uniq"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["date_joined", "id"], name="users_date_joined_idx"
+            ),
+        ),
+    ]
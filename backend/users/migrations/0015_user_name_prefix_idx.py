@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-19 07:08
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0014_user_date_joined_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("first_name"),
+                name="users_first_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("last_name"),
+                name="users_last_name_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2 on 2026-10-19 07:50
+
+from django.db import migrations
+
+# Индекс -> колонка. Обычный индекс lower(...) не обслуживает
+# LIKE 'prefix%' при collation, отличной от C; text_pattern_ops
+# сравнивает побайтово и работает при любой.
+PREFIX_INDEXES = {
+    "users_email_prefix_idx": "email",
+    "users_first_name_prefix_idx": "first_name",
+    "users_last_name_prefix_idx": "last_name",
+}
+
+
+def create_prefix_indexes(apps, schema_editor):
+    # Классы операторов есть только в PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in PREFIX_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON users (lower({column}) text_pattern_ops)"
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in PREFIX_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0015_user_name_prefix_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_first_name_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_last_name_idx",
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
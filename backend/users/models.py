@@ -1,15 +1,73 @@
+from contextlib import nullcontext
+import hashlib
 import os
 import uuid
 
+from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
-from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.cache import cache
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from content.models import Technology
 from translations.mixins import AutoTranslateMixin
+from users.phones import digits_only
+from users.phones import normalize as normalize_phone
+from users.phones import search_prefix, to_e164
+
+# Сколько слов запроса учитывает автодополнение
+AUTOCOMPLETE_MAX_WORDS = 3
+
+
+class UserQuerySet(models.QuerySet):
+    """
+    Contact lookups that hit the unique indexes: Lower(email) for
+    case-insensitive email, E.164 phone.
+    """
+
+    def by_email(self, email):
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower=(email or "").strip().lower()
+        )
+
+    def by_phone(self, phone):
+        return self.filter(phone=normalize_phone(phone))
+
+    def by_login(self, login):
+        """Email или телефон, в зависимости от вида логина"""
+        login = (login or "").strip()
+        if "@" in login:
+            return self.by_email(login)
+        return self.filter(phone__in={login, normalize_phone(login)} - {""})
+
+    def autocomplete(self, term):
+        """
+        Подсказки по началу номера, email, имени или фамилии. Каждое
+        слово запроса должно совпасть с началом одного из полей.
+        """
+        digits = search_prefix(term)
+        if digits is not None:
+            return self.filter(phone_digits__startswith=digits)
+        queryset = self.alias(
+            email_lower=Lower("email"),
+            first_name_lower=Lower("first_name"),
+            last_name_lower=Lower("last_name"),
+        )
+        # LIKE 'word%' по lower(...) text_pattern_ops (миграция 0016):
+        # такой индекс работает при любой collation базы
+        for word in term.lower().split()[:AUTOCOMPLETE_MAX_WORDS]:
+            queryset = queryset.filter(
+                Q(email_lower__startswith=word)
+                | Q(first_name_lower__startswith=word)
+                | Q(last_name_lower__startswith=word)
+            )
+        return queryset
 
 
 class CustomUserManager(BaseUserManager):
@@ -46,16 +104,40 @@ class CustomUserManager(BaseUserManager):
             email=email, phone=phone, password=password, **extra_fields
         )
 
-    def get_by_natural_key(self, login):
-        user = self.filter(email=login).first()
-        if user:
-            return user
+    @staticmethod
+    def normalize_phone(phone):
+        """Номер в E.164 или как есть, если его не разобрать"""
+        return normalize_phone(phone)
+
+    @classmethod
+    def negative_cache_key(cls, login):
+        login = (login or "").strip()
+        login = login.lower() if "@" in login else cls.normalize_phone(login)
+        digest = hashlib.sha1(login.encode()).hexdigest()
+        return f"users:login-miss:{digest}"
 
-        user = self.filter(phone=login).first()
-        if user:
-            return user
+    def get_by_natural_key(self, login):
+        """
+        Один запрос по уникальному индексу Lower(email) или phone.
+        Промах можно запомнить на LOGIN_NEGATIVE_CACHE_TIMEOUT секунд.
+        """
+        timeout = settings.LOGIN_NEGATIVE_CACHE_TIMEOUT
+        key = self.negative_cache_key(login)
+        if timeout and cache.get(key):
+            raise self.model.DoesNotExist(f"Unknown login: {login}")
+
+        user = self.by_login(login).order_by("pk").first()
+        if user is None:
+            if timeout:
+                cache.set(key, True, timeout)
+            raise self.model.DoesNotExist(f"Unknown login: {login}")
+        return user
 
-        return self.get(email=login)
+    def forget_missing_logins(self, *logins):
+        """Сбрасывает негативный кэш (пользователь появился)"""
+        cache.delete_many(
+            [self.negative_cache_key(login) for login in logins if login]
+        )
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -72,6 +154,8 @@ class User(AbstractBaseUser, PermissionsMixin):
         return f"avatars/{user_identifier}/{filename}"
 
     def clean(self):
+        self.canonicalize_phone()
+
         # Базовая проверка: email ИЛИ phone для всех пользователей
         if not self.email and not self.phone:
             raise ValidationError(_("Email or phone must be specified"))
@@ -86,25 +170,34 @@ class User(AbstractBaseUser, PermissionsMixin):
                     {"phone": _("Phone is required for admin")}
                 )
 
-        # Проверка уникальности email
-        if self.email:
-            qs = User.objects.filter(email=self.email)
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            if qs.exists():
-                raise ValidationError(
-                    {"email": _("A user with this email already exists")}
-                )
-
-        # Проверка уникальности phone
-        if self.phone:
-            qs = User.objects.filter(phone=self.phone)
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            if qs.exists():
-                raise ValidationError(
-                    {"phone": _("A user with this phone already exists")}
-                )
+    # Уникальность email и phone обеспечивает БД; формы проверяют
+    # только изменённые поля (см. ChangedUniqueFieldsMixin), а save()
+    # переводит IntegrityError индекса в ValidationError с тем же текстом
+    UNIQUE_ERROR_MESSAGES = {
+        "email": _("A user with this email already exists"),
+        "phone": _("A user with this phone already exists"),
+    }
+
+    def unique_error_message(self, model_class, unique_check):
+        if len(unique_check) == 1 and unique_check[0] in (
+            self.UNIQUE_ERROR_MESSAGES
+        ):
+            return ValidationError(
+                self.UNIQUE_ERROR_MESSAGES[unique_check[0]], code="unique"
+            )
+        return super().unique_error_message(model_class, unique_check)
+
+    def validate_constraints(self, exclude=None):
+        """Нарушение users_email_lower_uniq — ошибка поля email"""
+        try:
+            super().validate_constraints(exclude=exclude)
+        except ValidationError as error:
+            errors = error.update_error_dict({})
+            message = str(self.UNIQUE_ERROR_MESSAGES["email"])
+            for item in errors.pop(NON_FIELD_ERRORS, []):
+                field = "email" if str(item.message) == message else None
+                errors.setdefault(field or NON_FIELD_ERRORS, []).append(item)
+            raise ValidationError(errors)
 
     first_name = models.CharField(
         verbose_name=_("First name"),
@@ -124,6 +217,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         unique=True,
         help_text=_("User phone number"),
     )
+    # Цифры phone без "+": индекс для поиска по префиксу номера
+    phone_digits = models.CharField(
+        max_length=15,
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+    )
     email = models.EmailField(
         verbose_name=_("Email"),
         blank=True,
@@ -145,6 +246,15 @@ class User(AbstractBaseUser, PermissionsMixin):
         null=True,
         help_text=_("User avatar"),
     )
+    # SHA-256 исходника; по нему же строятся пути обработанных версий
+    avatar_hash = models.CharField(
+        verbose_name=_("Avatar hash"),
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        db_index=True,
+    )
     bio = models.TextField(
         verbose_name=_("Biography"),
         default="",
@@ -172,7 +282,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         help_text=_("Is the user a staff member"),
     )
 
-    objects = CustomUserManager()
+    objects = CustomUserManager.from_queryset(UserQuerySet)()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["first_name", "last_name", "phone"]
@@ -190,6 +300,23 @@ class User(AbstractBaseUser, PermissionsMixin):
     def get_username(self):
         return self.email or self.phone
 
+    def avatar_url(self, size=None):
+        """URL наименьшей обработанной версии не меньше size"""
+        if not self.avatar:
+            return None
+        if not self.avatar_hash:
+            return self.avatar.url
+        # Сервисы импортируют модели, поэтому импорт здесь
+        from users.services.avatars import AVATAR_SIZES, AvatarService
+
+        size = next(
+            (s for s in AVATAR_SIZES if size and s >= size),
+            max(AVATAR_SIZES),
+        )
+        return default_storage.url(
+            AvatarService.path_for(self.avatar_hash, size)
+        )
+
     @property
     def has_email(self):
         return bool(self.email)
@@ -210,7 +337,58 @@ class User(AbstractBaseUser, PermissionsMixin):
     def is_admin(self):
         return self.role == "admin" or self.is_superuser
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user.remember_contacts()
+        return user
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.remember_contacts(fields)
+
+    def remember_contacts(self, fields=None):
+        """Запоминает email и phone в том виде, в каком они лежат в БД"""
+        loaded = self.__dict__.setdefault("_loaded_contacts", {})
+        for name in self.UNIQUE_ERROR_MESSAGES:
+            if (fields is None or name in fields) and name in self.__dict__:
+                loaded[name] = self.__dict__[name]
+
+    def contacts_changed(self, update_fields=None):
+        """Может ли сохранение нарушить уникальность email или phone"""
+        if self._state.adding:
+            return True
+        loaded = self.__dict__.get("_loaded_contacts", {})
+        return any(
+            name in self.__dict__
+            and (update_fields is None or name in update_fields)
+            and (name not in loaded or loaded[name] != self.__dict__[name])
+            for name in self.UNIQUE_ERROR_MESSAGES
+        )
+
+    def canonicalize_phone(self):
+        """Телефон хранится только в E.164, его цифры — в phone_digits"""
+        if "phone" in self.get_deferred_fields():
+            return
+        phone = self.phone or None
+        loaded = self.__dict__.get("_loaded_contacts", {})
+        if phone and phone == loaded.get("phone"):
+            # Старый номер, который normalize_phones пропустил (не
+            # разобрать или дубликат), не мешает сохранять остальное
+            if normalize_phone(phone) != phone:
+                return
+        elif phone:
+            try:
+                phone = to_e164(phone)
+            except ValueError:
+                raise ValidationError(
+                    {"phone": _("Enter a valid phone number")}
+                )
+        self.phone = phone
+        self.phone_digits = digits_only(phone) or None
+
+    def apply_role_flags(self):
+        """is_staff/is_superuser следуют из роли"""
         if self.role == "admin":
             self.is_staff = True
             self.is_superuser = True
@@ -221,14 +399,69 @@ class User(AbstractBaseUser, PermissionsMixin):
             self.is_staff = False
             self.is_superuser = False
 
+    def save(self, *args, **kwargs):
+        self.apply_role_flags()
+
+        # clean() без запросов к БД: дубликаты email/phone формы находят
+        # в validate_unique, в остальных случаях их отклоняет индекс
         self.clean()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "phone" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "phone_digits"}
+        using = kwargs.get("using")
+        # Точка сохранения: IntegrityError не обрывает внешнюю
+        # транзакцию (ATOMIC_REQUESTS, atomic админки). Вне транзакции
+        # и без смены email/phone она не нужна: обычное сохранение —
+        # один UPDATE
+        changed = self.contacts_changed(kwargs.get("update_fields"))
+        in_transaction = transaction.get_connection(using).in_atomic_block
+        context = (
+            transaction.atomic(using=using)
+            if changed and in_transaction
+            else nullcontext()
+        )
+        try:
+            with context:
+                super().save(*args, **kwargs)
+        except IntegrityError as e:
+            raise self.unique_violation(e) from e
+        self.remember_contacts()
+
+    def unique_violation(self, error):
+        """IntegrityError уникального индекса -> ValidationError поля"""
+        message = str(error).lower()
+        for field, text in self.UNIQUE_ERROR_MESSAGES.items():
+            if f"{self._meta.db_table}.{field}" in message or (
+                f"{self._meta.db_table}_{field}_" in message
+            ):
+                return ValidationError({field: text}, code="unique")
+        return error
 
     class Meta:
         db_table = "users"
         ordering = ["-date_joined", "email"]
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        indexes = [
+            # Сортировка списков по дате регистрации (с id для
+            # однозначного курсора), в том числе через join из профилей
+            models.Index(
+                fields=["date_joined", "id"], name="users_date_joined_idx"
+            ),
+            # Префиксные индексы lower(...) text_pattern_ops для
+            # автодополнения создаёт миграция 0016, только в PostgreSQL
+        ]
+        constraints = [
+            # Email уникален без учёта регистра; этот же индекс
+            # обслуживает by_email() и вход по email
+            models.UniqueConstraint(
+                Lower("email"),
+                name="users_email_lower_uniq",
+                violation_error_message=_(
+                    "A user with this email already exists"
+                ),
+            )
+        ]
 
 
 class Student(models.Model):
@@ -298,6 +531,38 @@ class Specialization(AutoTranslateMixin, models.Model):
         return f"{self.title}"
 
 
+class MentorQuerySet(models.QuerySet):
+    """
+    Technology-set matches via one GROUP BY/HAVING subquery over
+    mentors_technology: no join per technology and no DISTINCT.
+    """
+
+    def with_technologies(self, technologies, min_count=None):
+        """
+        Менторы, знающие не меньше min_count технологий из списка
+        (по умолчанию — все). Принимает id или объекты Technology.
+        """
+        ids = {getattr(tech, "pk", tech) for tech in technologies}
+        if not ids:
+            return self
+        if min_count is None:
+            min_count = len(ids)
+        matched = (
+            Mentor.technology.through.objects.filter(technology_id__in=ids)
+            .values("mentor_id")
+            .annotate(matched=models.Count("technology_id"))
+            .filter(matched__gte=min_count)
+            .values("mentor_id")
+        )
+        return self.filter(pk__in=matched)
+
+    def with_all_technologies(self, technologies):
+        return self.with_technologies(technologies)
+
+    def with_any_technologies(self, technologies):
+        return self.with_technologies(technologies, min_count=1)
+
+
 class Mentor(models.Model):
     user = models.OneToOneField(
         User,
@@ -326,6 +591,8 @@ class Mentor(models.Model):
         related_name="mentors",
     )
 
+    objects = MentorQuerySet.as_manager()
+
     class Meta:
         db_table = "mentors"
         verbose_name = _("Mentor")
@@ -0,0 +1,9 @@
+from django.contrib.auth.hashers import make_password
+
+# Модуль не импортирует модели: его функции выполняются в процессах
+# пула, где реестр приложений Django не загружен
+
+
+def hash_passwords(raw_passwords):
+    """Хэши для списка паролей; None даёт непригодный пароль"""
+    return [make_password(raw) for raw in raw_passwords]
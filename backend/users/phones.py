@@ -0,0 +1,53 @@
+from django.conf import settings
+
+# Длина номера по E.164 без "+"
+MIN_DIGITS = 8
+MAX_DIGITS = 15
+
+
+def digits_only(value):
+    return "".join(ch for ch in str(value or "") if ch.isdigit())
+
+
+def to_e164(value):
+    """
+    "+7 (999) 111-22-33", "8 999 111 22 33", "9991112233" ->
+    "+79991112233". Номер без кода страны дополняется
+    PHONE_DEFAULT_COUNTRY_CODE; российская "8" заменяется на "+7".
+    ValueError, если цифр не хватает или слишком много.
+    """
+    raw = str(value or "").strip()
+    digits = digits_only(raw)
+    country = settings.PHONE_DEFAULT_COUNTRY_CODE
+    if not raw.startswith("+"):
+        if country == "7" and len(digits) == 11 and digits[0] == "8":
+            digits = "7" + digits[1:]
+        elif len(digits) == 10:
+            digits = country + digits
+    if not MIN_DIGITS <= len(digits) <= MAX_DIGITS:
+        raise ValueError(f"Invalid phone number: {value!r}")
+    return f"+{digits}"
+
+
+def normalize(value):
+    """E.164, если номер разбирается, иначе строка как есть"""
+    try:
+        return to_e164(value)
+    except ValueError:
+        return str(value or "").strip()
+
+
+def search_prefix(value):
+    """
+    Префикс для поиска по phone_digits или None, если строка не
+    похожа на номер: "8 (999) 1" -> "79991", "+7 999" -> "7999".
+    """
+    raw = str(value or "").strip()
+    if not raw or any(ch.isalpha() or ch == "@" for ch in raw):
+        return None
+    digits = digits_only(raw)
+    if len(digits) < 3:
+        return None
+    if settings.PHONE_DEFAULT_COUNTRY_CODE == "7" and raw[0] == "8":
+        digits = "7" + digits[1:]
+    return digits
@@ -0,0 +1,5 @@
+from .avatars import AvatarService
+from .exports import UserExportService
+from .imports import UserImportService
+
+__all__ = ["AvatarService", "UserExportService", "UserImportService"]
@@ -0,0 +1,109 @@
+import hashlib
+from io import BytesIO
+import logging
+
+from PIL import Image, ImageOps
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = (64, 128, 256)
+AVATAR_ROOT = "avatars/sha256"
+
+
+class AvatarService:
+    """
+    Normalized, content-addressed avatars: square WebP in several
+    sizes stored under the SHA-256 of the upload, so identical uploads
+    share files.
+    """
+
+    @staticmethod
+    def path_for(digest, size=max(AVATAR_SIZES)):
+        return f"{AVATAR_ROOT}/{digest[:2]}/{digest}-{size}.webp"
+
+    @staticmethod
+    def is_processed(name):
+        return bool(name) and name.startswith(f"{AVATAR_ROOT}/")
+
+    @staticmethod
+    def render(image, size):
+        """Квадрат по центру, WebP без метаданных"""
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        square = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        square.save(buffer, "WEBP", quality=85, method=6)
+        return buffer.getvalue()
+
+    @classmethod
+    def process(cls, user_id):
+        """
+        Обрабатывает свежую загрузку (вызывается из Celery): пишет
+        недостающие размеры, переключает пользователя на общий файл
+        и удаляет исходник. Старый аватар чистится по счётчику ссылок.
+        """
+        User = get_user_model()
+        user = (
+            User.objects.filter(pk=user_id)
+            .only("id", "avatar", "avatar_hash")
+            .first()
+        )
+        if user is None:
+            return None
+        previous = user.avatar_hash
+        name = user.avatar.name
+
+        if not name:
+            if previous:
+                User.objects.filter(pk=user_id, avatar__in=["", None]).update(
+                    avatar_hash=""
+                )
+                cls.cleanup(previous)
+            return None
+        if cls.is_processed(name):
+            return user.avatar_hash
+
+        with user.avatar.open("rb") as upload:
+            raw = upload.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        image = Image.open(BytesIO(raw))
+        for size in AVATAR_SIZES:
+            path = cls.path_for(digest, size)
+            if not default_storage.exists(path):
+                default_storage.save(
+                    path, ContentFile(cls.render(image, size))
+                )
+
+        updated = User.objects.filter(pk=user_id, avatar=name).update(
+            avatar=cls.path_for(digest), avatar_hash=digest
+        )
+        if not updated:
+            # Аватар успели сменить — эта загрузка уже никому не нужна
+            cls.cleanup(digest)
+            return None
+
+        default_storage.delete(name)
+        if previous and previous != digest:
+            cls.cleanup(previous)
+        logger.info(f"Аватар пользователя {user_id}: {digest}")
+        return digest
+
+    @classmethod
+    def discard(cls, digest, upload_name=None):
+        """Фоновая очистка после удаления пользователя"""
+        if upload_name and not cls.is_processed(upload_name):
+            default_storage.delete(upload_name)
+        return cls.cleanup(digest)
+
+    @classmethod
+    def cleanup(cls, digest):
+        """Удаляет файлы хэша, если на него больше никто не ссылается"""
+        if not digest:
+            return False
+        if get_user_model().objects.filter(avatar_hash=digest).exists():
+            return False
+        for size in AVATAR_SIZES:
+            default_storage.delete(cls.path_for(digest, size))
+        return True
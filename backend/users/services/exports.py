@@ -0,0 +1,227 @@
+import csv
+import io
+import re
+from xml.sax.saxutils import escape
+import zipfile
+
+from django.db.models import Aggregate, CharField, OuterRef, Subquery
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from users.models import Mentor
+
+CHUNK_SIZE = 2000
+# Строк XLSX между выдачами накопленных байтов клиенту
+XLSX_FLUSH_ROWS = 500
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument"
+    ".spreadsheetml.sheet",
+}
+# Символы, недопустимые в XML 1.0
+ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+# С этих символов табличные редакторы начинают формулу
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# Телефон в E.164 (users.phones) формулой не считается
+E164_PHONE = re.compile(r"\+[1-9]\d{7,14}")
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'content-types">'
+        '<Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.'
+        'spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/'
+        'spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats'
+        '.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+class NameList(Aggregate):
+    """Sorted comma-separated names (GROUP_CONCAT on SQLite)"""
+
+    function = "STRING_AGG"
+    template = "%(function)s(%(expressions)s, ', ' ORDER BY %(expressions)s)"
+    output_field = CharField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            function="GROUP_CONCAT",
+            template="%(function)s(%(expressions)s, ', ')",
+            **extra_context,
+        )
+
+
+class _Echo:
+    """Файлоподобный объект, возвращающий записанное вместо хранения"""
+
+    def write(self, value):
+        return value
+
+
+class _Sink(io.RawIOBase):
+    """Несикаемый приёмник для zipfile: байты забираются через drain()"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class UserExportService:
+    """
+    Changelist exports streamed in constant memory: rows come from a
+    chunked values_list() iterator and are encoded as they are read.
+    """
+
+    @staticmethod
+    def with_technology_names(queryset):
+        """Mentor queryset с колонкой technology_names одним подзапросом"""
+        through = Mentor.technology.through
+        names = (
+            through.objects.filter(mentor_id=OuterRef("pk"))
+            .values("mentor_id")
+            .annotate(names=NameList("technology__name"))
+            .values("names")
+        )
+        return queryset.annotate(technology_names=Subquery(names))
+
+    @staticmethod
+    def rows(queryset, lookups, chunk_size=CHUNK_SIZE):
+        # values_list сам делает JOIN к user/specialization, а
+        # prefetch_related из get_queryset админки здесь не нужен
+        return (
+            queryset.prefetch_related(None)
+            .values_list(*lookups)
+            .iterator(chunk_size=chunk_size)
+        )
+
+    @staticmethod
+    def _text(value):
+        if value is None:
+            return ""
+        if hasattr(value, "tzinfo") and value.tzinfo is not None:
+            value = timezone.localtime(value).replace(tzinfo=None)
+        if hasattr(value, "isoformat"):
+            return value.isoformat(sep=" ", timespec="seconds")
+        return str(value)
+
+    @classmethod
+    def _csv_cell(cls, value):
+        text = cls._text(value)
+        # Строки с началом формулы экранируются: имена пользователей
+        # приходят извне. Исключение — уже проверенный номер E.164
+        if (
+            isinstance(value, str)
+            and text.startswith(FORMULA_PREFIXES)
+            and not E164_PHONE.fullmatch(text)
+        ):
+            return f"'{text}"
+        return text
+
+    @classmethod
+    def stream_csv(cls, headers, rows):
+        writer = csv.writer(_Echo())
+        # BOM, чтобы Excel распознал UTF-8
+        yield "\ufeff" + writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow([cls._csv_cell(value) for value in row])
+
+    @classmethod
+    def _xlsx_row(cls, row):
+        cells = []
+        for value in row:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append(f"<c><v>{value}</v></c>")
+                continue
+            text = escape(ILLEGAL_XML_CHARS.sub("", cls._text(value)))
+            cells.append(
+                f'<c t="inlineStr"><is><t xml:space="preserve">{text}'
+                "</t></is></c>"
+            )
+        return f"<row>{''.join(cells)}</row>".encode()
+
+    @classmethod
+    def stream_xlsx(cls, headers, rows):
+        """
+        Минимальная книга из одного листа со строками inline, без
+        таблицы общих строк: лист пишется в zip по мере чтения строк.
+        """
+        sink = _Sink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, data in XLSX_PARTS.items():
+                archive.writestr(name, data)
+            yield sink.drain()
+            with archive.open(
+                "xl/worksheets/sheet1.xml", "w", force_zip64=True
+            ) as sheet:
+                sheet.write(
+                    b'<?xml version="1.0" encoding="UTF-8"?>'
+                    b'<worksheet xmlns="http://schemas.openxmlformats.org/'
+                    b'spreadsheetml/2006/main"><sheetData>'
+                )
+                sheet.write(cls._xlsx_row(headers))
+                for number, row in enumerate(rows, start=1):
+                    sheet.write(cls._xlsx_row(row))
+                    if number % XLSX_FLUSH_ROWS == 0:
+                        yield sink.drain()
+                sheet.write(b"</sheetData></worksheet>")
+        yield sink.drain()
+
+    @classmethod
+    def response(cls, export_format, name, headers, rows):
+        stream = (
+            cls.stream_xlsx(headers, rows)
+            if export_format == "xlsx"
+            else cls.stream_csv(headers, rows)
+        )
+        response = StreamingHttpResponse(
+            stream, content_type=CONTENT_TYPES[export_format]
+        )
+        filename = f"{name}-{timezone.localdate():%Y%m%d}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
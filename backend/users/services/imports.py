@@ -0,0 +1,237 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from content.models import Technology
+from users.models import Mentor, Student, User
+from users.passwords import hash_passwords
+from users.phones import digits_only, to_e164
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+IMPORT_ROLES = ("student", "mentor")
+
+
+def read_records(path):
+    """Словари из CSV (по расширению) или JSON Lines, по одной строке"""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class UserImportService:
+    """
+    Bulk onboarding: passwords hashed in a process pool, duplicates
+    resolved in memory against one lookup per batch, users and
+    profiles inserted with bulk_create.
+    """
+
+    def __init__(self, workers=None, batch_size=BATCH_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.seen_emails, self.seen_phones = set(), set()
+        self.technologies = {}
+        self.mentor_technologies_added = False
+        self.stats: dict[str, float] = {
+            "created": 0,
+            "existing": 0,
+            "duplicates": 0,
+            "invalid": 0,
+        }
+        self.errors = []
+
+    def run(self, records):
+        started = time.monotonic()
+        # spawn, а не fork: унаследованное соединение с БД закрылось бы
+        # вместе с дочерним процессом
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            batch = []
+            for number, record in enumerate(records, start=1):
+                batch.append((number, record))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch, pool)
+                    batch = []
+            if batch:
+                self.import_batch(batch, pool)
+        if self.mentor_technologies_added:
+            # bulk_create не шлёт m2m_changed: подбор менторов целиком
+            from mentoring.tasks import recompute_course_matches  # noqa
+
+            transaction.on_commit(lambda: recompute_course_matches.delay(None))
+        self.stats["seconds"] = time.monotonic() - started
+        logger.info(f"Импорт пользователей: {self.stats}")
+        return self.stats
+
+    def _invalid(self, number, reason):
+        self.stats["invalid"] += 1
+        self.errors.append((number, reason))
+
+    def prepare(self, number, record):
+        """(email, phone, record) с нормализованными контактами или None"""
+        email = (record.get("email") or "").strip() or None
+        phone = (record.get("phone") or "").strip() or None
+        if not email and not phone:
+            self._invalid(number, "email or phone is required")
+            return None
+        if phone:
+            try:
+                phone = to_e164(phone)
+            except ValueError as e:
+                self._invalid(number, str(e))
+                return None
+        role = (record.get("role") or "student").strip()
+        if role not in IMPORT_ROLES:
+            self._invalid(number, f"unsupported role {role!r}")
+            return None
+        experience = record.get("experience_years")
+        try:
+            experience = (
+                int(experience) if experience not in (None, "") else None
+            )
+        except (TypeError, ValueError):
+            self._invalid(number, f"bad experience_years {experience!r}")
+            return None
+        if email:
+            email = User.objects.normalize_email(email)
+        return (
+            email,
+            phone,
+            {**record, "role": role, "experience_years": experience},
+        )
+
+    def _existing(self, rows):
+        """Занятые email (в нижнем регистре) и телефоны: один запрос"""
+        emails = {email.lower() for email, _, _ in rows if email}
+        phones = {phone for _, phone, _ in rows if phone}
+        taken = (
+            User.objects.alias(email_lower=Lower("email"))
+            .filter(Q(email_lower__in=emails) | Q(phone__in=phones))
+            .annotate(email_key=Lower("email"))
+            .values_list("email_key", "phone")
+        )
+        taken_emails, taken_phones = set(), set()
+        for email, phone in taken:
+            if email:
+                taken_emails.add(email)
+            if phone:
+                taken_phones.add(phone)
+        return taken_emails, taken_phones
+
+    def import_batch(self, batch, pool):
+        rows = [
+            row
+            for row in (
+                self.prepare(number, record) for number, record in batch
+            )
+            if row
+        ]
+        taken_emails, taken_phones = self._existing(rows)
+
+        fresh = []
+        for email, phone, record in rows:
+            email_key = email.lower() if email else None
+            if email_key in taken_emails or (phone and phone in taken_phones):
+                self.stats["existing"] += 1
+                continue
+            if email_key in self.seen_emails or (
+                phone and phone in self.seen_phones
+            ):
+                self.stats["duplicates"] += 1
+                continue
+            if email_key:
+                self.seen_emails.add(email_key)
+            if phone:
+                self.seen_phones.add(phone)
+            fresh.append((email, phone, record))
+        if not fresh:
+            return
+
+        # Без пароля — вход только после сброса пароля
+        raw = [record.get("password") or None for _, _, record in fresh]
+        step = max(1, len(raw) // (self.workers * 4))
+        hashed = [
+            password
+            for chunk in pool.map(
+                hash_passwords,
+                [raw[i : i + step] for i in range(0, len(raw), step)],
+            )
+            for password in chunk
+        ]
+        users = []
+        for (email, phone, record), password in zip(fresh, hashed):
+            user = User(
+                email=email,
+                phone=phone,
+                phone_digits=digits_only(phone) or None,
+                first_name=(record.get("first_name") or "").strip(),
+                last_name=(record.get("last_name") or "").strip(),
+                bio=record.get("bio") or "",
+                role=record["role"],
+                password=password,
+            )
+            user.apply_role_flags()
+            users.append(user)
+
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            self._create_profiles(users, [record for _, _, record in fresh])
+        User.objects.forget_missing_logins(
+            *(u.email for u in users), *(u.phone for u in users)
+        )
+        self.stats["created"] += len(users)
+
+    def _technology_ids(self, names):
+        """Технологии по имени; неизвестные имена подгружаются разом"""
+        missing = {n for n in names if n not in self.technologies}
+        if missing:
+            self.technologies.update(
+                Technology.objects.filter(name__in=missing).values_list(
+                    "name", "id"
+                )
+            )
+        return {self.technologies[n] for n in names if n in self.technologies}
+
+    def _create_profiles(self, users, records):
+        students, mentors, mentor_technologies = [], [], []
+        for user, record in zip(users, records):
+            if user.role == "student":
+                students.append(Student(user=user))
+                continue
+            mentors.append(
+                Mentor(user=user, experience_years=record["experience_years"])
+            )
+            names = record.get("technologies") or []
+            if isinstance(names, str):
+                names = [n.strip() for n in names.split(";") if n.strip()]
+            mentor_technologies.append(names)
+
+        Student.objects.bulk_create(students)
+        Mentor.objects.bulk_create(mentors)
+        self._technology_ids(
+            {name for names in mentor_technologies for name in names}
+        )
+        through = Mentor.technology.through
+        through.objects.bulk_create(
+            [
+                through(mentor_id=mentor.pk, technology_id=technology_id)
+                for mentor, names in zip(mentors, mentor_technologies)
+                for technology_id in self._technology_ids(names)
+            ]
+        )
+        self.mentor_technologies_added |= any(mentor_technologies)
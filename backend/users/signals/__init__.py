@@ -0,0 +1,16 @@
+from .auth import forget_missing_logins
+from .avatars import schedule_avatar_cleanup, schedule_avatar_processing
+from .permissions import (
+    invalidate_group_permissions,
+    invalidate_permissions,
+    invalidate_user_permissions,
+)
+
+__all__ = [
+    "forget_missing_logins",
+    "invalidate_group_permissions",
+    "invalidate_permissions",
+    "invalidate_user_permissions",
+    "schedule_avatar_cleanup",
+    "schedule_avatar_processing",
+]
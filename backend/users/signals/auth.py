@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from users.models import User
+
+
+@receiver(
+    post_save,
+    sender=User,
+    dispatch_uid="users.forget_missing_logins.post_save",
+)
+def forget_missing_logins(sender, instance, update_fields=None, **kwargs):
+    # Новый или изменённый логин не должен числиться несуществующим;
+    # запись last_login при входе сюда не относится
+    if update_fields is not None and not {"email", "phone"} & set(
+        update_fields
+    ):
+        return
+    # После коммита: вход, проверенный до него, не видит пользователя
+    # и снова закэшировал бы промах
+    email, phone = instance.email, instance.phone
+    transaction.on_commit(
+        lambda: User.objects.forget_missing_logins(email, phone)
+    )
@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User
+from users.services import AvatarService
+from users.tasks import discard_avatar, process_avatar
+
+
+@receiver(
+    post_save,
+    sender=User,
+    dispatch_uid="users.schedule_avatar_processing.post_save",
+)
+def schedule_avatar_processing(sender, instance, **kwargs):
+    # Новая загрузка или очищенный аватар; обычное сохранение
+    # (например, вход в систему) задачу не ставит
+    if "avatar" in instance.get_deferred_fields():
+        return
+    name = instance.avatar.name
+    if (name and not AvatarService.is_processed(name)) or (
+        not name and instance.avatar_hash
+    ):
+        transaction.on_commit(lambda: process_avatar.delay(instance.pk))
+
+
+@receiver(
+    post_delete,
+    sender=User,
+    dispatch_uid="users.schedule_avatar_cleanup.post_delete",
+)
+def schedule_avatar_cleanup(sender, instance, **kwargs):
+    digest = instance.avatar_hash
+    name = instance.avatar.name or None
+    if digest or name:
+        transaction.on_commit(lambda: discard_avatar.delay(digest, name))
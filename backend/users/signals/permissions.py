@@ -0,0 +1,64 @@
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from users.cache import bump_permission_version, bump_user_permission_versions
+from users.models import User
+
+M2M_ACTIONS = ("post_add", "post_remove", "post_clear")
+
+
+@receiver(
+    m2m_changed,
+    sender=User.groups.through,
+    dispatch_uid="users.invalidate_user_permissions.groups",
+)
+@receiver(
+    m2m_changed,
+    sender=User.user_permissions.through,
+    dispatch_uid="users.invalidate_user_permissions.user_permissions",
+)
+def invalidate_user_permissions(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in M2M_ACTIONS:
+        return
+    if not reverse:
+        user_ids = [instance.pk]
+    elif pk_set:
+        # group.user_set.add(...) / permission.user_set.remove(...)
+        user_ids = list(pk_set)
+    else:
+        # clear() со стороны группы или права: затронутых не знаем
+        transaction.on_commit(bump_permission_version)
+        return
+    transaction.on_commit(lambda: bump_user_permission_versions(user_ids))
+
+
+@receiver(
+    m2m_changed,
+    sender=Group.permissions.through,
+    dispatch_uid="users.invalidate_group_permissions.m2m",
+)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action in M2M_ACTIONS:
+        transaction.on_commit(bump_permission_version)
+
+
+@receiver(post_save, sender=Group, dispatch_uid="users.invalidate_groups.save")
+@receiver(
+    post_delete, sender=Group, dispatch_uid="users.invalidate_groups.delete"
+)
+@receiver(
+    post_save,
+    sender=Permission,
+    dispatch_uid="users.invalidate_permissions.save",
+)
+@receiver(
+    post_delete,
+    sender=Permission,
+    dispatch_uid="users.invalidate_permissions.delete",
+)
+def invalidate_permissions(sender, **kwargs):
+    transaction.on_commit(bump_permission_version)
@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from users.services import AvatarService
+
+
+@shared_task
+def process_avatar(user_id):
+    return AvatarService.process(user_id)
+
+
+@shared_task
+def discard_avatar(digest, upload_name=None):
+    return AvatarService.discard(digest, upload_name)
@@ -1,5 +1,34 @@
+import csv
+from io import BytesIO, StringIO
+import os
+import tempfile
+from unittest import mock
+import zipfile
+
+from PIL import Image
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.forms import modelform_factory
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+from school_platform.admin.autocomplete import get_autocomplete_version
+
+from content.models import Technology
+from users.admin import (
+    CustomUserAdmin,
+    CustomUserChangeForm,
+    CustomUserCreationForm,
+)
+from users.models import Mentor, Specialization, Student
+from users.services import AvatarService, UserExportService
 
 User = get_user_model()
 
@@ -11,3 +40,681 @@ class UserModelTest(TestCase):
         )
         self.assertEqual(user.email, "test@example.com")
         self.assertTrue(user.is_active)
+
+
+class UserUniquenessTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="ivan@example.com", phone="+79991112233", password="x"
+        )
+
+    def test_routine_save_is_single_update(self):
+        with self.assertNumQueries(1):
+            self.user.save()
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            user.save()
+
+    def test_duplicate_is_reported_as_field_error(self):
+        with self.assertRaises(ValidationError) as context:
+            User.objects.create_user(email="ivan@example.com", password="x")
+
+        self.assertEqual(
+            context.exception.message_dict["email"],
+            ["A user with this email already exists"],
+        )
+
+        other = User.objects.create_user(
+            email="petr@example.com", password="x"
+        )
+        other.phone = "+79991112233"
+        with self.assertRaises(ValidationError) as context:
+            other.save(update_fields=["phone"])
+
+        self.assertEqual(
+            context.exception.message_dict["phone"],
+            ["A user with this phone already exists"],
+        )
+
+    def test_duplicate_save_keeps_outer_transaction_usable(self):
+        with transaction.atomic():
+            with self.assertRaises(ValidationError):
+                User.objects.create_user(
+                    email="ivan@example.com", password="x"
+                )
+            self.assertEqual(User.objects.count(), 1)
+
+    def test_creation_form_reports_duplicate_email(self):
+        form_class = modelform_factory(
+            User,
+            form=CustomUserCreationForm,
+            fields=("email", "phone", "first_name", "last_name", "role"),
+        )
+        form = form_class(
+            {
+                "email": "IVAN@example.com",
+                "first_name": "I",
+                "last_name": "I",
+                "role": "student",
+                "password1": "S3cure-pass-123",
+                "password2": "S3cure-pass-123",
+            }
+        )
+
+        self.assertFalse(form.is_valid())
+        self.assertEqual(
+            form.errors["email"], ["A user with this email already exists"]
+        )
+
+    def test_change_form_checks_only_changed_fields(self):
+        other = User.objects.create_user(
+            email="petr@example.com", password="x"
+        )
+        data = {
+            "email": other.email,
+            "phone": "+79990000000",
+            "first_name": "P",
+            "last_name": "P",
+            "role": "student",
+            "bio": "",
+            "date_joined": other.date_joined,
+        }
+        form = CustomUserChangeForm(data, instance=other)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(form.is_valid(), form.errors)
+        self.assertFalse(any("email" in q["sql"] for q in queries))
+
+        form = CustomUserChangeForm(
+            {**data, "email": self.user.email}, instance=other
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("email", form.errors)
+
+
+class PhoneNormalizationTest(TestCase):
+    def test_phone_is_stored_in_e164(self):
+        user = User.objects.create_user(
+            phone="8 (999) 111-22-33", password="x"
+        )
+
+        self.assertEqual(user.phone, "+79991112233")
+        self.assertEqual(user.phone_digits, "79991112233")
+        self.assertEqual(User.objects.by_phone("+7 999 111 22 33").get(), user)
+
+    def test_command_normalizes_legacy_rows(self):
+        first = User.objects.create_user(phone="+79991112233", password="x")
+        second = User.objects.create_user(phone="+79990000000", password="x")
+        legacy = User.objects.create_user(phone="+79995556677", password="x")
+        User.objects.filter(pk=legacy.pk).update(
+            phone="+7 (999) 555-66-77", phone_digits=None
+        )
+        User.objects.filter(pk=second.pk).update(phone="8 999 111-22-33")
+
+        call_command("normalize_phones", stdout=StringIO(), stderr=StringIO())
+
+        for user in (first, second, legacy):
+            user.refresh_from_db()
+        self.assertEqual(legacy.phone_digits, "79995556677")
+        self.assertEqual(second.phone, "8 999 111-22-33")
+        self.assertEqual(first.phone, "+79991112233")
+
+    def test_skipped_legacy_phones_do_not_block_saves(self):
+        User.objects.create_user(phone="+79991112233", password="x")
+        duplicate = User.objects.create_user(email="d@example.com")
+        invalid = User.objects.create_user(email="i@example.com")
+        User.objects.filter(pk=duplicate.pk).update(phone="8 999 111-22-33")
+        User.objects.filter(pk=invalid.pk).update(phone="12-34")
+
+        for user in (duplicate, invalid):
+            user = User.objects.get(pk=user.pk)
+            phone = user.phone
+            user.first_name = "Legacy"
+            user.save()
+            user.refresh_from_db()
+            self.assertEqual((user.first_name, user.phone), ("Legacy", phone))
+
+        invalid.phone = "55-66"
+        with self.assertRaises(ValidationError):
+            invalid.save()
+
+    def test_admin_phone_search_is_prefix_lookup(self):
+        user = User.objects.create_user(phone="+79991112233", password="x")
+        Student.objects.create(user=user)
+        User.objects.create_user(phone="+79990000000", password="x")
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+        with translation.override("en"):
+            url = reverse("admin:users_student_changelist")
+
+        response = self.client.get(url, {"q": "8 (999) 111"})
+
+        self.assertEqual(
+            [s.user for s in response.context["cl"].result_list], [user]
+        )
+
+
+class CaseInsensitiveEmailTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="Ivan@Example.com", password="x"
+        )
+
+    def test_lookup_ignores_case(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                User.objects.by_email("ivan@example.COM").get(), self.user
+            )
+        self.assertEqual(
+            User.objects.get_by_natural_key("IVAN@example.com"), self.user
+        )
+
+    def test_case_variant_is_a_duplicate(self):
+        with self.assertRaises(ValidationError) as context:
+            User.objects.create_user(email="ivan@example.com", password="x")
+
+        self.assertIn("email", context.exception.message_dict)
+
+
+class ImportUsersTest(TestCase):
+    def test_import_dedupes_and_creates_profiles(self):
+        Technology.objects.create(name="Python")
+        User.objects.create_user(email="taken@example.com", password="x")
+        path = os.path.join(tempfile.mkdtemp(), "users.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                "email,phone,first_name,last_name,password,role,"
+                "experience_years,technologies\n"
+                "a@example.com,8 999 111 22 33,A,A,secret,student,,\n"
+                "b@example.com,,B,B,secret,mentor,5,Python;Rust\n"
+                "A@example.com,,C,C,secret,student,,\n"
+                "TAKEN@example.com,,D,D,secret,student,,\n"
+                ",,E,E,secret,student,,\n"
+            )
+
+        with mock.patch("mentoring.tasks.recompute_course_matches"):
+            call_command(
+                "import_users",
+                path,
+                workers=2,
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+        student = User.objects.by_phone("+79991112233").get()
+        self.assertTrue(student.check_password("secret"))
+        self.assertTrue(Student.objects.filter(user=student).exists())
+        mentor = Mentor.objects.get(user__email="b@example.com")
+        self.assertTrue(mentor.user.is_staff)
+        self.assertEqual(
+            list(mentor.technology.values_list("name", flat=True)),
+            ["Python"],
+        )
+        self.assertEqual(User.objects.count(), 3)
+
+
+class NaturalKeyLookupTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="ivan@example.com", phone="+79991112233", password="x"
+        )
+
+    def test_email_and_phone_in_one_query(self):
+        for login in ("ivan@EXAMPLE.com", "+7 (999) 111-22-33"):
+            with self.assertNumQueries(1):
+                self.assertEqual(
+                    User.objects.get_by_natural_key(login), self.user
+                )
+
+    @override_settings(LOGIN_NEGATIVE_CACHE_TIMEOUT=30)
+    def test_negative_cache_until_user_appears(self):
+        with self.assertRaises(User.DoesNotExist):
+            User.objects.get_by_natural_key("new@example.com")
+        with self.assertNumQueries(0):
+            with self.assertRaises(User.DoesNotExist):
+                User.objects.get_by_natural_key("New@example.com")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(
+                email="new@example.com", password="x"
+            )
+            # До коммита кэш не сбрасывается: параллельный вход ещё не
+            # видит пользователя и закэшировал бы промах заново
+            with self.assertRaises(User.DoesNotExist):
+                User.objects.get_by_natural_key("new@example.com")
+
+        self.assertEqual(
+            User.objects.get_by_natural_key("new@example.com"), user
+        )
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AvatarServiceTest(TestCase):
+    def make_avatar(self, color="teal"):
+        buffer = BytesIO()
+        Image.new("RGB", (300, 200), color).save(buffer, "PNG")
+        return SimpleUploadedFile("avatar.png", buffer.getvalue())
+
+    def make_user(self, email, color="teal"):
+        with mock.patch("users.signals.avatars.process_avatar"):
+            return User.objects.create_user(
+                email=email, password="x", avatar=self.make_avatar(color)
+            )
+
+    def test_upload_schedules_processing_after_commit(self):
+        with mock.patch("users.signals.avatars.process_avatar") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                user = User.objects.create_user(
+                    email="a@example.com",
+                    password="x",
+                    avatar=self.make_avatar(),
+                )
+            with self.captureOnCommitCallbacks(execute=True):
+                AvatarService.process(user.pk)
+                User.objects.get(pk=user.pk).save()
+
+        task.delay.assert_called_once_with(user.pk)
+
+    def test_identical_uploads_share_square_webp_files(self):
+        first = self.make_user("a@example.com")
+        second = self.make_user("b@example.com")
+        upload = first.avatar.name
+
+        digest = AvatarService.process(first.pk)
+        self.assertEqual(AvatarService.process(second.pk), digest)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.avatar.name, second.avatar.name)
+        self.assertFalse(default_storage.exists(upload))
+        with default_storage.open(AvatarService.path_for(digest, 64)) as f:
+            image = Image.open(f)
+            self.assertEqual((image.format, image.size), ("WEBP", (64, 64)))
+        self.assertTrue(first.avatar_url(100).endswith(f"{digest}-128.webp"))
+
+    def test_replaced_avatar_is_removed_when_unreferenced(self):
+        first = self.make_user("a@example.com")
+        second = self.make_user("b@example.com")
+        shared = AvatarService.process(first.pk)
+        AvatarService.process(second.pk)
+
+        with mock.patch("users.signals.avatars.process_avatar"):
+            first.avatar = self.make_avatar("red")
+            first.save()
+        AvatarService.process(first.pk)
+        self.assertTrue(default_storage.exists(AvatarService.path_for(shared)))
+
+        second.delete()
+        AvatarService.discard(shared)
+        self.assertFalse(
+            default_storage.exists(AvatarService.path_for(shared))
+        )
+
+
+class MentorTechnologyQueryTest(TestCase):
+    def setUp(self):
+        self.python, self.django, self.go = (
+            Technology.objects.create(name=name)
+            for name in ("Python", "Django", "Go")
+        )
+        self.full = self.make_mentor(
+            "a@example.com", [self.python, self.django]
+        )
+        self.half = self.make_mentor("b@example.com", [self.python, self.go])
+        self.none = self.make_mentor("c@example.com", [self.go])
+
+    def make_mentor(self, email, technologies):
+        mentor = Mentor.objects.create(
+            user=User.objects.create_user(email=email, password="x")
+        )
+        mentor.technology.set(technologies)
+        return mentor
+
+    def test_all_any_and_at_least_k(self):
+        wanted = [self.python, self.django]
+
+        self.assertEqual(
+            list(Mentor.objects.with_all_technologies(wanted)), [self.full]
+        )
+        self.assertEqual(
+            set(Mentor.objects.with_any_technologies(wanted)),
+            {self.full, self.half},
+        )
+        self.assertEqual(
+            set(
+                Mentor.objects.with_technologies(
+                    [self.python, self.django, self.go], min_count=2
+                )
+            ),
+            {self.full, self.half},
+        )
+
+    def test_admin_filter_uses_technology_set(self):
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+        with translation.override("en"):
+            url = reverse("admin:users_mentor_changelist")
+        ids = f"{self.python.pk},{self.django.pk}"
+
+        response = self.client.get(url, {"technologies": ids})
+        self.assertEqual(list(response.context["cl"].result_list), [self.full])
+
+        response = self.client.get(
+            url, {"technologies": ids, "technology_match": "any"}
+        )
+        self.assertEqual(
+            set(response.context["cl"].result_list), {self.full, self.half}
+        )
+
+
+class AdminExportTest(TestCase):
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+        self.mentor = Mentor.objects.create(
+            user=User.objects.create_user(
+                email="mentor@example.com",
+                phone="+79991112233",
+                password="x",
+                first_name="=HYPERLINK()",
+            ),
+            experience_years=7,
+        )
+        self.mentor.technology.set(
+            [Technology.objects.create(name=name) for name in ("Go", "C")]
+        )
+
+    def export(self, export_format):
+        with translation.override("en"):
+            url = reverse("admin:users_mentor_changelist")
+        response = self.client.post(
+            url,
+            {
+                "action": f"export_{export_format}",
+                "_selected_action": [self.mentor.pk],
+            },
+        )
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_csv_has_aggregated_technologies(self):
+        header, row = csv.reader(
+            self.export("csv").decode("utf-8-sig").splitlines()
+        )
+
+        cells = dict(zip(header, row))
+        self.assertEqual(cells["First name"], "'=HYPERLINK()")
+        self.assertEqual(cells["Phone"], "+79991112233")
+        # На SQLite порядок внутри GROUP_CONCAT не гарантирован
+        self.assertEqual(
+            sorted(cells["Technologies"].split(", ")), ["C", "Go"]
+        )
+
+    def test_csv_escapes_formula_payloads(self):
+        payloads = ("-1+1|cmd", '+1+HYPERLINK("http://x")')
+        rows = [(payload, "+79991112233", -1) for payload in payloads]
+
+        lines = list(UserExportService.stream_csv(["a", "b", "c"], rows))
+
+        for line, payload in zip(lines[1:], payloads):
+            (cells,) = csv.reader([line])
+            self.assertEqual(cells, [f"'{payload}", "+79991112233", "-1"])
+
+    def test_xlsx_is_a_valid_workbook(self):
+        with zipfile.ZipFile(BytesIO(self.export("xlsx"))) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+        self.assertIn("mentor@example.com", sheet)
+        self.assertIn("<c><v>7</v></c>", sheet)
+
+
+@mock.patch.object(CustomUserAdmin, "list_per_page", 2)
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        for number in range(4):
+            User.objects.create_user(
+                email=f"user{number}@example.com", password="x"
+            )
+        self.client.force_login(self.admin_user)
+        with translation.override("en"):
+            self.url = reverse("admin:users_user_changelist")
+
+    def page(self, query_string=""):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + query_string)
+        self.assertFalse(
+            any(" OFFSET " in q["sql"] for q in queries.captured_queries)
+        )
+        return response.context["cl"]
+
+    def test_cursor_pages_cover_the_ordering(self):
+        expected = list(User.objects.order_by("-date_joined", "-pk"))
+
+        seen, cl = [], self.page()
+        while True:
+            seen.extend(cl.result_list)
+            if cl.keyset_next_url is None:
+                break
+            cl = self.page(cl.keyset_next_url)
+        self.assertEqual(seen, expected)
+
+        previous = self.page(cl.keyset_previous_url)
+        self.assertEqual(list(previous.result_list), expected[2:4])
+        self.assertIsNotNone(previous.keyset_first_url)
+
+    def test_filter_links_drop_the_cursor(self):
+        cl = self.page()
+        cl = self.page(cl.keyset_next_url)
+
+        self.assertNotIn("after=", cl.get_query_string({"role": "mentor"}))
+
+
+class AdminQueryBudgetTest(TestCase):
+    """Changelists run a fixed number of queries whatever the page size"""
+
+    # Сессия, пользователь, COUNT и страница; у менторов ещё prefetch
+    # технологий и варианты двух фильтров
+    BUDGET = {"user": 4, "student": 4, "mentor": 7}
+
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.client.force_login(admin_user)
+        self.specialization = Specialization.objects.create(
+            title="Backend", type="backend"
+        )
+        self.technologies = [
+            Technology.objects.create(name=name)
+            for name in ("Python", "Go", "C", "Rust")
+        ]
+        self.created = 0
+
+    def add_profiles(self, count):
+        for _ in range(count):
+            self.created += 1
+            student = User.objects.create_user(
+                email=f"student{self.created}@example.com", password="x"
+            )
+            Student.objects.create(user=student)
+            mentor = Mentor.objects.create(
+                user=User.objects.create_user(
+                    email=f"mentor{self.created}@example.com",
+                    password="x",
+                    role="mentor",
+                ),
+                specialization=self.specialization,
+            )
+            mentor.technology.set(self.technologies)
+
+    def count_queries(self, model_name):
+        with translation.override("en"):
+            url = reverse(f"admin:users_{model_name}_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists_stay_within_budget(self):
+        self.add_profiles(2)
+        small = {name: self.count_queries(name) for name in self.BUDGET}
+        self.add_profiles(6)
+        large = {name: self.count_queries(name) for name in self.BUDGET}
+
+        self.assertEqual(small, self.BUDGET)
+        self.assertEqual(large, self.BUDGET)
+
+
+class UserAutocompleteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", phone="+70000000000", password="x"
+        )
+        self.ivan = User.objects.create_user(
+            email="ivan.petrov@example.com",
+            phone="+79991112233",
+            password="x",
+            first_name="Ivan",
+            last_name="Petrov",
+        )
+        self.maria = User.objects.create_user(
+            email="maria@example.com",
+            password="x",
+            first_name="Maria",
+            last_name="Ivanova",
+        )
+        self.client.force_login(self.admin_user)
+        with translation.override("en"):
+            self.url = reverse("admin:autocomplete")
+
+    def test_prefix_search_on_names_email_and_phone(self):
+        def found(term):
+            return set(User.objects.autocomplete(term))
+
+        self.assertEqual(found("iva"), {self.ivan, self.maria})
+        self.assertEqual(found("Ivan Pet"), {self.ivan})
+        self.assertEqual(found("maria@"), {self.maria})
+        self.assertEqual(found("8 999 111"), {self.ivan})
+        self.assertEqual(found("van"), set())
+        # % и _ в запросе — обычные символы, а не шаблон LIKE
+        self.assertEqual(found("i%"), set())
+        self.assertEqual(found("ivan_"), set())
+
+    def search(self, term):
+        return self.client.get(
+            self.url,
+            {
+                "app_label": "users",
+                "model_name": "mentor",
+                "field_name": "user",
+                "term": term,
+            },
+        )
+
+    def test_endpoint_is_cached_until_users_change(self):
+        response = self.search("petrov")
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]],
+            [str(self.ivan.pk)],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.search("petrov")
+        self.assertFalse(
+            any(
+                'FROM "users"' in q["sql"] and "LIKE" in q["sql"].upper()
+                for q in queries.captured_queries
+            )
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other = User.objects.create_user(
+                email="p@example.com", password="x", last_name="Petrova"
+            )
+            # Версия сдвигается только после коммита
+            self.assertEqual(len(self.search("petrov").json()["results"]), 1)
+        response = self.search("petrov")
+        self.assertEqual(
+            {item["id"] for item in response.json()["results"]},
+            {str(self.ivan.pk), str(other.pk)},
+        )
+
+    def test_login_keeps_cached_suggestions(self):
+        version = get_autocomplete_version(User)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.force_login(self.ivan)
+        self.assertEqual(get_autocomplete_version(User), version)
+
+        self.ivan.phone = "+79991112244"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ivan.save(update_fields=["phone"])
+        self.assertNotEqual(get_autocomplete_version(User), version)
+
+    def test_mentor_form_does_not_list_users(self):
+        with translation.override("en"):
+            url = reverse("admin:users_mentor_add")
+
+        response = self.client.get(url)
+
+        self.assertNotContains(response, "maria@example.com")
+
+
+class PermissionCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(name="Editors")
+        self.view_course = Permission.objects.get(codename="view_course")
+        self.change_course = Permission.objects.get(codename="change_course")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.add(self.view_course)
+        self.mentor = User.objects.create_user(
+            email="mentor@example.com", password="x", role="mentor"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor.groups.add(self.group)
+
+    def fresh(self):
+        # Новый объект, как в следующем запросе
+        return User.objects.get(pk=self.mentor.pk)
+
+    def test_warm_cache_answers_without_queries(self):
+        self.assertTrue(self.fresh().has_perm("content.view_course"))
+
+        user = self.fresh()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("content.view_course"))
+            self.assertFalse(user.has_perm("content.change_course"))
+
+    def test_group_and_membership_changes_invalidate(self):
+        self.assertFalse(self.fresh().has_perm("content.change_course"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.add(self.change_course)
+        self.assertTrue(self.fresh().has_perm("content.change_course"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.remove(self.mentor)
+        self.assertFalse(self.fresh().has_perm("content.view_course"))
+
+    def test_admin_pages_skip_permission_queries_when_warm(self):
+        self.client.force_login(self.mentor)
+        with translation.override("en"):
+            url = reverse("admin:index")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+
+        self.assertFalse(any("auth_permission" in q["sql"] for q in queries))